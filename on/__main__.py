@@ -1,77 +1,104 @@
 import argparse
+import importlib.util
 import os
-import subprocess
 import sys
+from functools import lru_cache
 from importlib.metadata import version, PackageNotFoundError
+from pathlib import Path
 
-def sh(cmd: list[str]) -> int:
+@lru_cache(maxsize=None)
+def _dist_version(dist: str) -> str | None:
     """
-    Execute a shell command and print it.
+    Return the installed version of a distribution, cached per process.
 
     Args:
-        cmd (list[str]): Command and arguments to execute.
+        dist (str): Distribution name.
 
     Returns:
-        int: The return code from the executed command.
+        str | None: Version string, or None if not installed.
     """
-    print("\n$ " + " ".join(cmd))
-    return subprocess.call(cmd)
+    try:
+        return version(dist)
+    except PackageNotFoundError:
+        return None
 
-def cmd_init(args: argparse.Namespace) -> int:
+def _collect_specs(args: argparse.Namespace) -> list["ProjectSpec"]:
     """
-    Handle the 'init' command to initialize a project using reposmith.
+    Build one ProjectSpec per requested root, asking questions if interactive.
 
     Args:
         args (argparse.Namespace): Parsed command-line arguments.
 
     Returns:
-        int: Return code from the executed initialization command.
+        list[ProjectSpec]: Specs with license, gitignore and VS Code enabled,
+        and the CI workflow only when requested.
     """
-    base = [
-        sys.executable, "-m", "reposmith", "init",
-        "--with-license", "--with-gitignore", "--with-vscode"
-    ]
+    from reposmith.api import ProjectSpec
 
-    if args.root:
-        base += ["--root", args.root]
-    if args.entry:
-        base += ["--entry", args.entry]
-    if args.author:
-        base += ["--author", args.author]
-    if args.with_ci:
-        base.append("--with-ci")
-        if args.ci_python:
-            base += ["--ci-python", args.ci_python]
-    if args.force:
-        base.append("--force")
-    if args.no_venv:
-        base.append("--no-venv")
+    entry, author, ci_python, with_ci = args.entry, args.author, args.ci_python, args.with_ci
+    force, no_venv = args.force, args.no_venv
 
     if args.interactive:
-        if not args.entry:
-            entry = input("Entry filename (Enter = main.py): ").strip()
-            if entry:
-                base += ["--entry", entry]
-        if not args.author:
-            author = input("Author (Enter = skip): ").strip()
-            if author:
-                base += ["--author", author]
-        if not args.with_ci and input("Add GitHub CI? (y/n): ").lower() == "y":
-            base.append("--with-ci")
-            ci_py = input("CI Python (Enter = 3.12): ").strip()
-            if ci_py:
-                base += ["--ci-python", ci_py]
-        if not args.force and input("--force overwrite? (y/n): ").lower() == "y":
-            base.append("--force")
-        if not args.no_venv and input("--no-venv? (y/n): ").lower() == "y":
-            base.append("--no-venv")
-
-    return sh(base)
+        if not entry:
+            entry = input("Entry filename (Enter = run.py): ").strip() or None
+        if not author:
+            author = input("Author (Enter = skip): ").strip() or None
+        if not with_ci and input("Add GitHub CI? (y/n): ").lower() == "y":
+            with_ci = True
+            ci_python = input("CI Python (Enter = 3.12): ").strip() or ci_python
+        if not force and input("--force overwrite? (y/n): ").lower() == "y":
+            force = True
+        if not no_venv and input("--no-venv? (y/n): ").lower() == "y":
+            no_venv = True
+
+    roots = args.root or [os.getcwd()]
+    return [
+        ProjectSpec(
+            root=Path(r).resolve(),
+            entry=entry or "run.py",
+            force=force,
+            no_venv=no_venv,
+            with_license=True,
+            with_gitignore=True,
+            with_vscode=True,
+            author=author or "Tamer",
+            with_ci=with_ci,
+            ci_python=ci_python or "3.12",
+        )
+        for r in roots
+    ]
+
+def cmd_init(args: argparse.Namespace) -> int:
+    """
+    Handle the 'init' command by running the reposmith pipeline in-process.
+
+    Every `--root` is scaffolded in turn within this interpreter, so no
+    `python -m reposmith` child process is spawned.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments.
+
+    Returns:
+        int: 0 if every project was initialized, 1 otherwise.
+    """
+    # Imported lazily so `on info` does not pay for reposmith's import chain.
+    from reposmith.api import init_project
+    from reposmith.logging_utils import setup_logging
+
+    logger = setup_logging()
+    failed = 0
+    for spec in _collect_specs(args):
+        result = init_project(spec, logger)
+        if not result.completed:
+            failed += 1
+    return 1 if failed else 0
 
 def cmd_info(_: argparse.Namespace) -> int:
     """
     Handle the 'info' command to show environment and reposmith status.
 
+    Uses `importlib.util.find_spec` instead of spawning `python -m reposmith -h`.
+
     Args:
         _ (argparse.Namespace): Unused parsed arguments.
 
@@ -80,17 +107,14 @@ def cmd_info(_: argparse.Namespace) -> int:
     """
     print("CWD:", os.getcwd())
     print("Python:", sys.version.split()[0])
-    try:
-        print("reposmith-tol:", version("reposmith-tol"))
-    except PackageNotFoundError:
+    ver = _dist_version("reposmith-tol")
+    if ver:
+        print("reposmith-tol:", ver)
+    else:
         print("reposmith-tol: (not installed) → install via: pip install reposmith-tol")
 
-    code = subprocess.call(
-        [sys.executable, "-m", "reposmith", "-h"],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
-    print("reposmith module:", "OK" if code == 0 else "Not found")
+    found = importlib.util.find_spec("reposmith") is not None
+    print("reposmith module:", "OK" if found else "Not found")
     return 0
 
 def build_parser() -> argparse.ArgumentParser:
@@ -104,11 +128,11 @@ def build_parser() -> argparse.ArgumentParser:
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     init_parser = sub.add_parser("init", help="Initialize a project via reposmith (with sane defaults)")
-    init_parser.add_argument("--root", help="Target project folder (default: current)")
-    init_parser.add_argument("--entry", help="Entry filename (default: main.py)")
+    init_parser.add_argument("--root", action="append", help="Target project folder (default: current); repeat to scaffold several")
+    init_parser.add_argument("--entry", help="Entry filename (default: run.py)")
     init_parser.add_argument("--author", help="Author for LICENSE")
     init_parser.add_argument("--with-ci", action="store_true", dest="with_ci", help="Create GitHub Actions workflow")
-    init_parser.add_argument("--ci-python", dest="ci_python", help="Python version for CI (e.g. 3.12)")
+    init_parser.add_argument("--ci-python", dest="ci_python", help="Python version for CI with --with-ci (e.g. 3.12)")
     init_parser.add_argument("--force", action="store_true", help="Overwrite existing files")
     init_parser.add_argument("--no-venv", action="store_true", help="Skip virtualenv creation")
     init_parser.add_argument("-i", "--interactive", action="store_true", help="Ask minimal questions to fill missing options")
@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+"""
+Programmatic entry point for RepoSmith.
+
+Unlike `reposmith.cli.main`, nothing here parses `sys.argv`, reconfigures
+stdout/stderr or touches `os.environ`. Callers describe a project with a
+`ProjectSpec` and receive an `InitResult` with per-step status, timings and
+written paths, so the pipeline can run in-process many times over.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from .file_utils import create_app_file
+from .ci_utils import ensure_github_actions_workflow
+from .venv_utils import _venv_python, create_virtualenv, resolve_interpreter
+from .bytecode_utils import precompile_project
+from .installer import get_installer
+from .vscode_utils import create_vscode_files, create_vscode_tasks
+from .matrix_utils import create_matrix_venvs, matrix_venv_dir
+from .wheelhouse_utils import Prefetch, start_prefetch, wheelhouse_env
+from .index_server import discover_index_url, index_env
+from .gitignore_utils import create_gitignore
+from .license_utils import create_license
+from .utils.deps import post_init_dependency_setup
+from .lock_utils import LOCK_FILENAME
+from .cache_utils import shared_cache_env
+from .gc_utils import collected_python, restore_collected
+from .core.checkpoints import CheckpointStore
+from .core.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from .core.runner import CommandTimeout, command_env, run_command
+
+_log = logging.getLogger("reposmith.api")
+_log.addHandler(logging.NullHandler())
+
+
+# Spec fields that control how a run executes, not what it produces.
+_RUNTIME_FIELDS = frozenset(
+    {"resume", "deadline", "step_budgets", "wheelhouse", "offline", "index_url", "prefetch"}
+)
+
+
+@dataclass(frozen=True)
+class ProjectSpec:
+    """
+    Typed description of a project to initialize.
+
+    Mirrors the flags of `reposmith init`; `all_addons` plays the role of
+    `--all` and is expanded by `resolved()` instead of mutating the spec.
+    `deadline` (seconds) bounds the whole run and `step_budgets` maps step
+    names to their own budgets. `pythons` lists extra interpreters that each
+    get a `.venv-X.Y` matrix environment. `wheelhouse` points every
+    installer at a local directory of wheels; `offline` forbids the index.
+    `index_url` overrides the package index; when unset, a running
+    `reposmith index serve` on this machine is used automatically.
+    `prefetch` downloads requirements while the venv is being created and
+    `lock` installs from a hashed `requirements.lock`. Installers share the
+    cache named by $REPOSMITH_SHARED_CACHE when it is set. `compile_bytecode`
+    precompiles site-packages and the project after the install, with the
+    given `invalidation_mode`; `pycache_prefix` moves bytecode out of
+    `__pycache__/` and is written into the VS Code configs. `with_ci`
+    (on by default, as `reposmith init` always writes the workflow) can be
+    turned off by front ends that make CI opt-in.
+    """
+
+    root: Path
+    entry: str = "run.py"
+    force: bool = False
+    no_venv: bool = False
+    with_license: bool = False
+    with_gitignore: bool = False
+    with_vscode: bool = False
+    use_uv: bool = False
+    with_brave: bool = False
+    all_addons: bool = False
+    author: str = "Tamer"
+    ci_python: str = "3.12"
+    with_ci: bool = True
+    python_version: Optional[str] = None
+    venv_backend: str = "auto"
+    pythons: tuple[str, ...] = ()
+    wheelhouse: Optional[Path] = None
+    offline: bool = False
+    index_url: Optional[str] = None
+    prefetch: bool = False
+    lock: bool = False
+    compile_bytecode: bool = False
+    invalidation_mode: str = "timestamp"
+    pycache_prefix: Optional[str] = None
+    resume: bool = False
+    deadline: Optional[float] = None
+    step_budgets: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_namespace(cls, args) -> "ProjectSpec":
+        """
+        Build a spec from an argparse Namespace produced by `reposmith init`.
+
+        Args:
+            args: Parsed CLI arguments. Missing attributes fall back to defaults.
+
+        Returns:
+            ProjectSpec: The equivalent typed spec (the namespace is not modified).
+        """
+        entry = getattr(args, "entry", None)
+        return cls(
+            root=Path(getattr(args, "root", None) or Path.cwd()),
+            entry=entry if entry not in (None, "") else "run.py",
+            force=bool(getattr(args, "force", False)),
+            no_venv=bool(getattr(args, "no_venv", False)),
+            with_license=bool(getattr(args, "with_license", False)),
+            with_gitignore=bool(getattr(args, "with_gitignore", False)),
+            with_vscode=bool(getattr(args, "with_vscode", False)),
+            use_uv=bool(getattr(args, "use_uv", False)),
+            with_brave=bool(getattr(args, "with_brave", False)),
+            all_addons=bool(getattr(args, "all", False)),
+            author=getattr(args, "author", None) or "Tamer",
+            ci_python=getattr(args, "ci_python", None) or "3.12",
+            python_version=getattr(args, "python", None),
+            venv_backend=getattr(args, "venv_backend", None) or "auto",
+            pythons=tuple(getattr(args, "pythons", None) or ()),
+            wheelhouse=getattr(args, "wheelhouse", None),
+            offline=bool(getattr(args, "offline", False)),
+            index_url=getattr(args, "index_url", None),
+            prefetch=bool(getattr(args, "prefetch", False)),
+            lock=bool(getattr(args, "lock", False)),
+            compile_bytecode=bool(getattr(args, "compile_bytecode", False)),
+            invalidation_mode=getattr(args, "invalidation_mode", None) or "timestamp",
+            pycache_prefix=getattr(args, "pycache_prefix", None),
+            resume=bool(getattr(args, "resume", False)),
+            deadline=getattr(args, "deadline", None),
+            step_budgets=dict(getattr(args, "step_budget", None) or {}),
+        )
+
+    def fingerprint(self) -> str:
+        """Stable hash of everything that affects the generated project."""
+        data = {k: str(v) for k, v in asdict(self).items() if k not in _RUNTIME_FIELDS}
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def resolved(self) -> "ProjectSpec":
+        """Return a copy with `all_addons` expanded into the individual flags."""
+        if not self.all_addons:
+            return self
+        return replace(
+            self,
+            use_uv=True,
+            with_brave=True,
+            with_vscode=True,
+            with_license=True,
+            with_gitignore=True,
+        )
+
+
+@dataclass
+class StepResult:
+    """Outcome of a single init step."""
+
+    name: str
+    status: str = "pending"  # "written" | "exists" | "skipped" | "cached" | "failed" | "timeout" | "cancelled"
+    duration: float = 0.0
+    paths: list[Path] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status not in FAILED_STATUSES
+
+
+@dataclass
+class InitResult:
+    """Aggregated outcome of `init_project`."""
+
+    root: Path
+    steps: list[StepResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(s.ok for s in self.steps)
+
+    @property
+    def completed(self) -> bool:
+        """True unless a hard step failed or any step ran out of time."""
+        return all(s.ok or (s.name in SOFT_STEPS and s.status == "failed") for s in self.steps)
+
+    @property
+    def written_paths(self) -> list[Path]:
+        return [p for s in self.steps if s.status == "written" for p in s.paths]
+
+    def step(self, name: str) -> Optional[StepResult]:
+        return next((s for s in self.steps if s.name == name), None)
+
+
+# ---------------------------
+# Steps
+# ---------------------------
+# Each step returns (status, paths). Raising marks the step as failed.
+StepFn = Callable[[ProjectSpec, logging.Logger], "tuple[str, list[Path]]"]
+
+
+def _step_venv(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    venv_dir = spec.root / ".venv"
+    if spec.no_venv:
+        logger.info("Skipping virtual environment creation (--no-venv).")
+        return "skipped", []
+    python = spec.python_version
+    if python is None and not venv_dir.exists():
+        # Rebuild a venv removed by `reposmith venv gc` on the interpreter it had.
+        recorded = collected_python(venv_dir)
+        python = recorded if recorded and resolve_interpreter(recorded) else None
+    status = create_virtualenv(venv_dir, python, backend=spec.venv_backend)
+    if status == "written":
+        try:
+            restore_collected(venv_dir)
+        except Exception as e:
+            logger.warning("Could not restore the packages of the collected venv: %s", e)
+    return status, [venv_dir]
+
+
+def _step_matrix(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    if not spec.pythons:
+        return "skipped", []
+    envs = create_matrix_venvs(spec.root, spec.pythons, backend=spec.venv_backend)
+    failed = [e for e in envs if not e.ok]
+    if failed:
+        raise RuntimeError("; ".join(f"{e.venv_dir.name}: {e.error}" for e in failed))
+    dirs = [e.venv_dir for e in envs]
+    create_vscode_tasks(spec.root, dirs, force=spec.force, pycache_prefix=spec.pycache_prefix)
+    status = "written" if any(e.status == "written" for e in envs) else "exists"
+    return status, [*dirs, spec.root / ".vscode" / "tasks.json"]
+
+
+def _step_entry(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    entry_path = spec.root / spec.entry
+    state = create_app_file(entry_path, force=spec.force)
+    logger.info("[entry] %s created at: %s", spec.entry, entry_path)
+    return state, [entry_path]
+
+
+def _step_vscode(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    if not spec.with_vscode:
+        return "skipped", []
+    entry_path = spec.root / spec.entry
+    matrix = [matrix_venv_dir(spec.root, v) for v in spec.pythons]
+    states = create_vscode_files(
+        spec.root,
+        spec.root / ".venv",
+        main_file=str(entry_path),
+        force=spec.force,
+        matrix_venvs=matrix,
+        pycache_prefix=spec.pycache_prefix,
+    )
+    vscode = spec.root / ".vscode"
+    state = "written" if "written" in states.values() else "exists"
+    return state, [vscode / "settings.json", vscode / "launch.json", spec.root / "project.code-workspace"]
+
+
+def _step_gitignore(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    if not spec.with_gitignore:
+        return "skipped", []
+    return create_gitignore(spec.root, force=spec.force), [spec.root / ".gitignore"]
+
+
+def _step_license(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    if not spec.with_license:
+        return "skipped", []
+    target = spec.root / "LICENSE"
+    existed = target.exists()
+    path = create_license(spec.root, license_type="MIT", owner_name=spec.author, force=spec.force)
+    return ("exists" if existed and not spec.force else "written"), [Path(path)]
+
+
+def _step_ci(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    if not spec.with_ci:
+        return "skipped", []
+    state = ensure_github_actions_workflow(spec.root, py=spec.ci_python)
+    return state, [spec.root / ".github" / "workflows" / "ci.yml"]
+
+
+def _step_brave(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    if not spec.with_brave:
+        return "skipped", []
+    brave_py = spec.root / "tools" / "brave.py"
+    if not brave_py.exists():
+        logger.warning("⚠️ tools/brave.py غير موجود — تخطي إعداد Brave (Python-only).")
+        return "skipped", []
+    cmd = [sys.executable, str(brave_py), "--root", str(spec.root), "init"]
+    logger.info("Running: %s", " ".join(cmd))
+    run_command(cmd)
+    logger.info("🦁 Brave Project Browser initialized (Python-only).")
+    return "written", [spec.root / ".brave-profile"]
+
+
+def _uv_compiles_site(spec: ProjectSpec) -> bool:
+    """True if the install itself can precompile site-packages (`uv --compile-bytecode`)."""
+    return (
+        spec.compile_bytecode
+        and spec.invalidation_mode == "timestamp"
+        and spec.pycache_prefix is None
+        and (get_installer() if spec.use_uv else get_installer("pip")).is_uv
+    )
+
+
+def _step_deps(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    paths = [spec.root / LOCK_FILENAME] if spec.lock else []
+    with command_env({"UV_COMPILE_BYTECODE": "1"} if _uv_compiles_site(spec) else {}):
+        return _install_deps(spec, logger), paths
+
+
+def _install_deps(spec: ProjectSpec, logger: logging.Logger) -> str:
+    prefetch = _active_prefetch.get()
+    if prefetch is not None:
+        dl = current_deadline()
+        report = prefetch.result(timeout=dl.remaining() if dl else None)
+        if report is None:
+            logger.info("Prefetch did not complete; installing from the index.")
+        else:
+            logger.info("📦 Installing %d prefetched wheel(s) without network access.", len(report.wheels))
+            try:
+                with command_env(wheelhouse_env(report.dest, offline=True)):
+                    post_init_dependency_setup(spec.root, prefer_uv=spec.use_uv, offline=True, lock=spec.lock)
+                return "written"
+            except Exception as e:
+                logger.warning("Install from prefetched wheels failed (%s); retrying from the index.", e)
+    post_init_dependency_setup(spec.root, prefer_uv=spec.use_uv, offline=spec.offline, lock=spec.lock)
+    return "written"
+
+
+def _step_bytecode(spec: ProjectSpec, logger: logging.Logger) -> tuple[str, list[Path]]:
+    python = Path(_venv_python(spec.root / ".venv"))
+    if not spec.compile_bytecode or spec.no_venv or not python.exists():
+        return "skipped", []
+    compiled = precompile_project(
+        spec.root,
+        str(python),
+        invalidation_mode=spec.invalidation_mode,
+        pycache_prefix=spec.pycache_prefix,
+        include_site=not _uv_compiles_site(spec),
+    )
+    logger.info("⚡ Precompiled bytecode for %d location(s).", len(compiled))
+    return "written", [spec.root / spec.pycache_prefix] if spec.pycache_prefix else []
+
+
+INIT_STEPS: list[tuple[str, StepFn]] = [
+    ("venv", _step_venv),
+    ("entry", _step_entry),
+    ("matrix", _step_matrix),
+    ("vscode", _step_vscode),
+    ("gitignore", _step_gitignore),
+    ("license", _step_license),
+    ("ci", _step_ci),
+    ("brave", _step_brave),
+    ("deps", _step_deps),
+    ("bytecode", _step_bytecode),
+]
+
+# Background download started by `init_project` and consumed by the deps step.
+_active_prefetch: contextvars.ContextVar[Optional[Prefetch]] = contextvars.ContextVar(
+    "reposmith_prefetch", default=None
+)
+
+
+@contextmanager
+def _prefetch_scope(prefetch: Optional[Prefetch]) -> Iterator[None]:
+    token = _active_prefetch.set(prefetch)
+    try:
+        yield
+    finally:
+        _active_prefetch.reset(token)
+
+
+def _maybe_start_prefetch(spec: ProjectSpec, logger: logging.Logger) -> Optional[Prefetch]:
+    req = spec.root / "requirements.txt"
+    if not spec.prefetch or spec.no_venv or spec.offline or not req.is_file() or req.stat().st_size == 0:
+        return None
+    python = resolve_interpreter(spec.python_version) or sys.executable
+    logger.info("⇣ Prefetching wheels for %s in the background.", req.name)
+    return start_prefetch(req, python=python, extra=("pip", "uv") if spec.use_uv else ("pip",))
+
+
+FAILED_STATUSES = frozenset({"failed", "timeout", "cancelled"})
+
+# Seconds to wait for a cancelled prefetch's in-flight download when init aborts.
+PREFETCH_CANCEL_TIMEOUT = 5.0
+
+# Steps whose failure is reported but does not abort the pipeline.
+SOFT_STEPS = frozenset({"deps", "bytecode"})
+
+# Inputs (besides a step's own outputs) that invalidate its checkpoint.
+CHECKPOINT_INPUTS: dict[str, Callable[[ProjectSpec], list[Path]]] = {
+    "matrix": lambda spec: [spec.root / "requirements.txt"],
+    "deps": lambda spec: [
+        spec.root / "requirements.txt",
+        spec.root / "pyproject.toml",
+        spec.root / ".venv",
+    ],
+    "bytecode": lambda spec: [spec.root / "requirements.txt", spec.root / ".venv"],
+}
+
+
+def init_project(
+    spec: ProjectSpec,
+    logger: Optional[logging.Logger] = None,
+    *,
+    on_step: Optional[Callable[[StepResult], None]] = None,
+) -> InitResult:
+    """
+    Initialize a project described by `spec` in the current process.
+
+    Args:
+        spec (ProjectSpec): What to create and where.
+        logger (Optional[logging.Logger]): Logger for progress messages.
+            Defaults to a silent library logger.
+        on_step (Optional[Callable[[StepResult], None]]): Called after each
+            step finishes, e.g. to stream progress events.
+
+    Returns:
+        InitResult: Per-step status, timings and written paths. A failing
+        hard step stops the pipeline; later steps are not recorded.
+
+    Raises:
+        ValueError: If `spec.offline` is set without `spec.wheelhouse`.
+    """
+    logger = logger or _log
+    install_env = wheelhouse_env(spec.wheelhouse, spec.offline)
+    index_url = spec.index_url
+    if index_url is None and not spec.offline and "PIP_INDEX_URL" not in os.environ:
+        index_url = discover_index_url()
+        if index_url:
+            logger.info("📦 Using local package index: %s", index_url)
+    install_env = {**shared_cache_env(), **index_env(index_url), **install_env}
+    spec = spec.resolved()
+    spec = replace(spec, root=Path(spec.root))
+    spec.root.mkdir(parents=True, exist_ok=True)
+    logger.info("🚀 Initializing project at: %s", spec.root)
+
+    store = CheckpointStore(spec.root)
+    fingerprint = spec.fingerprint()
+    reusable = spec.resume and store.spec_fingerprint == fingerprint
+    if spec.resume and not reusable:
+        logger.info("No matching checkpoints for this spec; running every step.")
+    if not reusable:
+        store.reset(fingerprint)
+
+    result = InitResult(root=spec.root)
+    started = time.perf_counter()
+    deadline = Deadline(spec.deadline)
+    prefetch = None
+    if not (reusable and store.is_valid("deps")):
+        # Overlaps downloads with venv creation; bounded by the overall deadline.
+        with deadline_scope(deadline), command_env(install_env):
+            prefetch = _maybe_start_prefetch(spec, logger)
+    for name, fn in INIT_STEPS:
+        # Reuse checkpoints only up to the first failed or invalidated step.
+        if reusable and store.is_valid(name):
+            rec = store.recorded(name) or {}
+            step = StepResult(name=name, status="cached", paths=[spec.root / p for p in rec.get("paths", [])])
+            logger.info("↷ %s: unchanged since last run (resumed).", name)
+            result.steps.append(step)
+            if on_step is not None:
+                on_step(step)
+            continue
+        reusable = False
+
+        step = StepResult(name=name)
+        if deadline.expired:
+            step.status, step.error = "cancelled", "deadline exceeded"
+            result.steps.append(step)
+            if on_step is not None:
+                on_step(step)
+            logger.error("⏱ Deadline exceeded before step '%s'; stopping.", name)
+            break
+
+        t0 = time.perf_counter()
+        try:
+            with (
+                deadline_scope(deadline.child(spec.step_budgets.get(name))),
+                command_env(install_env),
+                _prefetch_scope(prefetch),
+            ):
+                step.status, step.paths = fn(spec, logger)
+        except (CommandTimeout, DeadlineExceeded) as e:
+            step.status, step.error = "timeout", str(e)
+        except Exception as e:
+            step.status, step.error = "failed", str(e)
+        step.duration = time.perf_counter() - t0
+        extra = CHECKPOINT_INPUTS.get(name, lambda _s: [])(spec)
+        store.record(name, step.status, step.paths, extra, step.error)
+        result.steps.append(step)
+        if on_step is not None:
+            on_step(step)
+        if not step.ok:
+            if name in SOFT_STEPS:
+                logger.warning("Step '%s' %s (continuing): %s", name, step.status, step.error)
+                continue
+            logger.error("Step '%s' %s: %s", name, step.status, step.error)
+            break
+    if prefetch is not None and not prefetch.done():
+        # Aborted before deps consumed it: don't leave downloads running behind us.
+        prefetch.cancel(timeout=PREFETCH_CANCEL_TIMEOUT)
+    result.duration = time.perf_counter() - started
+
+    if result.completed:
+        logger.info("✅ Project initialized successfully at: %s", spec.root)
+    return result
+
+
+async def init_project_async(
+    spec: ProjectSpec,
+    logger: Optional[logging.Logger] = None,
+    *,
+    on_step: Optional[Callable[[StepResult], None]] = None,
+) -> InitResult:
+    """
+    Async flavor of `init_project`; runs the pipeline in a worker thread.
+
+    Args:
+        spec (ProjectSpec): What to create and where.
+        logger (Optional[logging.Logger]): Logger for progress messages.
+        on_step (Optional[Callable[[StepResult], None]]): Per-step callback.
+
+    Returns:
+        InitResult: Same as `init_project`.
+    """
+    return await asyncio.to_thread(init_project, spec, logger, on_step=on_step)
@@ -0,0 +1,129 @@
+# reposmith/bytecode_utils.py
+"""
+Ahead-of-time bytecode compilation for a project and its venv.
+
+The first import of every module otherwise pays for compiling it, which is
+what makes the first run of a freshly initialized project (and its first
+test run) slow. `precompile_project` runs `compileall` inside the target
+interpreter, across all cores, over site-packages and the project sources.
+
+Invalidation modes follow PEP 552: "timestamp" (the default), "checked-hash"
+(stable across checkouts), or "unchecked-hash", which never re-checks
+sources and suits read-only deploy venvs. With a pycache prefix, bytecode
+goes to a separate tree (PYTHONPYCACHEPREFIX) instead of `__pycache__/`.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .core.runner import command_env, run_command
+
+INVALIDATION_MODES = ("timestamp", "checked-hash", "unchecked-hash")
+
+# Never compiled as project sources: venvs, VCS data and build output.
+PROJECT_EXCLUDE = r"[/\\](\.venv[^/\\]*|venv|\.git|\.tox|\.nox|node_modules|build|dist)([/\\]|$)"
+# Project bytecode must notice edits, so unchecked-hash applies to site-packages only.
+_PROJECT_MODES = {"unchecked-hash": "checked-hash"}
+
+
+def project_exclude(root: str | Path) -> str:
+    """PROJECT_EXCLUDE anchored below `root`, so directories above the project never match."""
+    return "^" + re.escape(str(root).rstrip("/\\")) + r"(?:[/\\].*)?" + PROJECT_EXCLUDE
+
+
+def site_packages(python: str) -> list[str]:
+    """purelib and platlib of `python` (deduplicated, existing only)."""
+    code = "import json, sysconfig; p = sysconfig.get_paths(); print(json.dumps([p['purelib'], p['platlib']]))"
+    out = run_command([python, "-c", code], capture=True, stream=False).output
+    dirs: list[str] = []
+    for d in json.loads(out.strip().splitlines()[-1]):
+        if d not in dirs and os.path.isdir(d):
+            dirs.append(d)
+    return dirs
+
+
+def pycache_env(prefix: Optional[str | Path]) -> dict[str, str]:
+    """Environment selecting a bytecode prefix (empty if none)."""
+    return {"PYTHONPYCACHEPREFIX": str(prefix)} if prefix else {}
+
+
+def compile_tree(
+    python: str,
+    paths: Sequence[str | Path],
+    *,
+    invalidation_mode: str = "timestamp",
+    exclude: Optional[str] = None,
+    pycache_prefix: Optional[str | Path] = None,
+    workers: int = 0,
+) -> None:
+    """
+    Run `python -m compileall` over `paths`.
+
+    Args:
+        python (str): Interpreter whose bytecode version is produced.
+        paths (Sequence[str | Path]): Directories or files to compile.
+        invalidation_mode (str): One of INVALIDATION_MODES.
+        exclude (Optional[str]): Regex of paths to skip (`compileall -x`).
+        pycache_prefix (Optional[str | Path]): Write bytecode under this tree.
+        workers (int): Processes; 0 means one per CPU.
+
+    Raises:
+        ValueError: If the invalidation mode is unknown.
+    """
+    if invalidation_mode not in INVALIDATION_MODES:
+        raise ValueError(f"Unknown invalidation mode '{invalidation_mode}'. Choose from: {', '.join(INVALIDATION_MODES)}")
+    if not paths:
+        return
+    cmd = [python, "-m", "compileall", "-q", "-j", str(workers), "--invalidation-mode", invalidation_mode]
+    if exclude:
+        cmd += ["-x", exclude]
+    with command_env(pycache_env(pycache_prefix)):
+        run_command(cmd + [str(p) for p in paths], stream=False)
+
+
+def precompile_project(
+    root: Path,
+    python: str,
+    *,
+    invalidation_mode: str = "timestamp",
+    pycache_prefix: Optional[str | Path] = None,
+    include_site: bool = True,
+) -> list[str]:
+    """
+    Compile the project sources and, optionally, the venv's site-packages.
+
+    Args:
+        root (Path): Project root; venvs, VCS and build directories are skipped.
+        python (str): The venv interpreter.
+        invalidation_mode (str): One of INVALIDATION_MODES. Project sources get
+            "checked-hash" instead of "unchecked-hash", so edits are never masked.
+        pycache_prefix (Optional[str | Path]): Bytecode tree, relative to `root`
+            unless absolute.
+        include_site (bool): Also compile site-packages (False when the
+            installer already did, e.g. uv with `--compile-bytecode`).
+
+    Returns:
+        list[str]: The directories compiled.
+    """
+    root = Path(root).resolve()
+    prefix = None if pycache_prefix is None else root / pycache_prefix
+    compiled: list[str] = []
+    if include_site:
+        site = site_packages(python)
+        print(f"[bytecode] Compiling site-packages ({invalidation_mode}) on all cores")
+        compile_tree(python, site, invalidation_mode=invalidation_mode, pycache_prefix=prefix)
+        compiled += site
+    print(f"[bytecode] Compiling project sources in {root}")
+    compile_tree(
+        python,
+        [root],
+        invalidation_mode=_PROJECT_MODES.get(invalidation_mode, invalidation_mode),
+        exclude=project_exclude(root),
+        pycache_prefix=prefix,
+    )
+    compiled.append(str(root))
+    return compiled
@@ -0,0 +1,492 @@
+# reposmith/cache_utils.py
+"""
+Inspect and bound the package caches reposmith's installs lean on.
+
+Covered locations: the uv cache, the pip cache, an optional shared fleet
+cache (`--shared-cache` / REPOSMITH_SHARED_CACHE), and reposmith's own
+caches (matrix wheel cache, prefetched wheelhouses, the index store and
+interpreter probe results). Service state such as queued jobs is never
+touched.
+
+Each location is split into entries, the unit that is measured and evicted
+(a uv cache entry, a pip cache file, a prefetched wheelhouse, ...). Entries
+are walked in parallel with `os.scandir`; `prune_caches` removes the least
+recently used ones until the caches fit a size budget, skipping packages
+pinned by a project's lock (`reposmith cache pin`).
+
+uv caches are only ever changed through uv itself (`uv cache clean <pkg>`,
+`uv cache prune`), which takes uv's cache lock and keeps its links between
+buckets consistent; files are deleted directly only in pip's and
+reposmith's own caches.
+"""
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from .core.fs import atomic_write
+from .core.runner import CommandError, run_command
+from .installer import uv_command
+from .interpreter_utils import CACHE_FILENAME as PROBE_CACHE_FILENAME
+from .lock_utils import LOCK_FILENAME
+from .utils.paths import cache_dir
+
+PINS_FILENAME = "cache-pins.json"
+SHARED_CACHE_ENV = "REPOSMITH_SHARED_CACHE"
+AGE_BUCKETS = ((86400, "< 1 day"), (7 * 86400, "< 1 week"), (30 * 86400, "< 30 days"), (90 * 86400, "< 90 days"))
+
+# Bookkeeping files the tools rely on; never counted as evictable entries.
+_RESERVED = {"CACHEDIR.TAG", ".lock", ".gitignore", "README.md"}
+_UV_PACKAGE_BUCKETS = ("wheels-", "built-wheels-", "sdists-", "simple-")
+_DIST_RE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._]*?)-(\d[^-]*?)(?:\.dist-info|-[^-]+-[^-]+-[^-]+\.whl|\.tar\.gz|\.zip)$")
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+# ---------------------------
+# Locations
+# ---------------------------
+@dataclass(frozen=True)
+class CacheLocation:
+    """
+    One cache directory (or file) and how it is laid out.
+
+    Args:
+        name (str): Label shown in reports, e.g. "uv" or "reposmith:prefetch".
+        path (Path): Directory or file.
+        layout (str): "uv", "pip", "store" (`<project>/<file>`), "dirs"
+            (one entry per child) or "file".
+    """
+
+    name: str
+    path: Path
+    layout: str
+
+
+def _default_uv_cache() -> Path:
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "uv" / "cache"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "uv"
+
+
+def _default_pip_cache() -> Path:
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "pip" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "pip"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pip"
+
+
+def shared_cache_env(path: Optional[str | Path] = None) -> dict[str, str]:
+    """
+    Environment pointing every uv and pip subprocess at one shared cache.
+
+    Args:
+        path (Optional[str | Path]): Shared cache root (default:
+            $REPOSMITH_SHARED_CACHE). uv uses `<root>/uv`, pip `<root>/pip`.
+
+    Returns:
+        dict[str, str]: Variables to apply with `command_env` (empty if unset).
+    """
+    root = path or os.environ.get(SHARED_CACHE_ENV)
+    if not root:
+        return {}
+    root = Path(root).expanduser().resolve()
+    return {"UV_CACHE_DIR": str(root / "uv"), "PIP_CACHE_DIR": str(root / "pip")}
+
+
+def cache_locations(shared: Optional[str | Path] = None) -> list[CacheLocation]:
+    """
+    Every cache location on this machine, existing or not, without duplicates.
+
+    Args:
+        shared (Optional[str | Path]): Shared cache root, as for `shared_cache_env`.
+    """
+    own = cache_dir()
+    env = shared_cache_env(shared)
+    candidates = [
+        CacheLocation("uv", Path(os.environ.get("UV_CACHE_DIR") or _default_uv_cache()), "uv"),
+        CacheLocation("pip", Path(os.environ.get("PIP_CACHE_DIR") or _default_pip_cache()), "pip"),
+    ]
+    if env:
+        candidates += [
+            CacheLocation("shared:uv", Path(env["UV_CACHE_DIR"]), "uv"),
+            CacheLocation("shared:pip", Path(env["PIP_CACHE_DIR"]), "pip"),
+        ]
+    candidates += [
+        CacheLocation("reposmith:wheels-uv", own / "wheels" / "uv", "uv"),
+        CacheLocation("reposmith:wheels-pip", own / "wheels" / "pip", "pip"),
+        CacheLocation("reposmith:prefetch", own / "prefetch", "dirs"),
+        CacheLocation("reposmith:index", own / "index" / "files", "store"),
+        CacheLocation("reposmith:probes", own / PROBE_CACHE_FILENAME, "file"),
+    ]
+    seen: set[str] = set()
+    out: list[CacheLocation] = []
+    for loc in candidates:
+        key = os.path.realpath(loc.path)
+        if key not in seen:
+            seen.add(key)
+            out.append(loc)
+    return out
+
+
+# ---------------------------
+# Scanning
+# ---------------------------
+@dataclass
+class CacheEntry:
+    """An evictable unit of a cache location."""
+
+    location: str
+    path: Path
+    size: int = 0
+    files: int = 0
+    last_used: float = 0.0
+    package: Optional[str] = None
+    version: Optional[str] = None
+
+
+@dataclass
+class CacheStats:
+    """Result of `scan_caches`."""
+
+    entries: list[CacheEntry] = field(default_factory=list)
+    scanned_at: float = field(default_factory=time.time)
+    locations: list[CacheLocation] = field(default_factory=list)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e.size for e in self.entries)
+
+    def by_location(self) -> dict[str, int]:
+        out: dict[str, int] = {}
+        for e in self.entries:
+            out[e.location] = out.get(e.location, 0) + e.size
+        return out
+
+    def by_package(self) -> dict[str, int]:
+        """Bytes per normalized package name; unattributed entries are "(other)"."""
+        out: dict[str, int] = {}
+        for e in self.entries:
+            key = e.package or "(other)"
+            out[key] = out.get(key, 0) + e.size
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]))
+
+    def by_age(self) -> dict[str, int]:
+        """Bytes per last-use age bucket."""
+        out = {label: 0 for _, label in AGE_BUCKETS}
+        out["older"] = 0
+        for e in self.entries:
+            age = self.scanned_at - e.last_used
+            label = next((lbl for limit, lbl in AGE_BUCKETS if age < limit), "older")
+            out[label] += e.size
+        return out
+
+
+def _entry_paths(loc: CacheLocation) -> list[Path]:
+    """Split a location into entries according to its layout."""
+    if loc.layout == "file":
+        return [loc.path] if loc.path.is_file() else []
+    if not loc.path.is_dir():
+        return []
+    top = [Path(e.path) for e in os.scandir(loc.path) if e.name not in _RESERVED]
+    if loc.layout == "dirs":
+        return top
+    if loc.layout == "pip":
+        # Every file in the pip cache is self-contained (HTTP responses, built wheels).
+        out: list[Path] = []
+        stack = top
+        while stack:
+            p = stack.pop()
+            if p.is_dir() and not p.is_symlink():
+                stack.extend(Path(e.path) for e in os.scandir(p))
+            elif p.name not in _RESERVED:
+                out.append(p)
+        return out
+    # "uv" and "store": one entry per child of each bucket directory.
+    out = []
+    for bucket in top:
+        if not bucket.is_dir() or bucket.is_symlink():
+            out.append(bucket)
+            continue
+        children = [Path(e.path) for e in os.scandir(bucket) if e.name not in _RESERVED]
+        if loc.layout == "uv" and bucket.name.startswith(_UV_PACKAGE_BUCKETS):
+            # <bucket>/<index>/<package>
+            nested: list[Path] = []
+            for d in children:
+                if d.is_dir():
+                    nested.extend(Path(e.path) for e in os.scandir(d) if e.name not in _RESERVED)
+                else:
+                    nested.append(d)
+            children = nested
+        out.extend(children)
+    return out
+
+
+def _package_of(loc: CacheLocation, path: Path) -> tuple[Optional[str], Optional[str]]:
+    m = _DIST_RE.match(path.name)
+    if m:
+        return _normalize(m.group(1)), m.group(2)
+    rel = path.relative_to(loc.path).parts if loc.layout != "file" else ()
+    if loc.layout == "store" and len(rel) == 2:
+        return _normalize(rel[0]), None
+    if loc.layout == "uv" and len(rel) == 3 and rel[0].startswith(_UV_PACKAGE_BUCKETS):
+        return _normalize(rel[2].split(".")[0]), None
+    return None, None
+
+
+def _measure(loc: CacheLocation, path: Path) -> CacheEntry:
+    entry = CacheEntry(loc.name, path)
+    entry.package, entry.version = _package_of(loc, path)
+    stack = [path]
+    while stack:
+        p = stack.pop()
+        try:
+            st = p.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        if p.is_dir() and not p.is_symlink():
+            # Directory times change whenever we list them; only files count.
+            with os.scandir(p) as it:
+                for e in it:
+                    if entry.package is None and e.is_dir(follow_symlinks=False):
+                        m = _DIST_RE.match(e.name)
+                        if m:
+                            entry.package, entry.version = _normalize(m.group(1)), m.group(2)
+                    stack.append(Path(e.path))
+        else:
+            entry.size += st.st_size
+            entry.files += 1
+            entry.last_used = max(entry.last_used, st.st_mtime, st.st_atime)
+    return entry
+
+
+def scan_caches(locations: Optional[Sequence[CacheLocation]] = None, *, jobs: Optional[int] = None) -> CacheStats:
+    """
+    Measure every entry of the given cache locations on a thread pool.
+
+    Args:
+        locations (Optional[Sequence[CacheLocation]]): Default: `cache_locations()`.
+        jobs (Optional[int]): Worker threads (default: 4 x CPU count, I/O bound).
+
+    Returns:
+        CacheStats: One `CacheEntry` per entry, with size, file count,
+        last use (latest atime/mtime) and the package it belongs to, if known.
+    """
+    locations = cache_locations() if locations is None else locations
+    work = [(loc, p) for loc in locations for p in _entry_paths(loc)]
+    stats = CacheStats(locations=list(locations))
+    if not work:
+        return stats
+    workers = max(1, min(jobs or 4 * (os.cpu_count() or 2), len(work)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-cache") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, _measure, loc, p) for loc, p in work]
+        stats.entries = [f.result() for f in futures]
+    return stats
+
+
+# ---------------------------
+# Pins
+# ---------------------------
+def _pins_path() -> Path:
+    return cache_dir() / PINS_FILENAME
+
+
+def lock_pins(root: Path) -> dict[str, Optional[str]]:
+    """
+    Packages used by a project: `name -> version` from requirements.lock,
+    else the `==` pins of requirements.txt (other requirements pin the name only).
+    """
+    for name in (LOCK_FILENAME, "requirements.txt"):
+        f = Path(root) / name
+        if f.is_file():
+            break
+    else:
+        return {}
+    pins: dict[str, Optional[str]] = {}
+    for line in f.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        m = re.match(r"([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*(?:==\s*([^\s;\\]+))?", line)
+        if m:
+            pins[_normalize(m.group(1))] = m.group(2)
+    return pins
+
+
+def load_pins() -> dict[str, dict[str, Optional[str]]]:
+    """Pinned projects (`root -> packages`), dropping projects that no longer exist."""
+    try:
+        data = json.loads(_pins_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return {root: pkgs for root, pkgs in data.items() if Path(root).is_dir()}
+
+
+def pin_project(root: Path, *, remove: bool = False) -> dict[str, Optional[str]]:
+    """
+    Record (or forget) the packages of a project's lock so pruning keeps them.
+
+    Returns:
+        dict[str, Optional[str]]: The packages now pinned for `root`.
+    """
+    key = str(Path(root).resolve())
+    pins = load_pins()
+    if remove:
+        pins.pop(key, None)
+    else:
+        pins[key] = lock_pins(Path(root))
+    path = _pins_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(path, json.dumps(pins, indent=2, sort_keys=True) + "\n")
+    return pins.get(key, {})
+
+
+def _merge_pins(groups: Iterable[dict[str, Optional[str]]]) -> dict[str, set[Optional[str]]]:
+    merged: dict[str, set[Optional[str]]] = {}
+    for group in groups:
+        for name, ver in group.items():
+            merged.setdefault(name, set()).add(ver)
+    return merged
+
+
+def is_pinned(entry: CacheEntry, pins: dict[str, set[Optional[str]]]) -> bool:
+    """An entry is pinned if its package is pinned at its version (or at any version)."""
+    versions = pins.get(entry.package or "")
+    if not versions:
+        return False
+    return None in versions or entry.version is None or entry.version in versions
+
+
+# ---------------------------
+# Pruning
+# ---------------------------
+@dataclass
+class PruneReport:
+    """Outcome of `prune_caches`."""
+
+    removed: list[CacheEntry] = field(default_factory=list)
+    pinned: int = 0
+    remaining_bytes: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def freed_bytes(self) -> int:
+        return sum(e.size for e in self.removed)
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _clean_uv(cache: Path, packages: list[str]) -> None:
+    """`uv cache clean <packages>` then `uv cache prune` on one uv cache, under uv's lock."""
+    uv = uv_command()
+    if uv is None:
+        raise FileNotFoundError("uv is not installed; its cache can only be pruned through uv")
+    run_command([*uv, "cache", "clean", "--cache-dir", str(cache), *packages], stream=False)
+    run_command([*uv, "cache", "prune", "--cache-dir", str(cache)], stream=False)
+
+
+def prune_caches(
+    stats: CacheStats,
+    *,
+    budget: Optional[int] = None,
+    older_than: Optional[float] = None,
+    project: Optional[Path] = None,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+) -> PruneReport:
+    """
+    Evict least recently used entries.
+
+    Entries unused for longer than `older_than` go first; then the oldest
+    remaining ones until the total fits `budget`. Packages pinned with
+    `pin_project`, and those in the lock of `project`, are kept.
+
+    In uv caches the unit is a whole package: evicting one of its entries
+    runs `uv cache clean <package>`, which drops all of them, so a package
+    with any pinned entry there is kept whole. uv entries that belong to no
+    package are left to `uv cache prune`.
+
+    Args:
+        stats (CacheStats): A fresh `scan_caches` result.
+        budget (Optional[int]): Size cap in bytes for the scanned locations.
+        older_than (Optional[float]): Age in seconds after which entries are removed.
+        project (Optional[Path]): Project whose lock is pinned implicitly.
+        dry_run (bool): Report what would be removed without deleting.
+        jobs (Optional[int]): Parallel deletions.
+
+    Returns:
+        PruneReport: Removed entries, pinned count and the remaining size.
+    """
+    pins = _merge_pins([*load_pins().values(), lock_pins(project) if project else {}])
+    uv_caches = {loc.name: loc.path for loc in stats.locations if loc.layout == "uv"}
+    groups: dict[tuple[str, str], list[CacheEntry]] = {}
+    blocked: set[tuple[str, str]] = set()
+    for entry in stats.entries:
+        if entry.location in uv_caches and entry.package:
+            groups.setdefault((entry.location, entry.package), []).append(entry)
+            if is_pinned(entry, pins):
+                blocked.add((entry.location, entry.package))
+
+    report = PruneReport()
+    total = stats.total_bytes
+    taken: set[int] = set()
+    for entry in sorted(stats.entries, key=lambda e: e.last_used):
+        if id(entry) in taken:
+            continue
+        if is_pinned(entry, pins):
+            report.pinned += 1
+            continue
+        key = (entry.location, entry.package or "")
+        if entry.location in uv_caches and (not entry.package or key in blocked):
+            continue
+        stale = older_than is not None and stats.scanned_at - entry.last_used > older_than
+        if stale or (budget is not None and total > budget):
+            for e in (groups.get(key, [entry]) if entry.location in uv_caches else [entry]):
+                taken.add(id(e))
+                report.removed.append(e)
+                total -= e.size
+    report.remaining_bytes = total
+    if dry_run or not report.removed:
+        return report
+
+    direct = [e for e in report.removed if e.location not in uv_caches]
+    by_uv_cache: dict[str, list[CacheEntry]] = {}
+    for e in report.removed:
+        if e.location in uv_caches:
+            by_uv_cache.setdefault(e.location, []).append(e)
+    failed: set[int] = set()
+    if direct:
+        workers = max(1, min(jobs or 2 * (os.cpu_count() or 2), len(direct)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-prune") as pool:
+            futures = {pool.submit(_remove, e.path): e for e in direct}
+        for fut, entry in futures.items():
+            if fut.exception() is not None:
+                report.errors[str(entry.path)] = str(fut.exception())
+                failed.add(id(entry))
+    for name, entries in by_uv_cache.items():
+        try:
+            _clean_uv(uv_caches[name], sorted({e.package for e in entries if e.package}))
+        except (CommandError, OSError) as e:
+            report.errors[str(uv_caches[name])] = str(e)
+            failed.update(id(x) for x in entries)
+    if failed:
+        report.remaining_bytes += sum(e.size for e in report.removed if id(e) in failed)
+        report.removed = [e for e in report.removed if id(e) not in failed]
+    return report
@@ -0,0 +1,251 @@
+# reposmith/clean_utils.py
+"""
+Purge caches and build artifacts from a project tree.
+
+What counts as junk comes from the Python .gitignore preset: its bytecode,
+build-artifact and testing/coverage sections, minus patterns that can match
+hand-written files (`*.spec`, `lib/`, ...). The patterns are compiled into
+one regular expression per kind (directory / file) and matched against
+entry names while a multi-threaded `os.scandir` walk runs. The walk never
+enters `.git`, `node_modules` or any virtual environment, and matched
+directories are removed whole without being walked first.
+
+Plain directory names such as `build/` or `dist/` are common in source trees
+too (`src/pkg/build/`), so they only match directly below a project root: the
+cleaned directory or one holding a pyproject.toml, setup.py or setup.cfg.
+Inside a git checkout, nothing git tracks is ever removed.
+"""
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from .core.runner import run_command
+from .core.walk import DESCEND, MATCH, SKIP, VCS_DIRS, is_venv, remove_trees, scan_tree
+from .gitignore_utils import PYTHON_GITIGNORE
+
+CLEAN_SECTIONS = (
+    "Python: Bytecode, Caches, Compiled Files",
+    "Package/Build Artifacts",
+    "Testing / Coverage",
+)
+# Preset entries that may match hand-written or vendored files.
+KEEP_PATTERNS = frozenset({
+    "*.so", "*.sage.py", "*.manifest", "*.spec", "MANIFEST", ".Python",
+    "lib/", "lib64/", "parts/", "var/", "downloads/", "wheels/", "share/python-wheels/",
+})
+# Files marking a directory as a project root, where anchored patterns apply.
+PROJECT_MARKERS = ("pyproject.toml", "setup.py", "setup.cfg")
+# Venv directory names skipped even when pyvenv.cfg is missing (broken venvs).
+VENV_NAMES = frozenset({".venv", "venv"})
+
+
+def preset_sections(text: str = PYTHON_GITIGNORE) -> dict[str, list[str]]:
+    """Split a .gitignore preset into `{section title: patterns}`."""
+    sections: dict[str, list[str]] = {}
+    title = ""
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("# ==="):
+            continue
+        if line.startswith("#"):
+            title = line.lstrip("# ").strip()
+            continue
+        sections.setdefault(title, []).append(line)
+    return sections
+
+
+def clean_patterns() -> list[str]:
+    """The preset patterns `reposmith clean` removes."""
+    sections = preset_sections()
+    return [p for name in CLEAN_SECTIONS for p in sections.get(name, []) if p not in KEEP_PATTERNS]
+
+
+@dataclass(frozen=True)
+class Matcher:
+    """
+    Compiled name patterns: `dirs` match directories, `files` everything else,
+    `anchored` directories directly below a project root only.
+    """
+
+    dirs: Optional[re.Pattern]
+    files: Optional[re.Pattern]
+    anchored: Optional[re.Pattern] = None
+
+    def match(self, name: str, is_dir: bool, at_root: bool = True) -> bool:
+        pattern = self.dirs if is_dir else self.files
+        if pattern and pattern.match(name):
+            return True
+        return bool(is_dir and at_root and self.anchored and self.anchored.match(name))
+
+
+def compile_matcher(patterns: Iterable[str]) -> Matcher:
+    """
+    Compile gitignore-style name patterns into one regex per entry kind.
+
+    A trailing "/" restricts a pattern to directories; other patterns match
+    both. Directory-only patterns that are a plain name (`build/`, not
+    `*.egg-info/` or `.tox/`) are anchored at project roots. Only name
+    patterns are supported: anything with an inner "/" or a "!" negation is
+    ignored.
+    """
+    dirs: list[str] = []
+    files: list[str] = []
+    anchored: list[str] = []
+    for p in patterns:
+        p = p.strip()
+        dir_only = p.endswith("/")
+        p = p.rstrip("/")
+        if not p or "/" in p or p.startswith("!"):
+            continue
+        rx = fnmatch.translate(p)
+        if dir_only and not p.startswith((".", "_")) and not any(c in p for c in "*?["):
+            anchored.append(rx)
+            continue
+        dirs.append(rx)
+        if not dir_only:
+            files.append(rx)
+
+    def join(parts: list[str]) -> Optional[re.Pattern]:
+        return re.compile("|".join(f"(?:{x})" for x in parts)) if parts else None
+
+    return Matcher(join(dirs), join(files), join(anchored))
+
+
+@dataclass
+class Artifact:
+    """A file or directory to remove."""
+
+    path: Path
+    is_dir: bool
+    size: int = 0
+    newest: float = 0.0
+
+
+@dataclass
+class CleanReport:
+    """Outcome of `clean_project`."""
+
+    artifacts: list[Artifact] = field(default_factory=list)
+    skipped_recent: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return sum(a.size for a in self.artifacts)
+
+
+def find_artifacts(root: Path, matcher: Matcher, *, jobs: Optional[int] = None) -> list[Artifact]:
+    """Matching entries below `root`, without entering VCS dirs, venvs or matches."""
+    top = os.path.normpath(root)
+
+    def at_root(path: str) -> bool:
+        parent = os.path.dirname(path)
+        return parent == top or any(os.path.isfile(os.path.join(parent, m)) for m in PROJECT_MARKERS)
+
+    def classify(entry: os.DirEntry) -> str:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name in VCS_DIRS or entry.name in VENV_NAMES or is_venv(entry.path):
+                return SKIP
+            return MATCH if matcher.match(entry.name, True, at_root(entry.path)) else DESCEND
+        return MATCH if matcher.match(entry.name, False) else SKIP
+
+    found = scan_tree([root], classify, jobs=jobs)
+    return [Artifact(Path(e.path), e.is_dir(follow_symlinks=False)) for e in found]
+
+
+def git_tracked(root: Path) -> set[str]:
+    """
+    Absolute paths of the files git tracks below `root`, plus every directory
+    containing one. Empty outside a git checkout or without git.
+    """
+    try:
+        res = run_command(["git", "-c", "core.quotepath=off", "-C", str(root), "ls-files"],
+                          check=False, capture=True, stream=False)
+    except OSError:
+        return set()
+    if res.returncode != 0:
+        return set()
+    top = str(Path(root).resolve())
+    tracked: set[str] = set()
+    for rel in filter(None, res.output.splitlines()):
+        path = os.path.normpath(os.path.join(top, rel))
+        while path not in tracked:
+            tracked.add(path)
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+    return tracked
+
+
+def _measure(artifact: Artifact) -> Artifact:
+    stack = [artifact.path]
+    while stack:
+        p = stack.pop()
+        try:
+            st = p.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        if p.is_dir() and not p.is_symlink():
+            try:
+                stack.extend(Path(e.path) for e in os.scandir(p))
+            except OSError:
+                pass
+        else:
+            artifact.size += st.st_size
+            artifact.newest = max(artifact.newest, st.st_mtime)
+    return artifact
+
+
+def clean_project(
+    root: Path,
+    *,
+    patterns: Optional[Sequence[str]] = None,
+    older_than: Optional[float] = None,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+) -> CleanReport:
+    """
+    Find and delete caches and build artifacts below `root`.
+
+    Args:
+        root (Path): Project (or monorepo) root.
+        patterns (Optional[Sequence[str]]): Name patterns (default: `clean_patterns()`).
+        older_than (Optional[float]): Keep artifacts with anything modified
+            more recently than this many seconds ago.
+        dry_run (bool): Only report what would be removed.
+        jobs (Optional[int]): Worker threads for walking, measuring and deleting.
+
+    Returns:
+        CleanReport: Removed (or removable) artifacts with their sizes.
+    """
+    matcher = compile_matcher(clean_patterns() if patterns is None else patterns)
+    found = find_artifacts(Path(root), matcher, jobs=jobs)
+    if found:
+        tracked = git_tracked(Path(root))
+        found = [a for a in found if os.path.normpath(a.path.resolve()) not in tracked]
+    if found:
+        workers = max(1, min(jobs or 4 * (os.cpu_count() or 2), len(found)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-clean") as pool:
+            found = list(pool.map(_measure, found))
+
+    report = CleanReport()
+    now = time.time()
+    for a in sorted(found, key=lambda a: str(a.path)):
+        if older_than is not None and now - a.newest <= older_than:
+            report.skipped_recent += 1
+        else:
+            report.artifacts.append(a)
+    if not dry_run and report.artifacts:
+        try:
+            remove_trees([a.path for a in report.artifacts], jobs=jobs)
+        except OSError as e:
+            report.errors[str(root)] = str(e)
+    return report
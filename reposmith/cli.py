@@ -5,9 +5,53 @@ from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
 
 from .logging_utils import setup_logging
+from .utils.units import parse_duration, parse_size
+from .matrix_utils import parse_pythons
 from .commands.init_cmd import run_init
-from .commands.doctor_cmd import run_doctor
+from .commands.doctor_cmd import run_doctor, run_fleet_doctor
 from .commands.brave_cmd import run_brave
+from .commands.serve_cmd import run_serve
+from .commands.wheelhouse_cmd import run_wheelhouse
+from .commands.index_cmd import run_index
+from .commands.installer_cmd import run_installer
+from .commands.cache_cmd import run_cache
+from .commands.venv_cmd import run_venv
+from .commands.env_cmd import run_env
+from .commands.deps_cmd import run_deps
+from .commands.clean_cmd import run_clean
+from .cache_utils import SHARED_CACHE_ENV, shared_cache_env
+from .core.runner import command_env
+from .installer import INSTALLER_NAMES
+from .bytecode_utils import INVALIDATION_MODES
+from .index_server import DEFAULT_PORT, DEFAULT_UPSTREAM
+from .service import DEFAULT_KEEP_FINISHED, DEFAULT_MAX_FINISHED
+
+def _step_budget(text: str) -> tuple[str, float]:
+    name, sep, value = text.partition("=")
+    if not sep or not name.strip():
+        raise argparse.ArgumentTypeError("expected STEP=DURATION, e.g. deps=90s")
+    try:
+        return name.strip(), parse_duration(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _duration(text: str) -> float:
+    try:
+        return parse_duration(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _size(text: str) -> int:
+    try:
+        return parse_size(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _python_list(text: str) -> tuple[str, ...]:
+    try:
+        return parse_pythons(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -21,6 +65,8 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--version", action="version", version=f"RepoSmith-tol {ver}")
     parser.add_argument("--log-level", default="INFO")
     parser.add_argument("--no-emoji", action="store_true")
+    parser.add_argument("--shared-cache", default=None, metavar="DIR",
+                        help=f"One uv/pip cache for every installer subprocess (default: ${SHARED_CACHE_ENV})")
 
     # لقبول هذه القيم حتى لو جاءت من المستوى الأعلى
     parser.add_argument("--entry", default=None, help=argparse.SUPPRESS)
@@ -34,35 +80,203 @@ def build_parser() -> argparse.ArgumentParser:
     sc.add_argument("--entry", type=str, default="run.py", help=argparse.SUPPRESS)
     sc.add_argument("--no-venv", action="store_true", help=argparse.SUPPRESS)
     sc.add_argument("--with-license", action="store_true")
+    sc.add_argument("--author", default=None, help="Copyright holder for LICENSE")
+    sc.add_argument("--ci-python", default=None, help="Python version for the CI workflow (default: 3.12)")
     sc.add_argument("--with-gitignore", action="store_true")
     sc.add_argument("--with-vscode", action="store_true")
     sc.add_argument("--use-uv", action="store_true")
+    sc.add_argument("--python", default=None, help="Interpreter for .venv, e.g. 3.13 or a path")
+    sc.add_argument("--venv-backend", choices=["auto", "uv", "virtualenv", "venv"], default="auto",
+                    help="How to create .venv (auto picks the fastest available)")
+    sc.add_argument("--pythons", type=_python_list, default=None, metavar="X.Y,X.Y",
+                    help="Also build .venv-X.Y for each version, concurrently (e.g. 3.12,3.13)")
+    sc.add_argument("--wheelhouse", type=Path, default=None,
+                    help="Install from this local wheel directory (see `reposmith wheelhouse build`)")
+    sc.add_argument("--offline", action="store_true",
+                    help="Never contact the package index; requires --wheelhouse")
+    sc.add_argument("--index-url", default=None,
+                    help="Package index for installs (default: a running `reposmith index serve`, else PyPI)")
+    sc.add_argument("--prefetch", action="store_true",
+                    help="Download requirements in the background while .venv is created; install locally")
+    sc.add_argument("--lock", action="store_true",
+                    help="Compile a hashed requirements.lock (reused until inputs change) and sync .venv to it exactly")
+    sc.add_argument("--compile-bytecode", action="store_true",
+                    help="Precompile site-packages and project sources on all cores after installing")
+    sc.add_argument("--invalidation-mode", choices=INVALIDATION_MODES, default="timestamp",
+                    help="Bytecode invalidation (unchecked-hash suits read-only deploy venvs)")
+    sc.add_argument("--pycache-prefix", default=None, metavar="DIR",
+                    help="Keep bytecode under DIR (PYTHONPYCACHEPREFIX, also set in VS Code configs)")
     sc.add_argument("--with-brave", action="store_true")
     sc.add_argument("--all", action="store_true")
+    sc.add_argument("--resume", action="store_true",
+                    help="Skip steps checkpointed in .reposmith/ and continue from the first failed or changed one")
+    sc.add_argument("--deadline", type=_duration, default=None,
+                    help="Overall time budget, e.g. 120s or 5m; child processes are killed when it runs out")
+    sc.add_argument("--step-budget", type=_step_budget, action="append", metavar="STEP=DURATION",
+                    help="Per-step budget, e.g. deps=90s (repeatable)")
 
     bp = sub.add_parser("brave-profile", help="Manage Brave dev profile scaffolding")
     bp.add_argument("--root", type=Path, default=Path.cwd())
     bp.add_argument("--init", action="store_true")
 
-    sub.add_parser("doctor", help="Check environment health")
-    return parser
+    dr = sub.add_parser("doctor", help="Check environment health")
+    dr.add_argument("--pythons", action="store_true", help="List every local Python interpreter (cached index)")
+    dr.add_argument("--startup", action="store_true",
+                    help="Time the venv interpreter's startup and attribute it to .pth files and site modules")
+    dr.add_argument("--startup-threshold", type=_duration, default=0.02,
+                    help="Flag .pth files and site modules slower than this (default: 20ms)")
+    dr.add_argument("--verify-venv", action="store_true",
+                    help="Check .venv files against the hashes and sizes in every dist-info RECORD")
+    dr.add_argument("--fast", action="store_true", help="With --verify-venv: compare sizes only, skip hashing")
+    dr.add_argument("--recursive", type=Path, default=None, metavar="DIR",
+                    help="Check every project (.venv, pyproject.toml or requirements.txt) below DIR")
+    dr.add_argument("--json", action="store_true", help="With --recursive: print findings and a summary as JSON")
+    dr.add_argument("--jobs", type=int, default=None, help="With --recursive: projects checked at once")
 
-def main() -> int | None:
-    parser = build_parser()
-    args = parser.parse_args()
-    logger = setup_logging(level=getattr(args, "log_level", "INFO"),
-                           no_emoji=getattr(args, "no_emoji", False))
+    wh = sub.add_parser("wheelhouse", help="Manage a local wheel directory for offline installs")
+    wh_sub = wh.add_subparsers(dest="wheelhouse_cmd", required=True)
+    whb = wh_sub.add_parser("build", help="Download and build wheels for a requirements set in parallel")
+    whb.add_argument("-r", "--requirements", default="requirements.txt")
+    whb.add_argument("--dest", default="wheelhouse")
+    whb.add_argument("--jobs", type=int, default=None, help="Parallel downloads/builds (default: CPU count)")
+    whb.add_argument("--python", default=None, help="Target interpreter, e.g. 3.13 or a path")
+    whb.add_argument("--also", action="append", metavar="REQ", help="Extra requirement to include (repeatable)")
+
+    ix = sub.add_parser("index", help="Shared local package index with a caching proxy")
+    ix_sub = ix.add_subparsers(dest="index_cmd", required=True)
+    ixs = ix_sub.add_parser("serve", help="Serve a PEP 503/691 simple index over a shared wheel store")
+    ixs.add_argument("--host", default="127.0.0.1", help="Use 0.0.0.0 to share the index on your LAN")
+    ixs.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ixs.add_argument("--store", default=None, help="Wheel store directory (default: <cache>/index)")
+    ixs.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="Upstream simple index, or 'none'")
+    ixs.add_argument("--max-size", type=_size, default=None, help="LRU size cap for the store, e.g. 20G")
 
+    inst = sub.add_parser("installer", help="Inspect and benchmark installer backends (uv, uv-module, pip)")
+    inst_sub = inst.add_subparsers(dest="installer_cmd", required=True)
+    inst_sub.add_parser("list", help="Show detected backends, fastest first")
+    ib = inst_sub.add_parser("bench", help="Time each backend on a fixture set from a local wheel directory")
+    ib.add_argument("--rounds", type=int, default=3)
+    ib.add_argument("--packages", type=int, default=12, help="Fixture packages per install")
+    ib.add_argument("--backend", action="append", choices=INSTALLER_NAMES, help="Limit to these backends (repeatable)")
+
+    ca = sub.add_parser("cache", help="Measure and prune the uv, pip and reposmith caches")
+    ca_sub = ca.add_subparsers(dest="cache_cmd", required=True)
+    cas = ca_sub.add_parser("stats", help="Size per cache, per last-use age and per package")
+    cas.add_argument("--top", type=int, default=10, help="Packages to list")
+    cap = ca_sub.add_parser("prune", help="Evict least recently used entries, keeping pinned packages")
+    cap.add_argument("--budget", type=_size, default=None, help="Size cap for the selected caches, e.g. 20G")
+    cap.add_argument("--older-than", type=_duration, default=None, help="Remove entries unused for this long, e.g. 30d")
+    cap.add_argument("--dry-run", action="store_true")
+    cap.add_argument("--root", type=Path, default=Path.cwd(), help="Project whose lock is kept (default: cwd)")
+    for p in (cas, cap):
+        p.add_argument("--location", action="append", metavar="NAME",
+                       help="Limit to uv, pip, shared or reposmith (or a full name such as reposmith:prefetch)")
+    cpn = ca_sub.add_parser("pin", help="Keep the packages of a project's lock during pruning")
+    cpn.add_argument("--root", type=Path, default=Path.cwd())
+    cpn.add_argument("--remove", action="store_true", help="Forget the pins of --root")
+    cpn.add_argument("--list", action="store_true", help="Show pinned projects")
+
+    ve = sub.add_parser("venv", help="Maintain the virtual environments of many projects")
+    ve_sub = ve.add_subparsers(dest="venv_cmd", required=True)
+    vd = ve_sub.add_parser("dedupe", help="Hardlink identical venv files across projects into a shared store")
+    vd.add_argument("root", type=Path, help="Directory containing the projects")
+    vd.add_argument("--store", type=Path, default=None,
+                    help="Content-addressed store on the same filesystem (default: <root>/.reposmith-store)")
+    vd.add_argument("--min-size", type=_size, default=1024, help="Skip files smaller than this (default: 1K)")
+    vd.add_argument("--jobs", type=int, default=None, help="Worker threads (default: 2 x CPU count)")
+    vd.add_argument("--dry-run", action="store_true", help="Report the savings without linking")
+    vd.add_argument("--undo", action="store_true", help="Give every linked file its own copy again")
+    vg = ve_sub.add_parser("gc", help="Remove least recently used reposmith venvs under a workspace")
+    vg.add_argument("--root", type=Path, default=Path.cwd(), help="Workspace to search (default: cwd)")
+    vg.add_argument("--older-than", type=_duration, default=None, help="Remove venvs unused for this long, e.g. 30d")
+    vg.add_argument("--budget", type=_size, default=None, help="Keep the remaining venvs under this size, e.g. 50G")
+    vg.add_argument("--dry-run", action="store_true")
+    vg.add_argument("--jobs", type=int, default=None, help="Worker threads")
+
+    en = sub.add_parser("env", help="Snapshot virtual environments and compare them")
+    en_sub = en.add_subparsers(dest="env_cmd", required=True)
+    ens = en_sub.add_parser("snapshot", help="Write interpreter and package versions as JSON")
+    ens.add_argument("--venv", type=Path, default=Path(".venv"))
+    ens.add_argument("-o", "--output", type=Path, default=None,
+                     help="Snapshot file (default: env-snapshot.json next to the venv)")
+    end = en_sub.add_parser("diff", help="Compare two snapshots, venvs or projects")
+    end.add_argument("a", type=Path, help="Snapshot file, venv or project directory")
+    end.add_argument("b", type=Path, help="Snapshot file, venv or project directory")
+    end.add_argument("--json", action="store_true", help="Print the differences as JSON")
+
+    de = sub.add_parser("deps", help="Inspect the dependencies a project actually uses")
+    de_sub = de.add_subparsers(dest="deps_cmd", required=True)
+    dea = de_sub.add_parser("analyze", help="Report unused requirements and undeclared imports")
+    dea.add_argument("--root", type=Path, default=Path.cwd())
+    dea.add_argument("--venv", type=Path, default=None, help="Venv mapping imports to distributions (default: <root>/.venv)")
+    dea.add_argument("--prune", action="store_true", help="Remove unused requirements from requirements.txt")
+    dea.add_argument("--json", action="store_true", help="Print the report as JSON")
+    dea.add_argument("--jobs", type=int, default=None, help="Parser processes (default: CPU count)")
+
+    cl = sub.add_parser("clean", help="Delete caches and build artifacts (__pycache__, build/, dist/, ...)")
+    cl.add_argument("--root", type=Path, default=Path.cwd())
+    cl.add_argument("--dry-run", action="store_true", help="List what would be removed and the bytes reclaimed")
+    cl.add_argument("--older-than", type=_duration, default=None,
+                    help="Only remove artifacts untouched for this long, e.g. 7d")
+    cl.add_argument("--jobs", type=int, default=None, help="Worker threads")
+
+    sv = sub.add_parser("serve", help="Run a warm worker service for init/doctor/env-info jobs")
+    sv.add_argument("--host", default="127.0.0.1")
+    sv.add_argument("--port", type=int, default=8765)
+    sv.add_argument("--socket", default=None, help="Listen on a Unix socket instead of HTTP")
+    sv.add_argument("--workers", type=int, default=4)
+    sv.add_argument("--state-dir", default=None, help="Where queued jobs are persisted")
+    sv.add_argument("--keep-finished", type=_duration, default=DEFAULT_KEEP_FINISHED, metavar="AGE",
+                    help="How long finished jobs stay queryable, e.g. 2d (default: 7d)")
+    sv.add_argument("--max-finished", type=int, default=DEFAULT_MAX_FINISHED,
+                    help="Finished jobs kept at most (default: %(default)s)")
+    return parser
+
+def _dispatch(parser: argparse.ArgumentParser, args, logger) -> int | None:
     if args.cmd == "init":
         return run_init(args, logger)
     if args.cmd == "brave-profile" and args.init:
         return run_brave(args, logger)
     if args.cmd == "doctor":
-        return run_doctor(logger)
+        if args.recursive is not None:
+            return run_fleet_doctor(logger, args.recursive, as_json=args.json, jobs=args.jobs)
+        return run_doctor(
+            logger, pythons=args.pythons, startup=args.startup, startup_threshold=args.startup_threshold,
+            verify_venv=args.verify_venv, fast=args.fast,
+        )
+    if args.cmd == "serve":
+        return run_serve(args, logger)
+    if args.cmd == "wheelhouse":
+        return run_wheelhouse(args, logger)
+    if args.cmd == "index":
+        return run_index(args, logger)
+    if args.cmd == "installer":
+        return run_installer(args, logger)
+    if args.cmd == "cache":
+        return run_cache(args, logger)
+    if args.cmd == "venv":
+        return run_venv(args, logger)
+    if args.cmd == "env":
+        return run_env(args, logger)
+    if args.cmd == "deps":
+        return run_deps(args, logger)
+    if args.cmd == "clean":
+        return run_clean(args, logger)
 
     parser.print_help()
     return 0
 
+def main() -> int | None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.cmd == "init" and args.offline and not args.wheelhouse:
+        parser.error("--offline requires --wheelhouse DIR")
+    logger = setup_logging(level=getattr(args, "log_level", "INFO"),
+                           no_emoji=getattr(args, "no_emoji", False))
+
+    with command_env(shared_cache_env(getattr(args, "shared_cache", None))):
+        return _dispatch(parser, args, logger)
+
 if __name__ == "__main__":
     from .cli import main as cli_main  # للاتساق مع نقاط الدخول الأخرى
     raise SystemExit(cli_main() or 0)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 from pathlib import Path
-import subprocess
 import sys
 
+from ..core.runner import run_command
+
 def _ensure_brave_py(root: Path) -> Path:
     brave_py = root / "tools" / "brave.py"
     if not brave_py.exists():
@@ -22,7 +23,7 @@ def run_brave(args, logger) -> int:
 
     cmd = [sys.executable, str(brave_py), "--root", str(root), "init"]
     logger.info("Running: %s", " ".join(cmd))
-    subprocess.check_call(cmd)
+    run_command(cmd)
 
     logger.info("🦁 Brave Project Browser initialized (Python-only).")
     return 0
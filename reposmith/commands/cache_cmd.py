@@ -0,0 +1,76 @@
+from __future__ import annotations
+from pathlib import Path
+
+from ..cache_utils import (
+    cache_locations,
+    load_pins,
+    pin_project,
+    prune_caches,
+    scan_caches,
+    shared_cache_env,
+)
+from ..utils.units import format_size
+
+def _locations(args):
+    locs = cache_locations(args.shared_cache)
+    wanted = getattr(args, "location", None)
+    if wanted:
+        locs = [loc for loc in locs if any(loc.name == w or loc.name.startswith(w + ":") for w in wanted)]
+    return locs
+
+def run_cache(args, logger) -> int:
+    """
+    `reposmith cache stats|prune|pin`: measure and bound the uv, pip and
+    reposmith caches.
+    """
+    if args.cache_cmd == "pin":
+        root = Path(args.root)
+        if args.list:
+            for project, pkgs in sorted(load_pins().items()):
+                logger.info("📌 %s (%d package(s))", project, len(pkgs))
+            return 0
+        pkgs = pin_project(root, remove=args.remove)
+        if args.remove:
+            logger.info("Unpinned %s", root.resolve())
+        elif not pkgs:
+            logger.warning("No requirements.lock or requirements.txt in %s — nothing to pin.", root.resolve())
+            return 1
+        else:
+            logger.info("📌 Pinned %d package(s) from %s", len(pkgs), root.resolve())
+        return 0
+
+    locs = _locations(args)
+    stats = scan_caches(locs)
+    if args.cache_cmd == "stats":
+        sizes = stats.by_location()
+        env = shared_cache_env(args.shared_cache)
+        if env:
+            logger.info("Shared cache: UV_CACHE_DIR=%s", env["UV_CACHE_DIR"])
+        logger.info("🗄 Caches (%s total, %d entries):", format_size(stats.total_bytes), len(stats.entries))
+        for loc in locs:
+            logger.info("  %-22s %10s  %s", loc.name, format_size(sizes.get(loc.name, 0)), loc.path)
+        logger.info("By last use:")
+        for label, size in stats.by_age().items():
+            logger.info("  %-22s %10s", label, format_size(size))
+        logger.info("Largest packages:")
+        for name, size in list(stats.by_package().items())[: args.top]:
+            logger.info("  %-22s %10s", name, format_size(size))
+        return 0
+
+    if args.budget is None and args.older_than is None:
+        logger.error("Nothing to do: pass --budget SIZE and/or --older-than AGE.")
+        return 2
+    report = prune_caches(
+        stats, budget=args.budget, older_than=args.older_than, project=Path(args.root), dry_run=args.dry_run
+    )
+    verb = "Would remove" if args.dry_run else "Removed"
+    for entry in report.removed:
+        logger.debug("  - %s (%s)", entry.path, format_size(entry.size))
+    for path, err in report.errors.items():
+        logger.error("✗ %s: %s", path, err)
+    logger.info("🧹 %s %d entr%s, %s; %d pinned kept; %s remain.",
+                verb, len(report.removed), "y" if len(report.removed) == 1 else "ies",
+                format_size(report.freed_bytes), report.pinned, format_size(report.remaining_bytes))
+    if args.budget is not None and report.remaining_bytes > args.budget:
+        logger.warning("Still over budget: pinned entries alone need %s.", format_size(report.remaining_bytes))
+    return 1 if report.errors else 0
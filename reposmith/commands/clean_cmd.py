@@ -0,0 +1,25 @@
+from __future__ import annotations
+from pathlib import Path
+
+from ..clean_utils import clean_project
+from ..utils.units import format_size
+
+def run_clean(args, logger) -> int:
+    """
+    `reposmith clean`: delete caches and build artifacts matched by the
+    Python .gitignore preset, in parallel.
+    """
+    root = Path(args.root)
+    if not root.is_dir():
+        logger.error("Not a directory: %s", root)
+        return 1
+    report = clean_project(root, older_than=args.older_than, dry_run=args.dry_run, jobs=args.jobs)
+    for a in report.artifacts:
+        logger.info("  %s %s (%s)", "would remove" if args.dry_run else "removed",
+                    a.path.relative_to(root) if a.path.is_relative_to(root) else a.path, format_size(a.size))
+    for path, err in report.errors.items():
+        logger.error("✗ %s: %s", path, err)
+    verb = "Would reclaim" if args.dry_run else "Reclaimed"
+    logger.info("🧹 %s %s from %d artifact(s)%s.", verb, format_size(report.reclaimed_bytes), len(report.artifacts),
+                f"; {report.skipped_recent} recent one(s) kept" if report.skipped_recent else "")
+    return 1 if report.errors else 0
@@ -0,0 +1,37 @@
+from __future__ import annotations
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+from ..usage_utils import analyze_usage, prune_requirements
+
+def _run_analyze(args, logger) -> int:
+    root = Path(args.root)
+    report = analyze_usage(root, args.venv, jobs=args.jobs)
+    if args.json:
+        print(json.dumps(asdict(report), indent=2))
+    else:
+        logger.info("🔎 %d file(s): %d parsed, %d from cache; %d third-party import(s).",
+                    report.files, report.parsed, report.cached, len(report.imports))
+        for dist in report.unused:
+            logger.warning("unused      %s", dist)
+        for dist in report.tools:
+            logger.info("tool        %s (entry points or type stubs, kept)", dist)
+        for module, dist in report.undeclared.items():
+            where = report.imports[module][0]
+            logger.warning("undeclared  %s%s (imported in %s)", module,
+                           f" -> {dist}" if dist else " (not installed)", where)
+        for dist in report.not_installed:
+            logger.info("not in venv %s (cannot tell whether it is used)", dist)
+        for path, err in report.errors.items():
+            logger.error("✗ %s: %s", path, err)
+    if args.prune:
+        removed = prune_requirements(root, report.unused)
+        if removed:
+            logger.info("✂️  Removed %d line(s) from requirements.txt (backup: requirements.txt.bak).", len(removed))
+        elif report.unused:
+            logger.warning("Nothing pruned: only requirements.txt is edited.")
+    return 0
+
+def run_deps(args, logger) -> int:
+    return _run_analyze(args, logger)
@@ -1,34 +1,81 @@
 from __future__ import annotations
-import os, sys, subprocess
+import json, os, sys
 from pathlib import Path
 
-def _run_out(cmd: list[str]) -> tuple[int, str]:
+from .. import verify_utils
+from ..fleet_utils import doctor_fleet, read_pyproject_version, run_out as _run_out
+from ..interpreter_utils import discover_interpreters
+from ..startup_utils import DEFAULT_THRESHOLD, describe, measure_startup
+
+def _report_pythons(logger, refresh: bool = False) -> None:
+    found = discover_interpreters(refresh=refresh)
+    logger.info("• Pythons  : %d interpreter(s) discovered", len(found))
+    for interp in found:
+        logger.info("  - %-8s %-6s %-7s %s", interp.version, interp.abi, interp.source, interp.path)
+
+def _report_startup(logger, interp: Path, threshold: float) -> list[str]:
     try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        return 0, out.decode("utf-8", errors="ignore").strip()
-    except subprocess.CalledProcessError as e:
-        return e.returncode, e.output.decode("utf-8", errors="ignore").strip()
-    except FileNotFoundError:
-        return 127, ""
-
-def _read_pyproject_version(root: Path) -> str | None:
-    py = root / "pyproject.toml"
-    if not py.exists():
-        return None
-    text = py.read_text(encoding="utf-8", errors="ignore")
-    for line in text.splitlines():
-        line = line.strip()
-        if line.startswith("version") and "=" in line:
-            try:
-                val = line.split("=", 1)[1].strip().strip('"').strip("'")
-                if val:
-                    return val
-            except Exception:
-                pass
-    return None
-
-def run_doctor(logger) -> int:
-    root = Path(".").resolve()
+        report = measure_startup(str(interp))
+    except Exception as e:
+        logger.warning("• Startup  : could not be measured (%s)", e)
+        return [f"startup audit failed: {e}"]
+    lines = describe(report)
+    logger.info("• Startup  : %s", lines[0])
+    for line in lines[1:]:
+        logger.info("  - %s", line)
+    findings = report.findings(threshold)
+    for f in findings:
+        logger.warning("  ! %s", f)
+    return [f"slow startup: {f}" for f in findings]
+
+def _report_verify(logger, venv_dir: Path, fast: bool, shown: int = 5) -> list[str]:
+    report = verify_utils.verify_venv(venv_dir, fast=fast)
+    mode = "sizes" if fast else f"hashes, {report.bytes_hashed / 1e6:.1f} MB read"
+    logger.info("• Verify   : %d distribution(s), %d file(s) checked (%s)", len(report.dists), report.files_checked, mode)
+    problems: list[str] = []
+    for d in report.problems:
+        label = f"{d.name} {d.version}".strip()
+        for kind, paths in (("missing", d.missing), ("modified", d.modified), ("unowned", d.unowned)):
+            if not paths:
+                continue
+            logger.warning("  ! %s: %d %s file(s)", label, len(paths), kind)
+            for path in paths[:shown]:
+                logger.warning("      %s", path)
+            if len(paths) > shown:
+                logger.warning("      ... and %d more", len(paths) - shown)
+            problems.append(f"{label}: {len(paths)} {kind} file(s)")
+    return problems
+
+def run_fleet_doctor(logger, root: Path | str, *, as_json: bool = False, jobs: int | None = None) -> int:
+    findings, summary = doctor_fleet(Path(root), jobs=jobs)
+    if as_json:
+        print(json.dumps({"summary": summary, "projects": findings}, indent=2))
+    else:
+        logger.info("🩺 RepoSmith Doctor — %d project(s) under %s\n", summary["projects"], summary["root"])
+        for f in findings:
+            if f["ok"]:
+                logger.info("✅ %s%s", f["path"], f" (Python {f['python']})" if f["python"] else "")
+            else:
+                logger.warning("⚠️  %s: %s", f["path"], "; ".join(f["problems"]))
+        for name, version in summary["tools"].items():
+            if version is None:
+                logger.warning("• %-8s : not found on PATH", name)
+        logger.info("\n%d ok, %d with problems, %d without .venv (%.2fs)",
+                    summary["ok"], summary["with_problems"], summary["without_venv"], summary["seconds"])
+    missing_tools = any(v is None for v in summary["tools"].values())
+    return 2 if summary["with_problems"] or missing_tools else 0
+
+def run_doctor(
+    logger,
+    root: Path | str = ".",
+    *,
+    pythons: bool = False,
+    startup: bool = False,
+    startup_threshold: float = DEFAULT_THRESHOLD,
+    verify_venv: bool = False,
+    fast: bool = False,
+) -> int:
+    root = Path(root).resolve()
     problems: list[str] = []
 
     logger.info("🩺 RepoSmith Doctor — Checking environment health...\n")
@@ -60,13 +107,21 @@ def run_doctor(logger) -> int:
         if interp.exists():
             rc, v_out = _run_out([str(interp), "--version"])
             logger.info("• .venv    : found%s", f" ({v_out})" if v_out else "")
+            if startup:
+                problems += _report_startup(logger, interp, startup_threshold)
         else:
             logger.warning("• .venv    : directory exists but interpreter not found")
             problems.append(".venv exists but python interpreter missing")
     else:
         logger.warning("• .venv    : not found (you can create it via 'reposmith init')")
 
-    py_ver = _read_pyproject_version(root)
+    if verify_venv and venv_dir.is_dir():
+        problems += _report_verify(logger, venv_dir, fast)
+
+    if pythons:
+        _report_pythons(logger)
+
+    py_ver = read_pyproject_version(root)
     if (root / "pyproject.toml").exists():
         logger.info("• pyproject.toml : %s", f"found (version={py_ver})" if py_ver else "found")
     else:
@@ -0,0 +1,55 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+
+from ..core.runner import CommandError
+from ..snapshot_utils import diff_snapshots, load_snapshot, write_snapshot
+
+def _run_snapshot(args, logger) -> int:
+    venv = Path(args.venv)
+    if not (venv / "pyvenv.cfg").is_file():
+        logger.error("Not a virtual environment: %s", venv)
+        return 1
+    try:
+        path = write_snapshot(venv, args.output)
+    except (CommandError, ValueError) as e:
+        logger.error("Could not query the interpreter of %s: %s", venv, e)
+        return 1
+    logger.info("📸 Snapshot of %s written to %s", venv, path)
+    return 0
+
+def _run_diff(args, logger) -> int:
+    try:
+        a, b = load_snapshot(args.a), load_snapshot(args.b)
+    except CommandError as e:
+        logger.error("Could not query a venv interpreter (broken venv?): %s", e)
+        return 1
+    except (OSError, ValueError) as e:
+        logger.error("%s", e)
+        return 1
+    diff = diff_snapshots(a, b)
+    if args.json:
+        print(json.dumps(diff.to_dict(), indent=2))
+        return 0
+    if diff.identical:
+        logger.info("✅ Environments are identical (%d package(s)).", len(a["packages"]))
+        return 0
+    for key, (va, vb) in diff.python.items():
+        logger.info("python %s: %s -> %s", key, va, vb)
+    for name, version in diff.added.items():
+        logger.info("+ %s %s", name, version)
+    for name, version in diff.removed.items():
+        logger.info("- %s %s", name, version)
+    for name, (va, vb) in diff.changed.items():
+        logger.info("~ %s %s -> %s", name, va, vb)
+    for name in diff.rebuilt:
+        logger.info("* %s %s (same version, different build)", name, b["packages"][name]["version"])
+    logger.info("%d added, %d removed, %d changed, %d rebuilt.",
+                len(diff.added), len(diff.removed), len(diff.changed), len(diff.rebuilt))
+    return 0
+
+def run_env(args, logger) -> int:
+    """`reposmith env snapshot|diff`: record or compare installed environments."""
+    if args.env_cmd == "snapshot":
+        return _run_snapshot(args, logger)
+    return _run_diff(args, logger)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+from pathlib import Path
+
+from ..index_server import (
+    IndexProxy,
+    WheelStore,
+    make_index_server,
+    remove_server_info,
+    write_server_info,
+)
+from ..utils.paths import cache_dir
+from ..utils.units import format_size
+
+def run_index(args, logger) -> int:
+    """
+    `reposmith index serve`: run the caching simple index until interrupted.
+    """
+    store_dir = Path(args.store) if args.store else cache_dir() / "index"
+    store = WheelStore(store_dir, max_bytes=args.max_size)
+    upstream = None if args.upstream in ("", "none") else args.upstream
+    server = make_index_server(IndexProxy(store, upstream), args.host, args.port)
+    host, port = server.server_address[:2]
+    advertised = "127.0.0.1" if host in ("0.0.0.0", "") else host
+    url = f"http://{advertised}:{port}"
+    write_server_info(url)
+    logger.info("📦 reposmith index serving %s/simple/ (store: %s, %s used, upstream: %s)",
+                url, store_dir, format_size(store.total_bytes), upstream or "none")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+    finally:
+        server.server_close()
+        remove_server_info()
+    return 0
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from ..installer import available_installers, benchmark_installers, get_installer
+
+def run_installer(args, logger) -> int:
+    """
+    `reposmith installer list|bench`: show detected backends or compare them
+    on a local fixture requirements set.
+    """
+    if args.installer_cmd == "list":
+        for i, name in enumerate(available_installers()):
+            inst = get_installer(name)
+            launcher = " ".join(inst.launcher) if inst.launcher else "python -m pip (per environment)"
+            logger.info("%s %-10s %s", "→" if i == 0 else " ", name, launcher)
+        return 0
+
+    logger.info("⏱ Benchmarking installers on %d fixture packages, %d round(s) each...", args.packages, args.rounds)
+    results = benchmark_installers(args.backend or None, rounds=args.rounds, count=args.packages)
+    failed = False
+    for res in sorted(results, key=lambda r: (r.median is None, r.median or 0)):
+        if res.error:
+            failed = True
+            logger.error("  %-10s failed: %s", res.name, res.error)
+        else:
+            runs = ", ".join(f"{t:.2f}" for t in res.timings)
+            logger.info("  %-10s median %.2fs  (%s)", res.name, res.median, runs)
+    return 1 if failed else 0
@@ -0,0 +1,41 @@
+from __future__ import annotations
+from pathlib import Path
+
+from ..service import JobService, make_http_server, make_unix_server
+from ..utils.paths import cache_dir
+
+def run_serve(args, logger) -> int:
+    """
+    Run the warm worker service until interrupted (Ctrl+C).
+
+    Listens on a Unix socket when --socket is given, otherwise on localhost HTTP.
+    """
+    state_dir = Path(args.state_dir) if args.state_dir else cache_dir() / "jobs"
+    service = JobService(state_dir, workers=args.workers,
+                         keep_finished=args.keep_finished, max_finished=args.max_finished)
+
+    resumed = service.resume()
+    if resumed:
+        logger.info("↻ Resumed %d unfinished job(s) from %s", len(resumed), state_dir)
+
+    if args.socket:
+        try:
+            server = make_unix_server(service, Path(args.socket))
+        except OSError as e:
+            logger.error("%s", e)
+            service.shutdown(wait=False)
+            return 1
+        logger.info("🛰  reposmith serve listening on unix:%s (%d workers)", args.socket, args.workers)
+    else:
+        server = make_http_server(service, args.host, args.port)
+        host, port = server.server_address[:2]
+        logger.info("🛰  reposmith serve listening on http://%s:%s (%d workers)", host, port, args.workers)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+    finally:
+        server.server_close()
+        service.shutdown(wait=False)
+    return 0
@@ -0,0 +1,60 @@
+from __future__ import annotations
+from pathlib import Path
+
+from ..dedupe_utils import dedupe_venvs, undo_dedupe
+from ..gc_utils import collect_venvs
+from ..utils.units import format_size
+
+def _run_dedupe(args, logger) -> int:
+    root = Path(args.root)
+    if not root.is_dir():
+        logger.error("Not a directory: %s", root)
+        return 1
+    try:
+        if args.undo:
+            report = undo_dedupe(root, store=args.store, jobs=args.jobs)
+            logger.info("↩ Restored %d file(s) to private copies.", report.linked)
+        else:
+            report = dedupe_venvs(root, store=args.store, min_size=args.min_size, jobs=args.jobs, dry_run=args.dry_run)
+            verb = "Would link" if args.dry_run else "Linked"
+            logger.info("🔗 %d venv(s), %d file(s) scanned, %d hashed.", len(report.venvs), report.scanned, report.hashed)
+            logger.info("%s %d file(s) into %s, saving %s (%d already linked).",
+                        verb, report.linked, report.store, format_size(report.bytes_saved), report.already_linked)
+            if report.skipped_changed:
+                logger.warning("%d file(s) changed during the run and were left alone.", report.skipped_changed)
+            if report.skipped_device:
+                logger.warning("%d file(s) are on another filesystem than the store (use --store there).",
+                               report.skipped_device)
+    except RuntimeError as e:
+        logger.error("%s", e)
+        return 1
+    for path, err in list(report.errors.items())[:20]:
+        logger.error("✗ %s: %s", path, err)
+    return 1 if report.errors else 0
+
+def _run_gc(args, logger) -> int:
+    if args.older_than is None and args.budget is None:
+        logger.error("Nothing to do: pass --older-than AGE and/or --budget SIZE.")
+        return 2
+    report = collect_venvs(Path(args.root), older_than=args.older_than, budget=args.budget,
+                           dry_run=args.dry_run, jobs=args.jobs)
+    verb = "Would remove" if args.dry_run else "Removed"
+    for v in report.removed:
+        logger.info("  🗑 %s (%s)", v.path, format_size(v.size))
+    for path, err in report.errors.items():
+        logger.error("✗ %s: %s", path, err)
+    logger.info("%s %d of %d reposmith venv(s), freeing %s; %s remain.", verb, len(report.removed),
+                len(report.venvs), format_size(report.freed_bytes), format_size(report.remaining_bytes))
+    if report.removed and not args.dry_run:
+        logger.info("`reposmith init` in those projects rebuilds them with the same packages.")
+    return 1 if report.errors else 0
+
+def run_venv(args, logger) -> int:
+    """
+    `reposmith venv ...`: maintenance across many projects' virtual environments.
+    """
+    if args.venv_cmd == "dedupe":
+        return _run_dedupe(args, logger)
+    if args.venv_cmd == "gc":
+        return _run_gc(args, logger)
+    return 2
@@ -0,0 +1,29 @@
+from __future__ import annotations
+from pathlib import Path
+
+from ..venv_utils import resolve_interpreter
+from ..wheelhouse_utils import build_wheelhouse
+
+def run_wheelhouse(args, logger) -> int:
+    """
+    `reposmith wheelhouse build`: resolve a requirements set once and fill a
+    local wheel directory for later `init --wheelhouse DIR --offline` runs.
+    """
+    req = Path(args.requirements)
+    if not req.is_file():
+        logger.error("Requirements file not found: %s", req)
+        return 1
+    python = resolve_interpreter(args.python)
+    if python is None:
+        logger.error("No Python %s interpreter found.", args.python)
+        return 1
+
+    report = build_wheelhouse(
+        Path(args.dest), req, extra=["pip", *(args.also or [])], python=python, jobs=args.jobs
+    )
+    for name, err in report.failed.items():
+        logger.error("✗ %s: %s", name, err.splitlines()[0] if err else "failed")
+    if not report.ok:
+        return 1
+    logger.info("📦 Wheelhouse ready: %d wheel(s) in %s", len(report.wheels), report.dest)
+    return 0
@@ -0,0 +1,138 @@
+# reposmith/core/checkpoints.py
+"""
+Step checkpoints for resumable `reposmith init`.
+
+Each finished step is recorded in `.reposmith/init-state.json` together with
+a hash of its outputs. On `--resume`, a step is skipped only while it and all
+earlier steps are still recorded as successful and their outputs are unchanged.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from .fs import atomic_write
+
+STATE_DIRNAME = ".reposmith"
+STATE_FILENAME = "init-state.json"
+STATE_VERSION = 1
+
+
+def _hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def hash_path(path: Path) -> Optional[str]:
+    """
+    Cheap content fingerprint of a step output.
+
+    Files are hashed in full. A virtual environment is identified by its
+    `pyvenv.cfg` and interpreter; any other directory by its sorted listing.
+
+    Returns:
+        Optional[str]: Hex digest, or None if the path does not exist.
+    """
+    path = Path(path)
+    if path.is_file():
+        return _hash_file(path)
+    if not path.is_dir():
+        return None
+    h = hashlib.sha256()
+    cfg = path / "pyvenv.cfg"
+    if cfg.is_file():
+        h.update(_hash_file(cfg).encode())
+        interp = path / ("Scripts/python.exe" if os.name == "nt" else "bin/python")
+        h.update(b"interp" if interp.exists() else b"no-interp")
+    else:
+        for name in sorted(os.listdir(path)):
+            h.update(name.encode("utf-8", "surrogateescape") + b"\0")
+    return h.hexdigest()
+
+
+class CheckpointStore:
+    """
+    Read/write access to a project's init checkpoints.
+
+    Args:
+        root (Path): Project root; state lives under `<root>/.reposmith/`.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.path = self.root / STATE_DIRNAME / STATE_FILENAME
+        self.data: dict[str, Any] = {"version": STATE_VERSION, "spec": None, "steps": {}}
+        if self.path.exists():
+            try:
+                loaded = json.loads(self.path.read_text(encoding="utf-8"))
+                if loaded.get("version") == STATE_VERSION:
+                    self.data = loaded
+            except (OSError, ValueError):
+                pass
+
+    def _rel(self, p: Path) -> str:
+        try:
+            return Path(p).resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(p)
+
+    def reset(self, spec_fingerprint: str) -> None:
+        """Forget all steps and bind the store to a new spec fingerprint."""
+        self.data = {"version": STATE_VERSION, "spec": spec_fingerprint, "steps": {}}
+
+    @property
+    def spec_fingerprint(self) -> Optional[str]:
+        return self.data.get("spec")
+
+    def is_valid(self, name: str) -> bool:
+        """
+        Return True if `name` completed successfully and its outputs are unchanged.
+        """
+        rec = self.data["steps"].get(name)
+        if not rec or rec.get("status") in ("failed", "timeout", "cancelled"):
+            return False
+        for rel, digest in (rec.get("outputs") or {}).items():
+            if hash_path(self.root / rel) != digest:
+                return False
+        return True
+
+    def recorded(self, name: str) -> Optional[dict[str, Any]]:
+        return self.data["steps"].get(name)
+
+    def record(
+        self,
+        name: str,
+        status: str,
+        paths: Iterable[Path],
+        extra: Iterable[Path] = (),
+        error: Optional[str] = None,
+    ) -> None:
+        """
+        Record a finished step and persist the manifest atomically.
+
+        Args:
+            name (str): Step name.
+            status (str): Final step status.
+            paths (Iterable[Path]): Paths the step produced (hashed and reported).
+            extra (Iterable[Path]): Additional inputs whose change invalidates the step.
+            error (Optional[str]): Error message for failed steps.
+        """
+        paths = list(paths)
+        self.data["steps"][name] = {
+            "status": status,
+            "paths": [self._rel(p) for p in paths],
+            "outputs": {self._rel(p): hash_path(p) for p in [*paths, *extra]},
+            "finished": time.time(),
+            "error": error,
+        }
+        self.save()
+
+    def save(self) -> None:
+        atomic_write(self.path, json.dumps(self.data, indent=2))
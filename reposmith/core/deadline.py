@@ -0,0 +1,111 @@
+# reposmith/core/deadline.py
+"""
+Deadline budgets shared across a pipeline.
+
+A `Deadline` is installed for the current context with `deadline_scope`;
+the command runner reads it to cap per-command timeouts, so helpers deep in
+the call stack honour the budget without extra parameters.
+"""
+from __future__ import annotations
+
+import contextvars
+import math
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """The budget ran out before the work could start or finish."""
+
+
+class Deadline:
+    """
+    A point in (monotonic) time after which work must stop.
+
+    Args:
+        seconds (Optional[float]): Budget from now; None means unlimited.
+    """
+
+    def __init__(self, seconds: Optional[float] = None) -> None:
+        self.seconds = seconds
+        self.expires: Optional[float] = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None when unlimited."""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        rem = self.remaining()
+        return rem is not None and rem <= 0
+
+    def child(self, seconds: Optional[float]) -> "Deadline":
+        """Return a deadline that ends at `seconds` from now or at this one, whichever is first."""
+        d = Deadline(seconds)
+        if self.expires is not None and (d.expires is None or self.expires < d.expires):
+            d.expires, d.seconds = self.expires, self.remaining()
+        return d
+
+    def cancel(self) -> None:
+        """Expire now: commands started under this deadline afterwards fail at once."""
+        self.expires, self.seconds = time.monotonic(), 0.0
+
+    def cap(self, timeout: Optional[float]) -> Optional[float]:
+        """Combine an explicit timeout with the time remaining."""
+        rem = self.remaining()
+        if rem is None:
+            return timeout
+        return rem if timeout is None else min(timeout, rem)
+
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("reposmith_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Return the deadline installed for the current context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Install `deadline` for the duration of the `with` block."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def wait_for_path(
+    path: Path,
+    timeout: float,
+    *,
+    initial: float = 0.01,
+    factor: float = 2.0,
+    max_interval: float = 0.25,
+) -> bool:
+    """
+    Poll until `path` exists, backing off exponentially.
+
+    Returns as soon as the path appears instead of sleeping a fixed delay.
+    The wait is also capped by the current deadline.
+
+    Returns:
+        bool: True if the path exists before the timeout.
+    """
+    dl = current_deadline()
+    timeout = dl.cap(timeout) if dl else timeout
+    end = time.monotonic() + (timeout if timeout is not None else math.inf)
+    interval = initial
+    while True:
+        if Path(path).exists():
+            return True
+        now = time.monotonic()
+        if now >= end:
+            return False
+        time.sleep(min(interval, end - now))
+        interval = min(interval * factor, max_interval)
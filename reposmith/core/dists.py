@@ -0,0 +1,32 @@
+# reposmith/core/dists.py
+"""
+Installed distributions and declared dependencies, read straight from disk.
+
+Shared by the modules that inspect a venv without running its interpreter
+(gc, snapshot, verify, usage) and by the lockfile code.
+"""
+from __future__ import annotations
+
+import os
+import re
+import tomllib
+from pathlib import Path
+
+# `<name>-<version>.dist-info`; the name keeps its on-disk spelling.
+DIST_INFO_RE = re.compile(r"^(.+?)-([^-]+)\.dist-info$")
+
+
+def venv_site_packages(venv: Path) -> list[Path]:
+    """site-packages directories of `venv` (none if it has not been created)."""
+    if os.name == "nt":
+        return [venv / "Lib" / "site-packages"]
+    return sorted((venv / "lib").glob("python*/site-packages"))
+
+
+def pyproject_dependencies(pyproject: Path) -> list[str]:
+    """`[project].dependencies` of a pyproject.toml; empty if unreadable or absent."""
+    try:
+        data = tomllib.loads(pyproject.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return list((data.get("project") or {}).get("dependencies") or [])
@@ -0,0 +1,295 @@
+# reposmith/core/runner.py
+"""
+Single asyncio-based command runner used for every external process.
+
+Features:
+  - concurrency limit so I/O-bound steps can overlap safely: per event loop
+    for coroutines, process-wide for `run_command` callers on any thread,
+  - per-command timeouts and cancellation that kill the child process,
+  - stdout/stderr streamed line by line to a logger,
+  - a bounded ring buffer of recent output attached to errors.
+
+Synchronous code calls `run_command`, which drives the same coroutine.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Mapping, Optional, Sequence
+
+from .deadline import DeadlineExceeded, current_deadline
+
+DEFAULT_TAIL_LINES = 200
+
+_scoped_env: contextvars.ContextVar[Mapping[str, str]] = contextvars.ContextVar(
+    "reposmith_command_env", default={}
+)
+
+
+@contextmanager
+def command_env(env: Mapping[str, str]) -> Iterator[None]:
+    """
+    Apply extra environment variables to every command started in this context.
+
+    Scopes nest; inner values win. Nothing is written to `os.environ`.
+    """
+    token = _scoped_env.set({**_scoped_env.get(), **env})
+    try:
+        yield
+    finally:
+        _scoped_env.reset(token)
+
+
+def current_command_env() -> dict[str, str]:
+    """Variables applied by the enclosing `command_env` scopes."""
+    return dict(_scoped_env.get())
+
+
+class CommandError(subprocess.CalledProcessError):
+    """A command exited non-zero. `tail` holds its last output lines."""
+
+    def __init__(self, returncode: int, cmd: Sequence[str], output: str = "", tail: Sequence[str] = ()) -> None:
+        super().__init__(returncode, list(cmd), output=output)
+        self.tail = list(tail)
+
+    def __str__(self) -> str:
+        base = super().__str__()
+        if not self.tail:
+            return base
+        return base + "\n--- last output ---\n" + "\n".join(self.tail[-20:])
+
+
+class CommandTimeout(CommandError):
+    """A command exceeded its timeout and was killed."""
+
+    def __init__(self, cmd: Sequence[str], timeout: float, tail: Sequence[str] = ()) -> None:
+        super().__init__(-9, cmd, tail=tail)
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        msg = f"Command '{' '.join(self.cmd)}' timed out after {self.timeout:g}s"
+        if self.tail:
+            msg += "\n--- last output ---\n" + "\n".join(self.tail[-20:])
+        return msg
+
+
+@dataclass
+class CommandResult:
+    """Outcome of a finished command."""
+
+    cmd: list[str]
+    returncode: int
+    output: str = ""
+    tail: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+
+class CommandRunner:
+    """
+    Run external commands with asyncio.
+
+    Args:
+        max_concurrency (int): Commands allowed to run at once on one event
+            loop, and across all threads using `run_command`.
+        logger (Optional[logging.Logger]): Receives streamed output lines.
+        tail_lines (int): Size of the output ring buffer kept per command.
+        base_env (Optional[Mapping[str, str]]): Variables applied to every child
+            on top of `os.environ`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        logger: Optional[logging.Logger] = None,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+        base_env: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.logger = logger or logging.getLogger("reposmith.run")
+        self.tail_lines = tail_lines
+        self.base_env: dict[str, str] = dict(base_env or {})
+        # run_command starts a fresh loop per call, so threads share this instead.
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._sems.get(loop)
+        if sem is None:
+            sem = self._sems[loop] = asyncio.Semaphore(self.max_concurrency)
+        return sem
+
+    def _env(self, env: Optional[Mapping[str, str]]) -> Optional[dict[str, str]]:
+        scoped = _scoped_env.get()
+        if not self.base_env and not scoped and not env:
+            return None
+        return {**os.environ, **self.base_env, **scoped, **(env or {})}
+
+    async def run(
+        self,
+        cmd: Sequence[str],
+        *,
+        cwd: Optional[os.PathLike | str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        check: bool = True,
+        capture: bool = False,
+        capture_stderr: bool = False,
+        stream: bool = True,
+    ) -> CommandResult:
+        """
+        Run `cmd` and wait for it.
+
+        Args:
+            cmd (Sequence[str]): Program and arguments (no shell).
+            cwd: Working directory.
+            env: Extra environment variables for this command (on top of
+                `base_env` and any `command_env` scope).
+            timeout (Optional[float]): Seconds before the child is killed. Capped
+                by the deadline installed with `deadline_scope`, if any.
+            check (bool): Raise `CommandError` on a non-zero exit code.
+            capture (bool): Keep the complete stdout in `CommandResult.output`.
+            capture_stderr (bool): With `capture`, keep stderr lines there too.
+            stream (bool): Log every output line as it arrives.
+
+        Returns:
+            CommandResult: Exit code, captured output and output tail.
+
+        Raises:
+            CommandError: Non-zero exit with `check=True`.
+            CommandTimeout: The timeout elapsed; the child was killed.
+            DeadlineExceeded: The current deadline had already expired.
+            FileNotFoundError: The program does not exist.
+        """
+        cmd = [str(c) for c in cmd]
+        dl = current_deadline()
+        if dl is not None:
+            if dl.expired:
+                raise DeadlineExceeded(f"Deadline exceeded before running: {' '.join(cmd)}")
+            timeout = dl.cap(timeout)
+        tail: deque[str] = deque(maxlen=self.tail_lines)
+        captured: list[str] = []
+
+        async def pump(reader: asyncio.StreamReader, keep: bool) -> None:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    return
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                tail.append(line)
+                if keep:
+                    captured.append(line)
+                if stream:
+                    self.logger.info("  │ %s", line)
+
+        async with self._semaphore():
+            started = time.perf_counter()
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(cwd) if cwd is not None else None,
+                env=self._env(env),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                # Own process group on POSIX so a timeout can kill grandchildren too.
+                start_new_session=(os.name != "nt"),
+            )
+            readers = asyncio.gather(pump(proc.stdout, capture), pump(proc.stderr, capture and capture_stderr))  # type: ignore[arg-type]
+
+            async def finish() -> int:
+                # The child may close its pipes and keep running: the timeout
+                # has to cover the exit as well as the output.
+                await asyncio.shield(readers)
+                return await proc.wait()
+
+            try:
+                rc = await asyncio.wait_for(finish(), timeout)
+            except asyncio.TimeoutError:
+                await self._kill(proc, readers)
+                raise CommandTimeout(cmd, timeout or 0, tail) from None
+            except asyncio.CancelledError:
+                await self._kill(proc, readers)
+                raise
+
+        result = CommandResult(cmd, rc, "\n".join(captured), list(tail), time.perf_counter() - started)
+        if check and rc != 0:
+            raise CommandError(rc, cmd, result.output, result.tail)
+        return result
+
+    @staticmethod
+    async def _kill(proc: asyncio.subprocess.Process, readers: asyncio.Future) -> None:
+        if proc.returncode is None:
+            try:
+                if os.name != "nt":
+                    os.killpg(proc.pid, signal.SIGKILL)
+                else:
+                    proc.kill()
+            except (ProcessLookupError, PermissionError):
+                pass
+        await proc.wait()
+        readers.cancel()
+        try:
+            await readers
+        except (asyncio.CancelledError, Exception):
+            pass
+
+
+_default_runner: Optional[CommandRunner] = None
+_default_lock = threading.Lock()
+
+
+def default_runner() -> CommandRunner:
+    """Return the process-wide runner shared by all call sites."""
+    global _default_runner
+    with _default_lock:
+        if _default_runner is None:
+            _default_runner = CommandRunner()
+        return _default_runner
+
+
+def run_command(cmd: Sequence[str], **kwargs) -> CommandResult:
+    """
+    Synchronous wrapper around `default_runner().run(...)`.
+
+    Works from plain threads and from code already running inside an event
+    loop (the command then runs on a private loop in a helper thread). Calls
+    from all threads share the runner's `max_concurrency` limit.
+    """
+    runner = default_runner()
+    with runner._slots:
+        return _run_sync(lambda: runner.run(cmd, **kwargs))
+
+
+def _run_sync(coro_factory) -> CommandResult:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro_factory())
+
+    box: dict[str, object] = {}
+    ctx = contextvars.copy_context()  # keep the caller's deadline
+
+    def _target() -> None:
+        try:
+            box["result"] = ctx.run(asyncio.run, coro_factory())
+        except BaseException as e:  # re-raised in the caller's thread
+            box["error"] = e
+
+    t = threading.Thread(target=_target, name="reposmith-run")
+    t.start()
+    t.join()
+    if "error" in box:
+        raise box["error"]  # type: ignore[misc]
+    return box["result"]  # type: ignore[return-value]
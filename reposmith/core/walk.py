@@ -0,0 +1,144 @@
+# reposmith/core/walk.py
+"""
+Multi-threaded directory walker built on `os.scandir`.
+
+Every directory listing is a task on a thread pool, so deep or wide trees
+are read with many syscalls in flight. A `classify` callback decides per
+entry whether it is a result (MATCH), a directory to enter (DESCEND) or
+uninteresting (SKIP); matched directories are not entered. `remove_trees`
+uses the same walk to delete large trees with parallel unlinks.
+"""
+from __future__ import annotations
+
+import os
+import stat
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+MATCH = "match"
+DESCEND = "descend"
+SKIP = "skip"
+
+# Never worth entering when looking for project artifacts.
+VCS_DIRS = frozenset({".git", ".hg", ".svn", "node_modules"})
+
+
+def _scan_one(directory: str, classify: Callable[[os.DirEntry], str]) -> tuple[list[os.DirEntry], list[str]]:
+    matches: list[os.DirEntry] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                verdict = classify(entry)
+                if verdict == MATCH:
+                    matches.append(entry)
+                elif verdict == DESCEND:
+                    subdirs.append(entry.path)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        pass  # removed or unreadable while walking
+    return matches, subdirs
+
+
+def scan_tree(
+    roots: Iterable[str | Path],
+    classify: Callable[[os.DirEntry], str],
+    *,
+    jobs: Optional[int] = None,
+) -> list[os.DirEntry]:
+    """
+    Walk `roots` in parallel and return the entries `classify` matched.
+
+    Args:
+        roots (Iterable[str | Path]): Directories to walk (not classified themselves).
+        classify (Callable[[os.DirEntry], str]): Returns MATCH, DESCEND or SKIP.
+            Called from worker threads.
+        jobs (Optional[int]): Worker threads (default: 4 x CPU count, I/O bound).
+
+    Returns:
+        list[os.DirEntry]: Matched entries, in no particular order. Their
+        `stat()` results are cached, so callers can reuse them cheaply.
+    """
+    results: list[os.DirEntry] = []
+    workers = max(1, jobs or 4 * (os.cpu_count() or 2))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-walk") as pool:
+        pending = {pool.submit(_scan_one, str(r), classify) for r in roots}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                matches, subdirs = fut.result()
+                results.extend(matches)
+                pending.update(pool.submit(_scan_one, d, classify) for d in subdirs)
+    return results
+
+
+def is_venv(path: str | Path) -> bool:
+    """True if `path` is a virtual environment (contains `pyvenv.cfg`)."""
+    return os.path.isfile(os.path.join(path, "pyvenv.cfg"))
+
+
+def find_venvs(root: str | Path, *, jobs: Optional[int] = None) -> list[Path]:
+    """
+    Every virtual environment below `root` (not descending into them).
+
+    Returns:
+        list[Path]: Sorted venv directories.
+    """
+
+    def classify(entry: os.DirEntry) -> str:
+        if not entry.is_dir(follow_symlinks=False) or entry.name in VCS_DIRS:
+            return SKIP
+        return MATCH if is_venv(entry.path) else DESCEND
+
+    found = [Path(e.path) for e in scan_tree([root], classify, jobs=jobs)]
+    if is_venv(root):
+        found.append(Path(root))
+    return sorted(found)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)  # read-only files on Windows
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def remove_trees(paths: Iterable[str | Path], *, jobs: Optional[int] = None) -> None:
+    """
+    Delete files and directory trees, unlinking files on a thread pool.
+
+    Directories are listed with `scan_tree`, their files and symlinks removed
+    in parallel, then the (now empty) directories deepest first.
+    Symlinked directories are removed as links, never followed.
+
+    Raises:
+        OSError: If something could not be removed.
+    """
+    dirs: list[str] = []
+    files: list[str] = []
+    for p in map(str, paths):
+        if os.path.isdir(p) and not os.path.islink(p):
+            dirs.append(p)
+        elif os.path.lexists(p):
+            files.append(p)
+
+    def classify(entry: os.DirEntry) -> str:
+        if entry.is_dir(follow_symlinks=False):
+            dirs.append(entry.path)
+            return DESCEND
+        return MATCH
+
+    if dirs:
+        files += [e.path for e in scan_tree(list(dirs), classify, jobs=jobs)]
+    if files:
+        workers = max(1, min(jobs or 2 * (os.cpu_count() or 2), len(files)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-rm") as pool:
+            list(pool.map(_unlink, files))
+    for d in sorted(dirs, key=lambda d: d.count(os.sep), reverse=True):
+        try:
+            os.rmdir(d)
+        except FileNotFoundError:
+            pass
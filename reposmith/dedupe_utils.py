@@ -0,0 +1,348 @@
+# reposmith/dedupe_utils.py
+"""
+Cross-project virtualenv deduplication (pnpm-style).
+
+`dedupe_venvs` finds every venv below a root and replaces identical files
+with hardlinks to one read-only copy in a content-addressed store, so N
+projects with the same dependencies pay for them once on disk and in the
+page cache. Candidates are narrowed cheaply before anything is fully hashed:
+
+  1. size buckets (a file with a unique size has no duplicate),
+  2. a hash of the first few KiB,
+  3. a full sha256, computed in parallel.
+
+Every replacement is atomic (link to a temp name, then `os.replace`) and only
+happens if the file still has the size, mtime and inode it had when it was
+hashed, so a concurrent install is never overwritten. Store objects are made
+read-only, which turns an accidental in-place write into an error instead of
+a change to every project. Each file's undo record is appended to the store
+manifest and flushed before the file is replaced, so `undo_dedupe` can give
+every file its own copy back even after an interrupted run.
+"""
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import stat
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+from .core.walk import DESCEND, MATCH, SKIP, find_venvs, scan_tree
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+STORE_DIRNAME = ".reposmith-store"
+MANIFEST = "manifest.jsonl"
+PARTIAL_BYTES = 8192
+
+
+@dataclass
+class _File:
+    path: str
+    size: int
+    mtime_ns: int
+    ino: int
+    dev: int
+    mode: int
+
+    @classmethod
+    def from_stat(cls, path: str, st: os.stat_result) -> "_File":
+        return cls(path, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev, stat.S_IMODE(st.st_mode))
+
+    @property
+    def executable(self) -> bool:
+        return bool(self.mode & 0o111)
+
+    def unchanged(self) -> bool:
+        """True if the file still is what was hashed."""
+        try:
+            st = os.stat(self.path, follow_symlinks=False)
+        except OSError:
+            return False
+        return (st.st_size, st.st_mtime_ns, st.st_ino) == (self.size, self.mtime_ns, self.ino)
+
+
+@dataclass
+class DedupeReport:
+    """Outcome of `dedupe_venvs` or `undo_dedupe`."""
+
+    store: Path
+    venvs: list[Path] = field(default_factory=list)
+    scanned: int = 0
+    hashed: int = 0
+    linked: int = 0
+    already_linked: int = 0
+    bytes_saved: int = 0
+    skipped_changed: int = 0
+    skipped_device: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def _pool_map(fn: Callable, items: Sequence, jobs: Optional[int]) -> list:
+    if not items:
+        return []
+    workers = max(1, min(jobs or 2 * (os.cpu_count() or 2), len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-dedupe") as pool:
+        return list(pool.map(lambda item: contextvars.copy_context().run(fn, item), items))
+
+
+def _partial_hash(f: _File) -> Optional[bytes]:
+    try:
+        with open(f.path, "rb") as fh:
+            return hashlib.blake2b(fh.read(PARTIAL_BYTES), digest_size=16).digest()
+    except OSError:
+        return None
+
+
+def _full_hash(f: _File) -> Optional[str]:
+    try:
+        with open(f.path, "rb") as fh:
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+def _groups(
+    files: list[_File], key: Callable[[_File], object], *, parallel: bool = False, jobs: Optional[int] = None
+) -> list[tuple[object, list[_File]]]:
+    """Group files by `key` (computed on a thread pool if `parallel`), keeping groups of 2+."""
+    keys = _pool_map(key, files, jobs) if parallel else [key(f) for f in files]
+    buckets: dict[object, list[_File]] = {}
+    for f, k in zip(files, keys):
+        if k is not None and None not in (k if isinstance(k, tuple) else ()):
+            buckets.setdefault(k, []).append(f)
+    return [(k, g) for k, g in buckets.items() if len(g) > 1]
+
+
+def _object_path(store: Path, digest: str, executable: bool) -> Path:
+    return store / "objects" / digest[:2] / (digest + ("-x" if executable else ""))
+
+
+def _object_digest(path: str) -> str:
+    return os.path.basename(path).removesuffix("-x")
+
+
+def _try_lock(fd: int) -> None:
+    """Non-blocking exclusive lock on an open file; OSError if it is held."""
+    if os.name == "nt":
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+@contextmanager
+def _store_lock(store: Path) -> Iterator[None]:
+    # An OS file lock dies with its process, so a crashed run never blocks later ones.
+    lock = store / ".lock"
+    fd = os.open(lock, os.O_CREAT | os.O_RDWR)
+    try:
+        try:
+            _try_lock(fd)
+        except OSError:
+            raise RuntimeError(f"Another dedupe is using {store}.") from None
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        yield
+    finally:
+        os.close(fd)
+
+
+def _journal(fh, target: _File, obj: Path) -> None:
+    """Append an undo record and get it to disk before the file is replaced."""
+    fh.write(json.dumps({"path": target.path, "object": obj.name, "mode": target.mode}) + "\n")
+    fh.flush()
+    os.fsync(fh.fileno())
+
+
+def _link_into_place(obj: Path, target: _File, journal: Callable[[_File], None]) -> None:
+    tmp = f"{target.path}.rsdedupe-{uuid.uuid4().hex[:8]}"
+    os.link(obj, tmp)
+    try:
+        if not target.unchanged():
+            raise FileExistsError("changed while deduplicating")
+        journal(target)
+        os.replace(tmp, target.path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _collect(venvs: Sequence[Path], min_size: int, jobs: Optional[int]) -> list[_File]:
+    out: list[_File] = []
+
+    def classify(entry: os.DirEntry) -> str:
+        if entry.is_dir(follow_symlinks=False):
+            return DESCEND
+        if entry.is_file(follow_symlinks=False) and entry.name != "pyvenv.cfg":
+            return MATCH
+        return SKIP
+
+    for entry in scan_tree(venvs, classify, jobs=jobs):
+        st = entry.stat(follow_symlinks=False)
+        if st.st_size >= max(min_size, 1):
+            out.append(_File.from_stat(entry.path, st))
+    return out
+
+
+def dedupe_venvs(
+    root: Path,
+    *,
+    store: Optional[Path] = None,
+    min_size: int = 1024,
+    jobs: Optional[int] = None,
+    dry_run: bool = False,
+) -> DedupeReport:
+    """
+    Hardlink identical files of every venv below `root` to one store copy.
+
+    Args:
+        root (Path): Directory containing the projects.
+        store (Optional[Path]): Content-addressed store; must be on the same
+            filesystem as the venvs (default: `<root>/.reposmith-store`).
+        min_size (int): Ignore files smaller than this many bytes.
+        jobs (Optional[int]): Worker threads for walking and hashing.
+        dry_run (bool): Only report what would be linked and saved.
+
+    Returns:
+        DedupeReport: Counts, bytes saved and per-file errors.
+    """
+    root = Path(root).resolve()
+    store = Path(store).resolve() if store else root / STORE_DIRNAME
+    report = DedupeReport(store=store, venvs=find_venvs(root, jobs=jobs))
+    files = _collect(report.venvs, min_size, jobs)
+    report.scanned = len(files)
+    if not dry_run:
+        (store / "objects").mkdir(parents=True, exist_ok=True)
+    store_dev = os.stat(store if store.exists() else root).st_dev
+
+    # Files already linked to a store object from an earlier run.
+    known: dict[tuple[int, int], str] = {}
+    objects_dir = store / "objects"
+    if objects_dir.is_dir():
+        for entry in scan_tree([objects_dir], lambda e: MATCH if e.is_file() else DESCEND, jobs=jobs):
+            st = entry.stat()
+            known[(st.st_dev, st.st_ino)] = entry.name
+    pending: list[_File] = []
+    for f in files:
+        if (f.dev, f.ino) in known:
+            report.already_linked += 1
+        elif f.dev != store_dev:
+            report.skipped_device += 1
+        else:
+            pending.append(f)
+
+    # Existing objects join the size buckets so new venvs link to them too.
+    objects = [
+        _File.from_stat(str(objects_dir / name[:2] / name), os.stat(objects_dir / name[:2] / name))
+        for name in set(known.values())
+    ]
+    candidates = [f for _, g in _groups(pending + objects, lambda f: (f.size, f.executable)) for f in g]
+    candidates = [
+        f for _, g in _groups(candidates, lambda f: (f.size, f.executable, _partial_hash(f)), parallel=True, jobs=jobs)
+        for f in g
+    ]
+    report.hashed = len(candidates)
+    object_paths = {o.path for o in objects}
+
+    def digest(f: _File) -> tuple[Optional[str], bool]:
+        return (_object_digest(f.path) if f.path in object_paths else _full_hash(f)), f.executable
+
+    plan: list[tuple[str, Optional[_File], list[_File]]] = []
+    for (sha, _), group in _groups(candidates, digest, parallel=True, jobs=jobs):
+        existing = next((f for f in group if f.path in object_paths), None)
+        members = [f for f in group if f.path not in object_paths]
+        if members and (existing is not None or len(members) > 1):
+            plan.append((sha, existing, members))
+    if dry_run:
+        for _, existing, members in plan:
+            links = members if existing else members[1:]
+            report.linked += len(links)
+            report.bytes_saved += sum(f.size for f in links)
+        return report
+
+    with _store_lock(store), open(store / MANIFEST, "a", encoding="utf-8") as manifest:
+        for sha, existing, members in plan:
+            if existing is not None:
+                obj, links = Path(existing.path), members
+            else:
+                first, links = members[0], members[1:]
+                if not first.unchanged():
+                    report.skipped_changed += 1
+                    continue
+                obj = _object_path(store, sha, first.executable)
+                obj.parent.mkdir(parents=True, exist_ok=True)
+                _journal(manifest, first, obj)
+                try:
+                    os.link(first.path, obj)
+                except OSError as e:
+                    report.errors[first.path] = str(e)
+                    continue
+                # Read-only: an in-place write would otherwise change every project.
+                os.chmod(obj, first.mode & ~0o222)
+            for f in links:
+                try:
+                    _link_into_place(obj, f, lambda target: _journal(manifest, target, obj))
+                except FileExistsError:
+                    report.skipped_changed += 1
+                except OSError as e:
+                    report.errors[f.path] = str(e)
+                else:
+                    report.linked += 1
+                    report.bytes_saved += f.size
+    return report
+
+
+def undo_dedupe(root: Path, *, store: Optional[Path] = None, jobs: Optional[int] = None) -> DedupeReport:
+    """
+    Give every deduplicated file below `root` its own writable copy again.
+
+    Store objects no file links to any more are deleted; entries for other
+    roots sharing the store are kept.
+
+    Returns:
+        DedupeReport: `linked` counts files restored.
+    """
+    root = Path(root).resolve()
+    store = Path(store).resolve() if store else root / STORE_DIRNAME
+    report = DedupeReport(store=store)
+    manifest = store / MANIFEST
+    if not manifest.is_file():
+        return report
+    records = [json.loads(line) for line in manifest.read_text(encoding="utf-8").splitlines() if line.strip()]
+    mine = [r for r in records if Path(r["path"]).is_relative_to(root)]
+    keep = [r for r in records if not Path(r["path"]).is_relative_to(root)]
+
+    def restore(rec: dict) -> Optional[str]:
+        obj = store / "objects" / rec["object"][:2] / rec["object"]
+        path = rec["path"]
+        try:
+            if not (os.path.exists(path) and os.path.samefile(path, obj)):
+                return None  # reinstalled or removed since; nothing to undo
+            tmp = f"{path}.rsundo-{uuid.uuid4().hex[:8]}"
+            with open(obj, "rb") as src, open(tmp, "wb") as dst:
+                while chunk := src.read(1 << 20):
+                    dst.write(chunk)
+            os.chmod(tmp, rec["mode"])
+            os.replace(tmp, path)
+            return "restored"
+        except OSError as e:
+            report.errors[path] = str(e)
+            return None
+
+    with _store_lock(store):
+        report.linked = sum(1 for r in _pool_map(restore, mine, jobs) if r == "restored")
+        manifest.write_text("".join(json.dumps(r) + "\n" for r in keep), encoding="utf-8")
+        for entry in scan_tree([store / "objects"], lambda e: MATCH if e.is_file() else DESCEND, jobs=jobs):
+            if entry.stat().st_nlink <= 1:
+                os.chmod(entry.path, 0o644)
+                os.unlink(entry.path)
+    return report
@@ -1,41 +1,48 @@
 from pathlib import Path
-import subprocess
 import sys
 
+from .core.runner import run_command
+from .installer import get_installer, uv_command
+from .utils.paths import venv_python
+
 def _run(cmd: list[str], cwd: Path | None = None) -> None:
     """
-    Print and execute a shell command using subprocess.
+    Print and execute a command through the shared command runner.
 
     Args:
         cmd (list[str]): Command to execute.
         cwd (Path | None): Optional working directory for the command.
     """
     print("[uv]", " ".join(cmd))
-    subprocess.check_call(cmd, cwd=cwd)
+    run_command(cmd, cwd=cwd)
 
 def install_deps_with_uv(root: Path) -> None:
     """
-    Ensure the 'uv' tool is available and install dependencies using it.
+    Install dependencies with the installer engine, preferring uv.
 
     Args:
         root (Path): Project root directory containing dependency files.
 
     Notes:
-        - Tries to use 'pyproject.toml' with `uv sync` if present.
-        - Falls back to 'requirements.txt' if available.
+        - Uses the system uv (or the `uv` module) when present, else pip;
+          uv is never installed just for this (see `reposmith.installer`).
+        - Tries to use 'pyproject.toml' with `uv sync` if present (uv only).
+        - Falls back to 'requirements.txt' if available, installed into
+          `.venv` when it exists.
         - Skips installation if neither file is found.
     """
-    try:
-        _run([sys.executable, "-m", "uv", "--version"], cwd=root)
-    except subprocess.CalledProcessError:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "uv"])
-
+    uv = uv_command()
     pyproject = root / "pyproject.toml"
     req = root / "requirements.txt"
 
-    if pyproject.exists():
-        _run([sys.executable, "-m", "uv", "sync"], cwd=root)
+    if pyproject.exists() and uv is not None:
+        _run([*uv, "sync"], cwd=root)
     elif req.exists():
-        _run([sys.executable, "-m", "uv", "pip", "install", "-r", "requirements.txt"], cwd=root)
+        installer = get_installer()
+        py = venv_python(root)
+        print(f"[{installer.kind}] Installing requirements.txt via {installer.name}...")
+        installer.install(str(py if py.exists() else sys.executable), requirements=req, cwd=root)
+    elif pyproject.exists():
+        print("[uv] uv is not installed; skipping `uv sync`.")
     else:
-        print("[uv] No dependency file found; skipping.")
\ No newline at end of file
+        print("[uv] No dependency file found; skipping.")
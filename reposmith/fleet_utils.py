@@ -0,0 +1,162 @@
+# reposmith/fleet_utils.py
+"""
+Doctor checks across every project below a directory.
+
+`find_projects` walks the tree once with the parallel `os.scandir` walker and
+yields each directory holding a `.venv`, `pyproject.toml` or
+`requirements.txt`, without entering VCS directories or venvs. The global
+tools (uv, git, pip) are probed once by `probe_tools` and shared by all
+projects. `doctor_fleet` then inspects the projects on a bounded thread pool
+and returns plain dicts, ready for `json.dumps`.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from .core.runner import run_command
+from .core.walk import DESCEND, MATCH, SKIP, VCS_DIRS, is_venv, scan_tree
+from .venv_utils import _venv_python
+
+PROJECT_MARKERS = frozenset({"pyproject.toml", "requirements.txt"})
+# Directories that hold projects' own build and cache output, never projects.
+_NOT_PROJECTS = frozenset({"__pycache__", ".tox", ".nox", "build", "dist", "site-packages"})
+
+
+def run_out(cmd: list[str], timeout: Optional[float] = None) -> tuple[int, str]:
+    """Exit code and stripped output of `cmd` (127 if it cannot be started)."""
+    try:
+        res = run_command(cmd, check=False, capture=True, stream=False, timeout=timeout)
+    except (FileNotFoundError, PermissionError):
+        return 127, ""
+    out = res.output.strip() or "\n".join(res.tail).strip()
+    return res.returncode, out
+
+
+def read_pyproject_version(root: Path) -> Optional[str]:
+    """The first `version = ...` line of `root/pyproject.toml`, if any."""
+    py = root / "pyproject.toml"
+    if not py.exists():
+        return None
+    text = py.read_text(encoding="utf-8", errors="ignore")
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("version") and "=" in line:
+            try:
+                val = line.split("=", 1)[1].strip().strip('"').strip("'")
+                if val:
+                    return val
+            except Exception:
+                pass
+    return None
+
+
+def probe_tools() -> dict[str, Optional[str]]:
+    """Versions of uv, git and pip (None when missing), probed concurrently."""
+    cmds = {
+        "uv": ["uv", "--version"],
+        "git": ["git", "--version"],
+        "pip": [sys.executable, "-m", "pip", "--version"],
+    }
+    with ThreadPoolExecutor(max_workers=len(cmds), thread_name_prefix="reposmith-probe") as pool:
+        results = dict(zip(cmds, pool.map(run_out, cmds.values())))
+    return {name: (out if rc == 0 else None) for name, (rc, out) in results.items()}
+
+
+def find_projects(root: Path, *, jobs: Optional[int] = None) -> list[Path]:
+    """Directories below (and including) `root` that look like Python projects, sorted."""
+    root = Path(root)
+
+    def classify(entry: os.DirEntry) -> str:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name == ".venv" and is_venv(entry.path):
+                return MATCH
+            if entry.name in VCS_DIRS or entry.name in _NOT_PROJECTS or is_venv(entry.path):
+                return SKIP
+            return DESCEND
+        return MATCH if entry.name in PROJECT_MARKERS else SKIP
+
+    found = {Path(os.path.dirname(e.path)) for e in scan_tree([root], classify, jobs=jobs)}
+    if (root / ".venv").is_dir() or any((root / m).is_file() for m in PROJECT_MARKERS):
+        found.add(root)
+    return sorted(found)
+
+
+def inspect_project(root: Path) -> dict:
+    """
+    Per-project doctor findings. Global tools are not probed here; `doctor_fleet`
+    probes them once and reports them in the summary.
+
+    Returns:
+        dict: `path`, `venv`, `python`, `pyproject`, `version`, `requirements`,
+        `problems` and `ok`.
+    """
+    problems: list[str] = []
+    finding: dict = {"path": str(root), "venv": False, "python": None}
+    venv = root / ".venv"
+    if venv.is_dir():
+        finding["venv"] = True
+        interp = _venv_python(venv)
+        if Path(interp).exists():
+            rc, out = run_out([interp, "--version"], timeout=30)
+            if rc == 0:
+                finding["python"] = out.split()[-1] if out else None
+            else:
+                problems.append(".venv interpreter does not run (base Python removed or upgraded?)")
+        else:
+            problems.append(".venv exists but python interpreter missing")
+    finding["pyproject"] = (root / "pyproject.toml").is_file()
+    finding["version"] = read_pyproject_version(root)
+    req = root / "requirements.txt"
+    if req.is_file():
+        empty = not req.read_text(encoding="utf-8", errors="ignore").strip()
+        finding["requirements"] = "empty" if empty else "present"
+    else:
+        finding["requirements"] = None
+    if (finding["pyproject"] or finding["requirements"]) and not finding["venv"]:
+        problems.append("no .venv (create it with 'reposmith init')")
+    finding["problems"] = problems
+    finding["ok"] = not problems
+    return finding
+
+
+def doctor_fleet(root: Path, *, jobs: Optional[int] = None) -> tuple[list[dict], dict]:
+    """
+    Inspect every project below `root` concurrently.
+
+    Args:
+        root (Path): Directory containing the checkouts.
+        jobs (Optional[int]): Projects inspected at once (default: CPU count).
+
+    Returns:
+        tuple[list[dict], dict]: Per-project findings (sorted by path) and a summary.
+    """
+    started = time.perf_counter()
+    root = Path(root).expanduser().resolve()
+    tools = probe_tools()
+    projects = find_projects(root)
+    findings: list[dict] = []
+    if projects:
+        workers = max(1, min(jobs or os.cpu_count() or 4, len(projects)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-fleet") as pool:
+            findings = list(pool.map(inspect_project, projects))
+
+    counts: dict[str, int] = {}
+    for f in findings:
+        for p in f["problems"]:
+            counts[p] = counts.get(p, 0) + 1
+    summary = {
+        "root": str(root),
+        "projects": len(findings),
+        "ok": sum(1 for f in findings if f["ok"]),
+        "with_problems": sum(1 for f in findings if not f["ok"]),
+        "without_venv": sum(1 for f in findings if not f["venv"]),
+        "tools": tools,
+        "problems": dict(sorted(counts.items(), key=lambda kv: -kv[1])),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    return findings, summary
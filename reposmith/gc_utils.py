@@ -0,0 +1,261 @@
+# reposmith/gc_utils.py
+"""
+Garbage collection of stale virtual environments across a workspace.
+
+Only venvs carrying reposmith's marker (`.reposmith-venv.json`, written by
+`create_virtualenv`) are considered. Their last use is the latest of:
+
+  - the access time of `pyvenv.cfg`, which every interpreter start reads,
+  - the modification time of site-packages (changes on every install),
+  - the project's `.reposmith/` state files.
+
+`collect_venvs` removes the least recently used ones. Before a venv goes, its
+interpreter version and installed distributions are recorded in the
+project's `.reposmith/collected-venvs.json`, so the next `reposmith init`
+can rebuild it with the same pins, straight from the installer cache.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .core.checkpoints import STATE_DIRNAME
+from .core.dists import DIST_INFO_RE, venv_site_packages
+from .core.fs import atomic_write
+from .core.walk import DESCEND, MATCH, find_venvs, remove_trees, scan_tree
+from .installer import get_installer
+from .venv_utils import VENV_MARKER, _venv_python
+
+COLLECTED_FILENAME = "collected-venvs.json"
+
+
+@dataclass
+class VenvUsage:
+    """A reposmith-created venv and how recently it was used."""
+
+    path: Path
+    last_used: float = 0.0
+    size: int = 0
+
+    @property
+    def project(self) -> Path:
+        return self.path.parent
+
+
+@dataclass
+class GcReport:
+    """Outcome of `collect_venvs`."""
+
+    venvs: list[VenvUsage] = field(default_factory=list)
+    removed: list[VenvUsage] = field(default_factory=list)
+    remaining_bytes: int = 0
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def freed_bytes(self) -> int:
+        return sum(v.size for v in self.removed)
+
+
+def _mtime(path: Path, attr: str = "st_mtime") -> float:
+    try:
+        return getattr(path.stat(), attr)
+    except OSError:
+        return 0.0
+
+
+def _measure(venv: Path) -> VenvUsage:
+    usage = VenvUsage(venv)
+    state = venv.parent / STATE_DIRNAME
+    times = [
+        _mtime(venv / "pyvenv.cfg", "st_atime"),
+        _mtime(venv / VENV_MARKER),
+        *(_mtime(sp) for sp in venv_site_packages(venv)),
+        *(_mtime(p) for p in (state.iterdir() if state.is_dir() else ())),
+    ]
+    usage.last_used = max(times)
+
+    def classify(entry: os.DirEntry) -> str:
+        return DESCEND if entry.is_dir(follow_symlinks=False) else MATCH
+
+    for entry in scan_tree([venv], classify, jobs=4):
+        st = entry.stat(follow_symlinks=False)
+        # Hardlinked files (see `reposmith venv dedupe`) free nothing on their own.
+        if st.st_nlink <= 1:
+            usage.size += st.st_size
+    return usage
+
+
+def scan_workspace(root: Path, *, jobs: Optional[int] = None) -> list[VenvUsage]:
+    """
+    Find reposmith-created venvs below `root` and measure them in parallel.
+
+    Returns:
+        list[VenvUsage]: Least recently used first.
+    """
+    venvs = [v for v in find_venvs(root, jobs=jobs) if (v / VENV_MARKER).is_file()]
+    if not venvs:
+        return []
+    workers = max(1, min(jobs or os.cpu_count() or 4, len(venvs)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-gc") as pool:
+        found = list(pool.map(_measure, venvs))
+    return sorted(found, key=lambda v: v.last_used)
+
+
+def plan_collection(
+    venvs: Sequence[VenvUsage],
+    *,
+    older_than: Optional[float] = None,
+    budget: Optional[int] = None,
+    now: Optional[float] = None,
+) -> list[VenvUsage]:
+    """
+    Pick venvs to remove: unused for longer than `older_than`, then the least
+    recently used until the rest fits `budget` bytes.
+    """
+    now = time.time() if now is None else now
+    total = sum(v.size for v in venvs)
+    chosen: list[VenvUsage] = []
+    for v in sorted(venvs, key=lambda v: v.last_used):
+        stale = older_than is not None and now - v.last_used > older_than
+        if stale or (budget is not None and total > budget):
+            chosen.append(v)
+            total -= v.size
+    return chosen
+
+
+def installed_pins(venv: Path) -> list[str]:
+    """`name==version` for every distribution in the venv, except editable installs."""
+    pins: list[str] = []
+    for sp in venv_site_packages(venv):
+        for d in sp.glob("*.dist-info"):
+            m = DIST_INFO_RE.match(d.name)
+            if not m or (d / "direct_url.json").exists():
+                continue
+            pins.append(f"{m.group(1)}=={m.group(2)}")
+    return sorted(pins, key=str.lower)
+
+
+def _venv_version(venv: Path) -> Optional[str]:
+    try:
+        text = (venv / "pyvenv.cfg").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    m = re.search(r"^version(?:_info)?\s*=\s*(\d+\.\d+)", text, re.MULTILINE)
+    return m.group(1) if m else None
+
+
+def _collected_path(project: Path) -> Path:
+    return project / STATE_DIRNAME / COLLECTED_FILENAME
+
+
+def read_collected(project: Path) -> dict[str, dict]:
+    """Manifests of venvs collected from `project`, keyed by venv directory name."""
+    try:
+        return json.loads(_collected_path(project).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_collected(project: Path, data: dict[str, dict]) -> None:
+    path = _collected_path(project)
+    if data:
+        atomic_write(path, json.dumps(data, indent=2, sort_keys=True) + "\n")
+    else:
+        path.unlink(missing_ok=True)
+
+
+def record_collected(venv: Path) -> dict:
+    """Remember how to rebuild `venv` in its project's `.reposmith/` directory."""
+    manifest = {"collected": time.time(), "python": _venv_version(venv), "packages": installed_pins(venv)}
+    data = read_collected(venv.parent)
+    data[venv.name] = manifest
+    _write_collected(venv.parent, data)
+    return manifest
+
+
+def collect_venvs(
+    root: Path,
+    *,
+    older_than: Optional[float] = None,
+    budget: Optional[int] = None,
+    dry_run: bool = False,
+    jobs: Optional[int] = None,
+) -> GcReport:
+    """
+    Remove stale reposmith venvs below `root`.
+
+    Each chosen venv is recorded with `record_collected`, renamed out of the
+    way (so nothing sees a half-deleted environment) and deleted with the
+    parallel `remove_trees`.
+
+    Args:
+        root (Path): Workspace to search.
+        older_than (Optional[float]): Remove venvs unused for this many seconds.
+        budget (Optional[int]): Keep the remaining venvs under this many bytes.
+        dry_run (bool): Only report what would be removed.
+        jobs (Optional[int]): Worker threads.
+
+    Returns:
+        GcReport: Every venv seen, those removed and per-venv errors.
+    """
+    report = GcReport(venvs=scan_workspace(Path(root), jobs=jobs))
+    chosen = plan_collection(report.venvs, older_than=older_than, budget=budget)
+    report.remaining_bytes = sum(v.size for v in report.venvs) - sum(v.size for v in chosen)
+    if dry_run:
+        report.removed = chosen
+        return report
+
+    doomed: list[Path] = []
+    for v in chosen:
+        try:
+            record_collected(v.path)
+            trash = v.path.with_name(f"{v.path.name}.rsgc-{uuid.uuid4().hex[:8]}")
+            os.replace(v.path, trash)
+        except OSError as e:
+            report.errors[str(v.path)] = str(e)
+            report.remaining_bytes += v.size
+            continue
+        doomed.append(trash)
+        report.removed.append(v)
+    try:
+        remove_trees(doomed, jobs=jobs)
+    except OSError as e:
+        report.errors["<delete>"] = str(e)
+    return report
+
+
+def restore_collected(venv: Path) -> bool:
+    """
+    Reinstall the pins recorded when `venv` was collected, then forget them.
+
+    Call right after recreating the venv. Installs go through the regular
+    installer, so a warm uv or pip cache makes this an offline copy.
+
+    Returns:
+        bool: True if a manifest was found and installed.
+    """
+    data = read_collected(venv.parent)
+    manifest = data.pop(venv.name, None)
+    if not manifest:
+        return False
+    if manifest.get("packages"):
+        print(f"[gc] Restoring {len(manifest['packages'])} package(s) recorded when {venv.name} was collected")
+        with tempfile.TemporaryDirectory(prefix="reposmith-gc-") as tmp:
+            req = Path(tmp) / "collected.txt"
+            req.write_text("\n".join(manifest["packages"]) + "\n", encoding="utf-8")
+            get_installer().install(_venv_python(venv), requirements=req)
+    _write_collected(venv.parent, data)
+    return True
+
+
+def collected_python(venv: Path) -> Optional[str]:
+    """Interpreter version recorded for a collected venv, if any."""
+    return (read_collected(venv.parent).get(venv.name) or {}).get("python")
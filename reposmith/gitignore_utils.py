@@ -23,6 +23,7 @@ cython_debug/
 .env
 .env.*
 .venv
+.venv-*/
 env/
 venv/
 venv*/
@@ -169,6 +170,7 @@ Dev_requirements.txt
 
 # Local cache from the app
 .cache/
+.reposmith/
 
 # OS junk
 .DS_Store
@@ -176,6 +178,7 @@ Thumbs.db
 
 # Generated env info 
 env-info.txt
+env-snapshot.json
 """
 
 NODE_GITIGNORE = """# Node
@@ -0,0 +1,533 @@
+# -*- coding: utf-8 -*-
+"""
+Local package index behind `reposmith index serve`.
+
+Serves a PEP 503 (HTML) / PEP 691 (JSON) simple index over a shared wheel
+store. Project pages come from a configurable upstream index and are cached
+for a short time; files are downloaded from upstream on the first request,
+verified against their sha256, kept in the store and evicted least-recently
+used once the store exceeds its size cap. Concurrent requests for the same
+file share a single upstream download.
+
+While running, the server records its URL in `<cache>/index-server.json` so
+`reposmith init` on the same machine points pip and uv at it automatically.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional
+
+from .core.fs import atomic_write
+from .utils.paths import cache_dir
+
+DEFAULT_UPSTREAM = "https://pypi.org/simple"
+DEFAULT_PORT = 3141
+PAGE_TTL = 600.0
+STATE_FILENAME = "index-server.json"
+
+SIMPLE_JSON = "application/vnd.pypi.simple.v1+json"
+SIMPLE_HTML = "application/vnd.pypi.simple.v1+html"
+_ACCEPT = f"{SIMPLE_JSON}, {SIMPLE_HTML};q=0.2, text/html;q=0.01"
+
+
+def normalize(name: str) -> str:
+    """PEP 503 project name normalization."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    """One distribution file listed on a project page."""
+
+    filename: str
+    url: Optional[str]  # absolute upstream URL; None for store-only files
+    sha256: Optional[str] = None
+    requires_python: Optional[str] = None
+    yanked: bool | str = False
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.links: list[tuple[dict[str, Optional[str]], str]] = []
+        self._current: Optional[dict[str, Optional[str]]] = None
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag == "a":
+            self._current, self._text = dict(attrs), []
+
+    def handle_data(self, data: str) -> None:
+        if self._current is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "a" and self._current is not None:
+            self.links.append((self._current, "".join(self._text).strip()))
+            self._current = None
+
+
+def parse_simple_page(body: bytes, content_type: str, page_url: str) -> list[FileEntry]:
+    """
+    Parse an upstream project page in either PEP 691 JSON or PEP 503 HTML.
+
+    Args:
+        body (bytes): Response body.
+        content_type (str): Response Content-Type.
+        page_url (str): URL the page was fetched from (for relative links).
+
+    Returns:
+        list[FileEntry]: Files with absolute upstream URLs.
+    """
+    entries: list[FileEntry] = []
+    if "json" in content_type:
+        for f in json.loads(body.decode("utf-8")).get("files", []):
+            entries.append(
+                FileEntry(
+                    filename=f["filename"],
+                    url=urllib.parse.urljoin(page_url, f["url"]),
+                    sha256=(f.get("hashes") or {}).get("sha256"),
+                    requires_python=f.get("requires-python"),
+                    yanked=f.get("yanked") or False,
+                )
+            )
+        return entries
+
+    parser = _LinkParser()
+    parser.feed(body.decode("utf-8", errors="replace"))
+    for attrs, text in parser.links:
+        href = attrs.get("href")
+        if not href:
+            continue
+        url, _, fragment = urllib.parse.urljoin(page_url, href).partition("#")
+        algo, _, digest = fragment.partition("=")
+        filename = text or urllib.parse.unquote(url.rsplit("/", 1)[-1])
+        yanked: bool | str = False
+        if "data-yanked" in attrs:
+            yanked = attrs["data-yanked"] or True
+        entries.append(
+            FileEntry(
+                filename=filename,
+                url=url,
+                sha256=digest if algo == "sha256" and digest else None,
+                requires_python=attrs.get("data-requires-python"),
+                yanked=yanked,
+            )
+        )
+    return entries
+
+
+class WheelStore:
+    """
+    On-disk file store with a least-recently-used size cap.
+
+    Files live at `<root>/files/<project>/<filename>`. Access order survives
+    restarts through file mtimes, which are refreshed on every hit. Pinned
+    files (ones being served) are never evicted.
+
+    Args:
+        root (Path): Store directory.
+        max_bytes (Optional[int]): Size cap; None means unbounded.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.files_dir = self.root / "files"
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[Path, int]" = OrderedDict()
+        self._pins: dict[Path, int] = {}
+        existing = [p for p in self.files_dir.glob("*/*") if p.is_file() and not p.name.startswith(".")]
+        for p in sorted(existing, key=lambda p: p.stat().st_mtime):
+            self._lru[p] = p.stat().st_size
+        self._total = sum(self._lru.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def path(self, project: str, filename: str) -> Path:
+        return self.files_dir / normalize(project) / os.path.basename(filename)
+
+    def projects(self) -> list[str]:
+        return sorted(p.name for p in self.files_dir.iterdir() if p.is_dir() and any(p.iterdir()))
+
+    def files(self, project: str) -> list[Path]:
+        d = self.files_dir / normalize(project)
+        return sorted(p for p in d.iterdir() if p.is_file() and not p.name.startswith(".")) if d.is_dir() else []
+
+    def touch(self, path: Path) -> None:
+        """Mark `path` as most recently used."""
+        with self._lock:
+            if path in self._lru:
+                self._lru.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    @contextmanager
+    def pinned(self, path: Path) -> Iterator[None]:
+        """Keep `path` from being evicted while the block runs (it need not exist yet)."""
+        with self._lock:
+            self._pins[path] = self._pins.get(path, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._pins[path] == 1:
+                    del self._pins[path]
+                else:
+                    self._pins[path] -= 1
+
+    def add(self, path: Path) -> None:
+        """Register a newly stored file and evict old ones if over the cap."""
+        size = path.stat().st_size
+        with self._lock:
+            self._total += size - self._lru.pop(path, 0)
+            self._lru[path] = size
+            for old in list(self._lru):
+                if self.max_bytes is None or self._total <= self.max_bytes:
+                    break
+                if old == path or old in self._pins:  # never evict a file being served
+                    continue
+                self._total -= self._lru.pop(old)
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+
+
+class IndexProxy:
+    """
+    Project pages and files from the store, falling back to an upstream index.
+
+    Args:
+        store (WheelStore): Local file store.
+        upstream (Optional[str]): Upstream simple index URL, or None for store-only.
+        page_ttl (float): Seconds an upstream project page is reused.
+        timeout (float): Network timeout for upstream requests.
+    """
+
+    def __init__(
+        self,
+        store: WheelStore,
+        upstream: Optional[str] = DEFAULT_UPSTREAM,
+        *,
+        page_ttl: float = PAGE_TTL,
+        timeout: float = 30.0,
+    ) -> None:
+        self.store = store
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.page_ttl = page_ttl
+        self.timeout = timeout
+        self.upstream_downloads = 0
+        self._downloads_lock = threading.Lock()
+        self._pages: dict[str, tuple[float, list[FileEntry]]] = {}
+        self._pages_lock = threading.Lock()
+        self._inflight: dict[str, tuple[threading.Lock, int]] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _upstream_page(self, project: str) -> list[FileEntry]:
+        if self.upstream is None:
+            return []
+        with self._pages_lock:
+            cached = self._pages.get(project)
+        if cached and time.monotonic() - cached[0] < self.page_ttl:
+            return cached[1]
+        url = f"{self.upstream}/{project}/"
+        try:
+            req = urllib.request.Request(url, headers={"Accept": _ACCEPT})
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                entries = parse_simple_page(resp.read(), resp.headers.get("Content-Type", ""), resp.geturl())
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                return cached[1] if cached else []
+            entries = []
+        except (OSError, ValueError):
+            # Upstream unreachable: serve a stale page rather than nothing.
+            return cached[1] if cached else []
+        with self._pages_lock:
+            self._pages[project] = (time.monotonic(), entries)
+        return entries
+
+    def project_files(self, project: str) -> list[FileEntry]:
+        """Upstream listing plus any store-only files for `project`."""
+        project = normalize(project)
+        entries = list(self._upstream_page(project))
+        known = {e.filename for e in entries}
+        entries += [FileEntry(p.name, None) for p in self.store.files(project) if p.name not in known]
+        return entries
+
+    @contextmanager
+    def _file_lock(self, key: str) -> Iterator[None]:
+        """Serialize work on `key`; the entry is dropped once nobody waits on it."""
+        with self._inflight_lock:
+            lock, users = self._inflight.get(key, (threading.Lock(), 0))
+            self._inflight[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._inflight_lock:
+                lock, users = self._inflight[key]
+                if users == 1:
+                    del self._inflight[key]
+                else:
+                    self._inflight[key] = (lock, users - 1)
+
+    def fetch(self, project: str, filename: str) -> Optional[Path]:
+        """
+        Return the stored path of a file, downloading it from upstream once.
+
+        Concurrent callers for the same file wait for the first download
+        instead of starting their own.
+
+        Returns:
+            Optional[Path]: The local file, or None if no index has it.
+
+        Raises:
+            ValueError: If the downloaded file does not match its sha256.
+        """
+        path = self.store.path(project, filename)
+        if path.is_file():
+            self.store.touch(path)
+            return path
+        with self._file_lock(str(path)):
+            if path.is_file():  # fetched by the request we waited for
+                self.store.touch(path)
+                return path
+            entry = next((e for e in self._upstream_page(normalize(project)) if e.filename == filename), None)
+            if entry is None or entry.url is None:
+                return None
+            self._download(entry, path)
+        self.store.add(path)
+        return path
+
+    @contextmanager
+    def open_file(self, project: str, filename: str) -> Iterator[Optional[BinaryIO]]:
+        """
+        Open a file for serving, fetching it first if needed.
+
+        The file is pinned in the store until the block exits, so eviction
+        triggered by other downloads cannot remove it mid-response.
+
+        Yields:
+            Optional[BinaryIO]: The open file, or None if no index has it.
+
+        Raises:
+            ValueError: If the downloaded file does not match its sha256.
+        """
+        with self.store.pinned(self.store.path(project, filename)):
+            local = self.fetch(project, filename)
+            if local is None:
+                yield None
+                return
+            with open(local, "rb") as f:
+                yield f
+
+    def _download(self, entry: FileEntry, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp = tempfile.mkstemp(prefix=".part-", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "wb") as out, urllib.request.urlopen(entry.url, timeout=self.timeout) as resp:
+                for chunk in iter(lambda: resp.read(1 << 16), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+            with self._downloads_lock:
+                self.upstream_downloads += 1
+            if entry.sha256 and digest.hexdigest() != entry.sha256:
+                raise ValueError(f"sha256 mismatch for {entry.filename}")
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+
+
+# ---------------------------
+# HTTP front end
+# ---------------------------
+def _file_url(project: str, filename: str) -> str:
+    return f"/files/{normalize(project)}/{urllib.parse.quote(filename)}"
+
+
+def render_project_json(project: str, entries: list[FileEntry]) -> dict[str, Any]:
+    return {
+        "meta": {"api-version": "1.0"},
+        "name": normalize(project),
+        "files": [
+            {
+                "filename": e.filename,
+                "url": _file_url(project, e.filename),
+                "hashes": {"sha256": e.sha256} if e.sha256 else {},
+                "requires-python": e.requires_python,
+                "yanked": e.yanked,
+            }
+            for e in entries
+        ],
+    }
+
+
+def render_project_html(project: str, entries: list[FileEntry]) -> str:
+    links = []
+    for e in entries:
+        href = _file_url(project, e.filename) + (f"#sha256={e.sha256}" if e.sha256 else "")
+        attrs = f' href="{html.escape(href)}"'
+        if e.requires_python:
+            attrs += f' data-requires-python="{html.escape(e.requires_python)}"'
+        if e.yanked:
+            attrs += f' data-yanked="{html.escape(e.yanked if isinstance(e.yanked, str) else "")}"'
+        links.append(f"    <a{attrs}>{html.escape(e.filename)}</a><br/>")
+    return (
+        '<!DOCTYPE html>\n<html>\n  <head><meta name="pypi:repository-version" content="1.0">'
+        f"<title>Links for {html.escape(project)}</title></head>\n  <body>\n"
+        + "\n".join(links)
+        + "\n  </body>\n</html>\n"
+    )
+
+
+class _IndexHandler(BaseHTTPRequestHandler):
+    proxy: IndexProxy  # set on the subclass created by make_index_server
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def _wants_json(self) -> bool:
+        accept = self.headers.get("Accept", "")
+        return SIMPLE_JSON in accept or "application/json" in accept
+
+    def _send(self, code: int, body: bytes, content_type: str) -> None:
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_page(self, data: dict[str, Any], page: str) -> None:
+        if self._wants_json():
+            self._send(200, json.dumps(data).encode("utf-8"), SIMPLE_JSON)
+        else:
+            self._send(200, page.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _send_file(self, f: BinaryIO) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+        self.end_headers()
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            self.wfile.write(chunk)
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        path = urllib.parse.unquote(self.path.split("?")[0])
+        parts = [p for p in path.split("/") if p]
+        if parts == ["health"]:
+            return self._send(200, b'{"ok": true}', "application/json")
+        if parts == ["simple"]:
+            projects = self.proxy.store.projects()
+            data = {"meta": {"api-version": "1.0"}, "projects": [{"name": p} for p in projects]}
+            page = "<!DOCTYPE html>\n<html><body>\n" + "\n".join(
+                f'<a href="/simple/{p}/">{p}</a><br/>' for p in projects
+            ) + "\n</body></html>\n"
+            return self._send_page(data, page)
+        if len(parts) == 2 and parts[0] == "simple":
+            project = parts[1]
+            if project != normalize(project):
+                self.send_response(301)
+                self.send_header("Location", f"/simple/{normalize(project)}/")
+                self.end_headers()
+                return
+            entries = self.proxy.project_files(project)
+            if not entries:
+                return self._send(404, b"not found", "text/plain")
+            return self._send_page(render_project_json(project, entries), render_project_html(project, entries))
+        if len(parts) == 3 and parts[0] == "files":
+            with ExitStack() as stack:
+                try:
+                    f = stack.enter_context(self.proxy.open_file(parts[1], parts[2]))
+                except (OSError, ValueError) as e:
+                    return self._send(502, str(e).encode("utf-8"), "text/plain")
+                if f is None:
+                    return self._send(404, b"not found", "text/plain")
+                return self._send_file(f)
+        self._send(404, b"not found", "text/plain")
+
+
+def make_index_server(proxy: IndexProxy, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Create (but do not start) the index HTTP server."""
+    handler = type("BoundIndexHandler", (_IndexHandler,), {"proxy": proxy})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# ---------------------------
+# Discovery
+# ---------------------------
+def _state_path() -> Path:
+    return cache_dir() / STATE_FILENAME
+
+
+def write_server_info(url: str) -> Path:
+    """Advertise a running index to local `reposmith init` runs."""
+    path = _state_path()
+    atomic_write(path, json.dumps({"url": url, "pid": os.getpid()}, indent=2))
+    return path
+
+
+def remove_server_info() -> None:
+    try:
+        info = json.loads(_state_path().read_text(encoding="utf-8"))
+        if info.get("pid") == os.getpid():
+            _state_path().unlink()
+    except (OSError, ValueError):
+        pass
+
+
+def discover_index_url(timeout: float = 0.3) -> Optional[str]:
+    """
+    Return the simple-index URL of a running local index server, if any.
+
+    The advertised server is probed on `/health`, so a stale state file left
+    by a crashed server is ignored.
+    """
+    try:
+        url = json.loads(_state_path().read_text(encoding="utf-8"))["url"].rstrip("/")
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    try:
+        with urllib.request.urlopen(f"{url}/health", timeout=timeout) as resp:
+            if resp.status != 200:
+                return None
+    except (OSError, ValueError):
+        return None
+    return f"{url}/simple/"
+
+
+def index_env(index_url: Optional[str]) -> dict[str, str]:
+    """Environment variables that make pip and uv resolve from `index_url`."""
+    if not index_url:
+        return {}
+    env = {"PIP_INDEX_URL": index_url, "UV_INDEX_URL": index_url}
+    parsed = urllib.parse.urlparse(index_url)
+    if parsed.scheme == "http" and parsed.hostname not in ("localhost", "127.0.0.1", "::1"):
+        env["PIP_TRUSTED_HOST"] = parsed.hostname or ""
+    return env
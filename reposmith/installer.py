@@ -0,0 +1,280 @@
+# reposmith/installer.py
+"""
+One installer engine for every dependency install.
+
+Backends, fastest first:
+  - `uv`        a uv binary on PATH,
+  - `uv-module` uv importable by the running interpreter (`python -m uv`),
+  - `pip`       pip inside the target environment.
+
+uv backends install into any environment with `--python`, so uv is never
+installed per venv. Detection runs once per process; `reset_detection()`
+forgets it (e.g. after installing uv). `benchmark_installers` times each
+available backend on a synthetic requirements set served from a local wheel
+directory, so results do not depend on the network.
+"""
+from __future__ import annotations
+
+import base64
+import functools
+import hashlib
+import importlib.util
+import io
+import json
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .core.runner import command_env, run_command
+from .wheelhouse_utils import wheelhouse_env
+
+INSTALLER_NAMES = ("uv", "uv-module", "pip")
+
+# Never removed by an exact sync through pip.
+_KEEP = {"pip", "setuptools", "wheel", "uv"}
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@dataclass(frozen=True)
+class Installer:
+    """
+    A package installer backend.
+
+    Args:
+        name (str): "uv", "uv-module" or "pip".
+        launcher (tuple[str, ...]): Command that starts uv (empty for pip).
+    """
+
+    name: str
+    launcher: tuple[str, ...] = ()
+
+    @property
+    def is_uv(self) -> bool:
+        return bool(self.launcher)
+
+    @property
+    def kind(self) -> str:
+        """Tool family ("uv" or "pip"), as reported in install statuses."""
+        return "uv" if self.is_uv else "pip"
+
+    def pip_cmd(self, python: str, *args: str) -> list[str]:
+        """A pip-compatible command (`uv pip ...` or `python -m pip ...`) targeting `python`."""
+        if self.is_uv:
+            return [*self.launcher, "pip", *args, "--python", python]
+        return [python, "-m", "pip", *args]
+
+    def install(
+        self,
+        python: str,
+        *,
+        requirements: Optional[str | Path] = None,
+        packages: Sequence[str] = (),
+        cwd: Optional[Path] = None,
+    ) -> None:
+        """Install a requirements file and/or packages into the environment of `python`."""
+        args = ["install"]
+        if requirements is not None:
+            args += ["-r", str(requirements)]
+        args += list(packages)
+        if not self.is_uv:
+            args += ["--upgrade-strategy", "only-if-needed"]
+        run_command(self.pip_cmd(python, *args), cwd=cwd)
+
+    def sync(self, python: str, lock: Path) -> None:
+        """
+        Make the environment match a hashed lock exactly, removing unlisted packages.
+
+        uv uses `uv pip sync`; pip installs with `--require-hashes` and then
+        uninstalls whatever the lock does not list.
+        """
+        if self.is_uv:
+            run_command(self.pip_cmd(python, "sync", str(lock)))
+            return
+        run_command(self.pip_cmd(python, "install", "--require-hashes", "--no-deps", "-r", str(lock)))
+        listed = run_command(
+            self.pip_cmd(python, "list", "--format", "json", "--disable-pip-version-check"),
+            capture=True, stream=False,
+        ).output
+        wanted = _locked_names(lock) | _KEEP
+        stray = [p["name"] for p in json.loads(listed or "[]") if _normalize(p["name"]) not in wanted]
+        if stray:
+            print(f"[lock] Removing packages not in the lock: {', '.join(sorted(stray))}")
+            run_command(self.pip_cmd(python, "uninstall", "-y", *stray))
+
+
+def _locked_names(lock: Path) -> set[str]:
+    names = set()
+    for line in Path(lock).read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith(("#", "-")):
+            m = re.match(r"([A-Za-z0-9][A-Za-z0-9._-]*)", line)
+            if m:
+                names.add(_normalize(m.group(1)))
+    return names
+
+
+# ---------------------------
+# Detection
+# ---------------------------
+@functools.lru_cache(maxsize=1)
+def _detect() -> dict[str, Installer]:
+    found: dict[str, Installer] = {}
+    exe = shutil.which("uv")
+    if exe:
+        found["uv"] = Installer("uv", (exe,))
+    if importlib.util.find_spec("uv") is not None:
+        found["uv-module"] = Installer("uv-module", (sys.executable, "-m", "uv"))
+    found["pip"] = Installer("pip")
+    return found
+
+
+def reset_detection() -> None:
+    """Forget detected backends (call after installing or removing uv)."""
+    _detect.cache_clear()
+
+
+def available_installers() -> list[str]:
+    """Names of usable backends, fastest first."""
+    return [n for n in INSTALLER_NAMES if n in _detect()]
+
+
+def get_installer(preference: str = "auto") -> Installer:
+    """
+    Return the installer for `preference`.
+
+    Args:
+        preference (str): "auto" (fastest available), "uv", "uv-module" or "pip".
+
+    Raises:
+        ValueError: If the name is unknown.
+        RuntimeError: If the requested backend is not available.
+    """
+    found = _detect()
+    if preference == "auto":
+        return found[available_installers()[0]]
+    if preference not in INSTALLER_NAMES:
+        raise ValueError(f"Unknown installer '{preference}'. Available: auto, {', '.join(INSTALLER_NAMES)}")
+    if preference not in found:
+        raise RuntimeError(f"Installer '{preference}' is not available on this machine.")
+    return found[preference]
+
+
+def uv_command() -> Optional[list[str]]:
+    """Launcher for uv project commands (`uv sync`, `uv init`), or None without uv."""
+    found = _detect()
+    for name in ("uv", "uv-module"):
+        if name in found:
+            return list(found[name].launcher)
+    return None
+
+
+# ---------------------------
+# Benchmark
+# ---------------------------
+def _wheel_bytes(name: str, version: str, requires: Sequence[str]) -> bytes:
+    dist = f"{name}-{version}.dist-info"
+    meta = f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+    meta += "".join(f"Requires-Dist: {r}\n" for r in requires)
+    files = {
+        f"{name}/__init__.py": f"NAME = {name!r}\n".encode(),
+        f"{dist}/METADATA": meta.encode(),
+        f"{dist}/WHEEL": b"Wheel-Version: 1.0\nGenerator: reposmith\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = []
+    for path, data in files.items():
+        digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+        record.append(f"{path},sha256={digest},{len(data)}")
+    record.append(f"{dist}/RECORD,,")
+    files[f"{dist}/RECORD"] = ("\n".join(record) + "\n").encode()
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for path, data in files.items():
+            zf.writestr(path, data)
+    return buf.getvalue()
+
+
+def make_fixture_wheels(dest: Path, count: int = 12, prefix: str = "rsbench") -> list[str]:
+    """
+    Write `count` small pure-Python wheels with a dependency chain into `dest`.
+
+    Package i depends on package i+1, so installing the returned top-level
+    names exercises the resolver as well as the installer.
+
+    Returns:
+        list[str]: Requirement names forming the fixture set.
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    names = [f"{prefix}_{i:03d}" for i in range(count)]
+    for i, name in enumerate(names):
+        requires = [f"{names[i + 1]}>=1.0"] if i + 1 < count else []
+        (dest / f"{name}-1.0-py3-none-any.whl").write_bytes(_wheel_bytes(name, "1.0", requires))
+    return names[::3]
+
+
+@dataclass
+class BenchResult:
+    """Timings of one backend."""
+
+    name: str
+    timings: list[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def median(self) -> Optional[float]:
+        return statistics.median(self.timings) if self.timings else None
+
+
+def benchmark_installers(
+    names: Optional[Sequence[str]] = None,
+    *,
+    rounds: int = 3,
+    count: int = 12,
+    python: Optional[str] = None,
+) -> list[BenchResult]:
+    """
+    Time each backend installing a fixture set into fresh virtual environments.
+
+    Wheels come from a temporary local directory with the index disabled.
+    Only the install is timed, not venv creation.
+
+    Args:
+        names (Optional[Sequence[str]]): Backends to compare (default: all available).
+        rounds (int): Fresh-venv installs per backend.
+        count (int): Packages in the fixture set.
+        python (Optional[str]): Base interpreter for the venvs.
+
+    Returns:
+        list[BenchResult]: One result per backend, in the order compared.
+    """
+    python = python or sys.executable
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="reposmith-bench-") as tmp:
+        wheels = Path(tmp) / "wheels"
+        packages = make_fixture_wheels(wheels, count)
+        for name in names or available_installers():
+            res = BenchResult(name)
+            results.append(res)
+            try:
+                installer = get_installer(name)
+                for i in range(rounds):
+                    venv = Path(tmp) / f"venv-{name}-{i}"
+                    run_command([python, "-m", "venv", str(venv)], stream=False)
+                    py = str(venv / ("Scripts/python.exe" if sys.platform == "win32" else "bin/python"))
+                    with command_env(wheelhouse_env(wheels, offline=True)):
+                        t0 = time.perf_counter()
+                        run_command(installer.pip_cmd(py, "install", *packages), stream=False)
+                        res.timings.append(time.perf_counter() - t0)
+            except Exception as e:
+                res.error = str(e).splitlines()[0] if str(e) else type(e).__name__
+    return results
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import sysconfig
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .core.fs import atomic_write
+from .core.runner import run_command
+from .utils.paths import cache_dir
+
+CACHE_FILENAME = "interpreters.json"
+CACHE_VERSION = 1
+
+_EXE_RE = re.compile(r"^(python|pypy)(\d+(?:\.\d+)?)?(t)?(\.exe)?$", re.IGNORECASE)
+_VERSION_RE = re.compile(r"(\d+)\.(\d+)(?:\.(\d+))?")
+_PATCHLEVEL_RE = re.compile(r'#define\s+PY_VERSION\s+"([^"]+)"')
+
+
+@dataclass(frozen=True)
+class Interpreter:
+    """A Python interpreter found on this machine."""
+
+    path: str
+    version: str  # "3.12.3", or "3.12" when the patch level is unknown
+    implementation: str = "cpython"
+    freethreaded: bool = False
+    source: str = "path"  # "path" | "pyenv" | "uv" | "prefix"
+
+    @property
+    def version_tuple(self) -> tuple[int, ...]:
+        return tuple(int(x) for x in self.version.split(".") if x.isdigit())
+
+    @property
+    def abi(self) -> str:
+        """ABI tag such as "cp312" or "cp313t"."""
+        major, minor = (self.version_tuple + (0, 0))[:2]
+        prefix = "pp" if self.implementation == "pypy" else "cp"
+        return f"{prefix}{major}{minor}{'t' if self.freethreaded else ''}"
+
+
+# ---------------------------
+# Where to look
+# ---------------------------
+def _pyenv_versions_dir() -> Path:
+    root = Path(os.environ.get("PYENV_ROOT") or Path.home() / ".pyenv")
+    win = root / "pyenv-win" / "versions"
+    return win if win.is_dir() else root / "versions"
+
+
+def _uv_python_dir() -> Path:
+    override = os.environ.get("UV_PYTHON_INSTALL_DIR")
+    if override:
+        return Path(override)
+    if os.name == "nt":
+        return Path(os.environ.get("APPDATA") or Path.home()) / "uv" / "python"
+    data = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+    return Path(data) / "uv" / "python"
+
+
+def _common_prefix_dirs() -> list[Path]:
+    if os.name == "nt":
+        bases = [Path(os.environ.get("LOCALAPPDATA", "")) / "Programs" / "Python", Path("C:/")]
+        out: list[Path] = []
+        for base in bases:
+            if base.is_dir():
+                out += [p for p in base.glob("Python3*") if p.is_dir()]
+        return out
+    return [Path(p) for p in ("/usr/bin", "/usr/local/bin", "/opt/homebrew/bin", "/opt/local/bin")]
+
+
+def _version_roots() -> list[tuple[Path, str]]:
+    """Directories whose children are per-version installs, with their source label."""
+    return [(_pyenv_versions_dir(), "pyenv"), (_uv_python_dir(), "uv")]
+
+
+def _bin_dir(install: Path) -> Path:
+    return install if os.name == "nt" else install / "bin"
+
+
+def _scan_dirs() -> list[tuple[Path, str]]:
+    """All directories to scan for executables, labelled by source."""
+    dirs: list[tuple[Path, str]] = []
+    for entry in os.environ.get("PATH", "").split(os.pathsep):
+        # pyenv shims are wrapper scripts; the real installs are scanned below.
+        if entry and Path(entry).name != "shims":
+            dirs.append((Path(entry), "path"))
+    for root, label in _version_roots():
+        if root.is_dir():
+            for child in sorted(root.iterdir()):
+                if child.is_dir():
+                    dirs.append((_bin_dir(child), label))
+    dirs += [(d, "prefix") for d in _common_prefix_dirs()]
+    seen: set[str] = set()
+    unique: list[tuple[Path, str]] = []
+    for d, label in dirs:
+        key = os.path.normcase(str(d))
+        if key not in seen and d.is_dir():
+            seen.add(key)
+            unique.append((d, label))
+    return unique
+
+
+def _dir_mtimes(dirs: Iterable[Path]) -> dict[str, int]:
+    out: dict[str, int] = {}
+    for d in dirs:
+        try:
+            out[str(d)] = os.stat(d).st_mtime_ns
+        except OSError:
+            out[str(d)] = -1
+    return out
+
+
+# ---------------------------
+# Reading versions without spawning
+# ---------------------------
+def _version_from_pyvenv_cfg(exe: Path) -> Optional[str]:
+    for cfg in (exe.parent / "pyvenv.cfg", exe.parent.parent / "pyvenv.cfg"):
+        if cfg.is_file():
+            for line in cfg.read_text(encoding="utf-8", errors="ignore").splitlines():
+                key, _, value = line.partition("=")
+                if key.strip() in ("version", "version_info"):
+                    m = _VERSION_RE.search(value)
+                    if m:
+                        return m.group(0)
+    return None
+
+
+def _minor(version: str) -> str:
+    return ".".join(version.split(".")[:2])
+
+
+def _version_from_patchlevel(exe: Path, expected: Optional[str] = None) -> Optional[str]:
+    """
+    Full version from `<prefix>/include/python3*/patchlevel.h`.
+
+    A shared prefix can hold headers of another Python than `exe`, so a header
+    only counts if its major.minor equals `expected`.
+    """
+    if expected is None:
+        return None
+    prefix = exe.parent if os.name == "nt" else exe.parent.parent
+    candidates = list((prefix / "include").glob("python3*/patchlevel.h")) + [prefix / "include" / "patchlevel.h"]
+    for header in candidates:
+        if header.is_file():
+            m = _PATCHLEVEL_RE.search(header.read_text(encoding="utf-8", errors="ignore"))
+            if m:
+                v = _VERSION_RE.match(m.group(1))
+                if v and _minor(v.group(0)) == expected:
+                    return v.group(0)
+    return None
+
+
+def _version_from_install_dir(exe: Path) -> Optional[str]:
+    install = exe.parent if os.name == "nt" else exe.parent.parent
+    m = _VERSION_RE.search(install.name)
+    return m.group(0) if m else None
+
+
+def _version_from_lib_dir(exe: Path) -> Optional[str]:
+    prefix = exe.parent.parent
+    found = sorted((prefix / "lib").glob("python3.*/os.py")) if (prefix / "lib").is_dir() else []
+    if len(found) == 1:
+        return found[0].parent.name.replace("python", "")
+    return None
+
+
+def _version_from_name(exe: Path) -> Optional[str]:
+    for name in (exe.name, Path(os.path.realpath(exe)).name):
+        m = _EXE_RE.match(name)
+        if m and m.group(2) and "." in m.group(2):
+            return m.group(2)
+    return None
+
+
+def _static_version(exe: Path, source: str) -> Optional[str]:
+    # A versioned executable name (python3.12) is trusted first; anything read
+    # from the surrounding prefix must agree with it (or with lib/pythonX.Y).
+    named = _version_from_name(exe) or _version_from_lib_dir(exe)
+    expected = _minor(named) if named else None
+    readers = [_version_from_pyvenv_cfg, lambda e: _version_from_patchlevel(e, expected)]
+    if source in ("pyenv", "uv"):
+        readers.append(_version_from_install_dir)
+    readers += [_version_from_lib_dir, _version_from_name]
+    best: Optional[str] = None
+    for read in readers:
+        v = read(exe)
+        if v and expected and _minor(v) != expected:
+            continue
+        if v and (best is None or v.count(".") > best.count(".")):
+            best = v
+            if best.count(".") >= 2:
+                break
+    return best
+
+
+def _spawn_version(exe: str) -> Optional[str]:
+    try:
+        res = run_command(
+            [exe, "-c", "import sys; print('%d.%d.%d' % sys.version_info[:3])"],
+            check=False, capture=True, stream=False, timeout=10,
+        )
+    except Exception:
+        return None
+    out = res.output.strip()
+    return out if res.returncode == 0 and _VERSION_RE.fullmatch(out) else None
+
+
+def _is_freethreaded(exe: Path) -> bool:
+    for name in (exe.name, Path(os.path.realpath(exe)).name):
+        m = _EXE_RE.match(name)
+        if m and m.group(3):
+            return True
+    install = exe.parent if os.name == "nt" else exe.parent.parent
+    return "freethreaded" in install.name or re.search(r"\d+\.\d+(\.\d+)?t$", install.name) is not None
+
+
+def _candidates(dirs: list[tuple[Path, str]]) -> list[tuple[Path, str]]:
+    seen: set[str] = set()
+    out: list[tuple[Path, str]] = []
+    for d, label in dirs:
+        try:
+            entries = list(os.scandir(d))
+        except OSError:
+            continue
+        for e in entries:
+            if not _EXE_RE.match(e.name):
+                continue
+            try:
+                if not e.is_file() or not os.access(e.path, os.X_OK):
+                    continue
+            except OSError:
+                continue
+            real = os.path.normcase(os.path.realpath(e.path))
+            if real in seen:
+                continue
+            seen.add(real)
+            out.append((Path(e.path), label))
+    return out
+
+
+def _scan(dirs: list[tuple[Path, str]], allow_spawn: bool) -> list[Interpreter]:
+    found: list[Interpreter] = []
+    unknown: list[tuple[Path, str]] = []
+    for exe, label in _candidates(dirs):
+        impl = "pypy" if "pypy" in exe.name.lower() else "cpython"
+        version = _static_version(exe, label)
+        if version is None or version.count(".") < 1:
+            unknown.append((exe, label))
+            continue
+        found.append(Interpreter(str(exe), version, impl, _is_freethreaded(exe), label))
+    if allow_spawn and unknown:
+        with ThreadPoolExecutor(max_workers=min(8, len(unknown))) as pool:
+            versions = list(pool.map(lambda c: _spawn_version(str(c[0])), unknown))
+        for (exe, label), version in zip(unknown, versions):
+            if version:
+                impl = "pypy" if "pypy" in exe.name.lower() else "cpython"
+                found.append(Interpreter(str(exe), version, impl, _is_freethreaded(exe), label))
+    found.sort(key=lambda i: i.version_tuple, reverse=True)
+    return found
+
+
+# ---------------------------
+# Public API
+# ---------------------------
+def discover_interpreters(
+    *, refresh: bool = False, allow_spawn: bool = True, cache_path: Optional[Path] = None
+) -> list[Interpreter]:
+    """
+    Find every local Python interpreter, using a cache when nothing changed.
+
+    Scans PATH, pyenv versions, uv-managed Pythons and common install
+    prefixes. Versions come from `pyvenv.cfg`, `patchlevel.h`, install
+    directory names or the binary name; an interpreter is only spawned when
+    none of those identify it. The cache is invalidated when the mtime of any
+    scanned directory changes (an install or removal).
+
+    Args:
+        refresh (bool): Ignore the cache and rescan.
+        allow_spawn (bool): Spawn interpreters whose version cannot be read statically.
+        cache_path (Optional[Path]): Override the cache file location.
+
+    Returns:
+        list[Interpreter]: Interpreters sorted by version, newest first.
+    """
+    cache_path = cache_path or cache_dir() / CACHE_FILENAME
+    dirs = _scan_dirs()
+    roots = [r for r, _ in _version_roots() if r.is_dir()]
+    mtimes = _dir_mtimes([d for d, _ in dirs] + roots)
+
+    if not refresh and cache_path.is_file():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("version") == CACHE_VERSION and cached.get("dirs") == mtimes:
+                return [Interpreter(**i) for i in cached["interpreters"]]
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+
+    found = _scan(dirs, allow_spawn)
+    payload = {"version": CACHE_VERSION, "dirs": mtimes, "interpreters": [asdict(i) for i in found]}
+    try:
+        atomic_write(cache_path, json.dumps(payload, indent=2))
+    except OSError:
+        pass
+    return found
+
+
+def find_interpreter(version: str, **kwargs) -> Optional[Interpreter]:
+    """
+    Return the newest discovered interpreter matching a version prefix.
+
+    Args:
+        version (str): e.g. "3.13", "3.12.4" or "3.13t" for free-threaded builds.
+
+    Returns:
+        Optional[Interpreter]: The best match, or None.
+    """
+    want_ft = version.endswith("t")
+    try:
+        parts = tuple(int(x) for x in version.rstrip("t").split("."))
+    except ValueError:
+        return None
+    for interp in discover_interpreters(**kwargs):
+        if interp.freethreaded == want_ft and interp.version_tuple[: len(parts)] == parts:
+            return interp
+    return None
+
+
+def current_interpreter() -> Interpreter:
+    """Describe the running interpreter (no discovery needed)."""
+    impl = "pypy" if sys.implementation.name == "pypy" else "cpython"
+    ft = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    return Interpreter(sys.executable, "%d.%d.%d" % sys.version_info[:3], impl, ft, "current")
@@ -0,0 +1,224 @@
+# reposmith/lock_utils.py
+"""
+Hashed lockfiles for reproducible installs.
+
+`compile_lock` resolves requirements.txt (or the `[project].dependencies` of
+pyproject.toml) into `requirements.lock` with `--hash` pins. The lock header
+records a hash of the inputs and the target Python version, so the slow
+resolution only runs again when one of them changes. Like
+`pip-compile --generate-hashes`, every pin lists the hashes of all release
+files of its version (other platforms' wheels, the sdist), so the lock
+installs with `--require-hashes` everywhere; a pin without any hash is an
+error. `sync_lock` then makes the environment match the lock exactly,
+removing packages it does not list.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Mapping, Optional
+
+from .core.dists import pyproject_dependencies
+from .core.fs import atomic_write
+from .core.runner import current_command_env, run_command
+from .index_server import _ACCEPT, DEFAULT_UPSTREAM, normalize, parse_simple_page
+from .installer import Installer, get_installer
+from .wheelhouse_utils import pins_from_report
+
+LOCK_FILENAME = "requirements.lock"
+_HEADER_RE = re.compile(r"^# reposmith-lock: inputs=(\w+) python=([\d.]+)\s*$", re.MULTILINE)
+_SDIST_SUFFIXES = (".tar.gz", ".zip", ".tar.bz2", ".tgz")
+_FALSY = ("", "0", "false", "no", "off")
+
+
+def lock_inputs(root: Path) -> tuple[Optional[Path], list[str]]:
+    """
+    Pick what to lock: a non-empty requirements.txt, else pyproject dependencies.
+
+    Returns:
+        tuple[Optional[Path], list[str]]: The input file (None if nothing to
+        lock) and, for pyproject, its dependency list.
+    """
+    req = root / "requirements.txt"
+    if req.is_file() and req.stat().st_size > 0:
+        return req, []
+    pyproject = root / "pyproject.toml"
+    deps = pyproject_dependencies(pyproject) if pyproject.is_file() else []
+    return (pyproject, deps) if deps else (None, [])
+
+
+def _python_version(python: str) -> str:
+    out = run_command(
+        [python, "-c", "import sys; print('%d.%d' % sys.version_info[:2])"], capture=True, stream=False
+    ).output
+    return out.strip()
+
+
+def inputs_hash(source: Path, deps: list[str]) -> str:
+    """Content hash of the lock inputs (only the dependency list for pyproject)."""
+    data = json.dumps(deps).encode("utf-8") if deps else source.read_bytes()
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def read_lock_header(lock: Path) -> Optional[tuple[str, str]]:
+    """Return (inputs hash, python version) recorded in a lock, or None."""
+    try:
+        m = _HEADER_RE.search(lock.read_text(encoding="utf-8"))
+    except OSError:
+        return None
+    return (m.group(1), m.group(2)) if m else None
+
+
+def _compile_with_uv(installer: Installer, python: str, source: Path, out: Path) -> str:
+    run_command(
+        installer.pip_cmd(python, "compile", str(source), "--generate-hashes", "--quiet", "-o", str(out)),
+        stream=False,
+    )
+    return out.read_text(encoding="utf-8")
+
+
+def release_of(filename: str) -> Optional[tuple[str, str]]:
+    """`(normalized name, version)` of a wheel or sdist filename, else None."""
+    if filename.endswith(".whl"):
+        parts = filename[:-4].split("-")
+        return (normalize(parts[0]), parts[1]) if len(parts) >= 5 else None
+    for suffix in _SDIST_SUFFIXES:
+        if filename.endswith(suffix):
+            name, _, version = filename[: -len(suffix)].rpartition("-")
+            return (normalize(name), version) if name else None
+    return None
+
+
+def _file_sha256(path: Path) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.file_digest(fh, "sha256").hexdigest()
+
+
+def release_hashes(name: str, version: str, env: Optional[Mapping[str, str]] = None) -> set[str]:
+    """
+    sha256 of every file released for `name==version`.
+
+    Reads the simple pages of the indexes pip is configured with
+    (PIP_INDEX_URL, PIP_EXTRA_INDEX_URL, unless PIP_NO_INDEX) and hashes
+    matching files in PIP_FIND_LINKS directories.
+    """
+    env = {**os.environ, **current_command_env()} if env is None else env
+    wanted = (normalize(name), version)
+    hashes: set[str] = set()
+    indexes: list[str] = []
+    if env.get("PIP_NO_INDEX", "").lower() in _FALSY:
+        indexes = [env.get("PIP_INDEX_URL") or DEFAULT_UPSTREAM] + env.get("PIP_EXTRA_INDEX_URL", "").split()
+    for index in indexes:
+        url = f"{index.rstrip('/')}/{urllib.parse.quote(wanted[0])}/"
+        try:
+            req = urllib.request.Request(url, headers={"Accept": _ACCEPT})
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                entries = parse_simple_page(resp.read(), resp.headers.get("Content-Type", ""), resp.geturl())
+        except (OSError, ValueError):
+            continue
+        hashes.update(e.sha256 for e in entries if e.sha256 and release_of(e.filename) == wanted)
+    for link in env.get("PIP_FIND_LINKS", "").split():
+        folder = Path(link.removeprefix("file://"))
+        if folder.is_dir():
+            hashes.update(_file_sha256(f) for f in folder.iterdir() if release_of(f.name) == wanted)
+    return hashes
+
+
+def _compile_with_pip(python: str, source: Path, deps: list[str], tmp: Path) -> str:
+    report = tmp / "report.json"
+    cmd = [python, "-m", "pip", "install", "--dry-run", "--ignore-installed", "--quiet", "--report", str(report)]
+    cmd += deps if deps else ["-r", str(source)]
+    run_command(cmd, stream=False)
+    data = json.loads(report.read_text(encoding="utf-8"))
+    items = list(zip(data.get("install", []), pins_from_report(data)))
+    env = {**os.environ, **current_command_env()}
+
+    def hashes(item: dict) -> set[str]:
+        found = set()
+        digest = ((item.get("download_info") or {}).get("archive_info") or {}).get("hashes", {}).get("sha256")
+        if digest:
+            found.add(digest)
+        meta = item.get("metadata") or {}
+        if not item.get("is_direct") and meta.get("name"):
+            found |= release_hashes(meta["name"], meta["version"], env)
+        return found
+
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(items))), thread_name_prefix="reposmith-lock") as pool:
+        digests = list(pool.map(lambda pair: hashes(pair[0]), items))
+    lines = []
+    for (_, pin), found in zip(items, digests):
+        if not found:
+            raise ValueError(f"No sha256 hash available for {pin}; cannot write a hash-checking lock")
+        lines.append(" \\\n    ".join([pin] + [f"--hash=sha256:{d}" for d in sorted(found)]))
+    return "\n".join(sorted(lines, key=str.lower)) + "\n"
+
+
+def compile_lock(
+    root: Path, python: str, *, force: bool = False, installer: Optional[Installer] = None
+) -> tuple[str, Optional[Path]]:
+    """
+    Write `requirements.lock` unless an up-to-date one exists.
+
+    Uses `uv pip compile --generate-hashes` when uv is available, otherwise
+    pip's resolver report plus the index's hashes for every release file.
+
+    Args:
+        root (Path): Project root.
+        python (str): Interpreter the lock targets.
+        force (bool): Recompile even if the inputs are unchanged.
+        installer (Optional[Installer]): Backend to use (default: fastest available).
+
+    Returns:
+        tuple[str, Optional[Path]]: ("written" | "exists" | "skipped", lock path).
+
+    Raises:
+        ValueError: If no hash can be found for a pinned requirement (pip path).
+    """
+    root = Path(root)
+    source, deps = lock_inputs(root)
+    if source is None:
+        print("[lock] No requirements.txt or pyproject dependencies — nothing to lock.")
+        return "skipped", None
+    lock = root / LOCK_FILENAME
+    digest = inputs_hash(source, deps)
+    version = _python_version(python)
+    if not force and read_lock_header(lock) == (digest, version):
+        print(f"[lock] {LOCK_FILENAME} is up to date ✅")
+        return "exists", lock
+
+    print(f"[lock] Resolving {source.name} → {LOCK_FILENAME} ...")
+    installer = installer or get_installer()
+    with tempfile.TemporaryDirectory(prefix="reposmith-lock-") as tmp:
+        if installer.is_uv:
+            body = _compile_with_uv(installer, python, source, Path(tmp) / LOCK_FILENAME)
+        else:
+            body = _compile_with_pip(python, source, deps, Path(tmp))
+    header = (
+        f"# reposmith-lock: inputs={digest} python={version}\n"
+        f"# Generated from {source.name}; install with `uv pip sync {LOCK_FILENAME}`.\n"
+    )
+    atomic_write(lock, header + body)
+    return "written", lock
+
+
+def sync_lock(python: str, lock: Path, installer: Optional[Installer] = None) -> str:
+    """
+    Make the environment of `python` match `lock` exactly.
+
+    uv: `uv pip sync` (installs, upgrades and removes). pip fallback: a
+    hash-checked install followed by uninstalling unlisted packages.
+
+    Returns:
+        str: "written(uv)" or "written(pip)".
+    """
+    installer = installer or get_installer()
+    installer.sync(python, lock)
+    return f"written({installer.kind})"
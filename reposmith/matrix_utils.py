@@ -0,0 +1,138 @@
+# reposmith/matrix_utils.py
+"""
+Multi-interpreter ("matrix") virtual environments.
+
+`reposmith init --pythons 3.12,3.13` creates one `.venv-X.Y` per version and
+installs the project's requirements into each. Environments are built
+concurrently (each worker drives its own command loop) and every installer
+points at one shared wheel cache, so a wheel built for the first interpreter
+is reused by the others instead of being downloaded again.
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from .core.runner import command_env, current_command_env
+from .gc_utils import restore_collected
+from .utils.paths import cache_dir
+from .venv_utils import _venv_python, create_virtualenv, install_requirements
+
+MATRIX_PREFIX = ".venv-"
+
+
+@dataclass
+class MatrixEnv:
+    """Outcome of building one matrix environment."""
+
+    version: str
+    venv_dir: Path
+    status: str = "pending"  # "written" | "exists" | "failed"
+    installed: str = "skipped"
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+def parse_pythons(text: str) -> tuple[str, ...]:
+    """
+    Split a comma-separated version list, dropping blanks and duplicates.
+
+    Raises:
+        ValueError: If an entry is not a version such as "3.12" or "3.13t".
+    """
+    out: list[str] = []
+    for part in text.split(","):
+        v = part.strip()
+        if not v:
+            continue
+        if not all(x.isdigit() for x in v.rstrip("t").split(".")):
+            raise ValueError(f"Invalid Python version '{v}' (expected e.g. 3.12 or 3.13t)")
+        if v not in out:
+            out.append(v)
+    return tuple(out)
+
+
+def matrix_venv_dir(root: Path, version: str) -> Path:
+    """Return `<root>/.venv-<version>`."""
+    return Path(root) / f"{MATRIX_PREFIX}{version}"
+
+
+def wheel_cache_env() -> dict[str, str]:
+    """
+    Environment pointing pip and uv at the shared wheel cache.
+
+    Variables already set by the user or an enclosing `command_env` (such
+    as a shared fleet cache) win, so an existing cache setup is kept.
+    """
+    base = cache_dir() / "wheels"
+    scoped = current_command_env()
+    env: dict[str, str] = {}
+    for var, sub in (("PIP_CACHE_DIR", "pip"), ("UV_CACHE_DIR", "uv")):
+        env[var] = scoped.get(var) or os.environ.get(var) or str(base / sub)
+    return env
+
+
+def _build_one(root: Path, version: str, backend: str, requirements: Optional[Path], install: bool) -> MatrixEnv:
+    env = MatrixEnv(version, matrix_venv_dir(root, version))
+    try:
+        with command_env(wheel_cache_env()):
+            env.status = create_virtualenv(env.venv_dir, version, backend=backend)
+            if env.status == "written":
+                restore_collected(env.venv_dir)
+            if install:
+                env.installed = install_requirements(root, requirements, python=_venv_python(env.venv_dir))
+    except Exception as e:
+        env.status, env.error = "failed", str(e)
+    return env
+
+
+def create_matrix_venvs(
+    root: Path,
+    versions: Sequence[str],
+    *,
+    backend: str = "auto",
+    requirements: Optional[Path] = None,
+    install: bool = True,
+    jobs: Optional[int] = None,
+) -> list[MatrixEnv]:
+    """
+    Create `.venv-<version>` for every version and install requirements into each.
+
+    Failures are reported per environment; one broken interpreter does not
+    stop the others.
+
+    Args:
+        root (Path): Project root.
+        versions (Sequence[str]): Versions such as ("3.12", "3.13").
+        backend (str): venv backend, as for `create_virtualenv`.
+        requirements (Optional[Path]): Requirements file (default: root/requirements.txt).
+        install (bool): Install requirements after creating each environment.
+        jobs (Optional[int]): Environments built at once (default: all of them).
+
+    Returns:
+        list[MatrixEnv]: One result per version, in the order given.
+    """
+    root = Path(root)
+    if not versions:
+        return []
+    workers = max(1, min(jobs or len(versions), len(versions)))
+    print(f"\n[matrix] Building {len(versions)} environment(s): {', '.join(versions)}")
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-matrix") as pool:
+        # One context copy per task keeps the caller's deadline in every worker.
+        futures = [
+            pool.submit(contextvars.copy_context().run, _build_one, root, v, backend, requirements, install)
+            for v in versions
+        ]
+        results = [f.result() for f in futures]
+    for env in results:
+        mark = "✓" if env.ok else "✗"
+        print(f"  {mark} {env.venv_dir.name}: {env.status}" + (f" ({env.error})" if env.error else ""))
+    return results
+
@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+"""
+Warm worker service behind `reposmith serve`.
+
+Jobs (init, doctor, env-info) arrive as JSON over localhost HTTP or a Unix
+socket, run on a bounded thread pool inside one long-lived interpreter, and
+stream progress back as newline-delimited JSON events. Every job is persisted
+under the state directory so queued or interrupted work resumes on restart.
+Finished jobs are kept for a retention period (and up to a count), then their
+records are deleted.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socketserver
+import stat
+import threading
+import typing
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from .api import ProjectSpec, StepResult, init_project
+from .commands.doctor_cmd import run_doctor
+from .core.fs import atomic_write
+from .snapshot_utils import write_snapshot
+from .venv_utils import create_env_info
+
+JOB_KINDS = ("init", "doctor", "env-info")
+TERMINAL = ("done", "failed")
+DEFAULT_KEEP_FINISHED = 7 * 86400.0
+DEFAULT_MAX_FINISHED = 500
+
+
+@dataclass
+class Job:
+    """A unit of work plus its progress events."""
+
+    kind: str
+    params: dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"  # "queued" | "running" | "done" | "failed"
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    events: list[dict[str, Any]] = field(default_factory=list)
+    result: Optional[dict[str, Any]] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created": self.created,
+            "finished": self.finished,
+            "events": self.events,
+            "result": self.result,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> "Job":
+        return cls(
+            kind=d["kind"],
+            params=d.get("params") or {},
+            id=d["id"],
+            status=d.get("status", "queued"),
+            created=d.get("created", time.time()),
+            finished=d.get("finished"),
+            events=d.get("events") or [],
+            result=d.get("result"),
+        )
+
+
+class _EventLogHandler(logging.Handler):
+    """Forward log records of a job's logger as `log` events."""
+
+    def __init__(self, emit_event: Callable[[dict[str, Any]], None]) -> None:
+        super().__init__()
+        self._emit_event = emit_event
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._emit_event({"type": "log", "level": record.levelname, "message": record.getMessage()})
+        except Exception:
+            self.handleError(record)
+
+
+def _coerce(name: str, hint: Any, value: Any) -> Any:
+    """Convert a JSON value to the annotated `ProjectSpec` field type."""
+    args = [a for a in typing.get_args(hint) if a is not type(None)]
+    if typing.get_origin(hint) is typing.Union:
+        return None if value is None else _coerce(name, args[0], value)
+    origin = typing.get_origin(hint) or hint
+    try:
+        if origin is tuple:
+            if isinstance(value, (str, dict)):
+                raise TypeError
+            return tuple(_coerce(name, args[0], v) for v in value)
+        if origin is dict:
+            return {str(k): _coerce(name, args[1], v) for k, v in dict(value).items()}
+        if origin is Path:
+            if not isinstance(value, str):
+                raise TypeError
+            return Path(value)
+        if origin is bool:
+            if not isinstance(value, bool):
+                raise TypeError
+            return value
+        if origin is float:
+            if isinstance(value, bool):
+                raise TypeError
+            return float(value)
+        if origin is str:
+            if not isinstance(value, str):
+                raise TypeError
+            return value
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value for init parameter '{name}': {value!r}") from None
+    return value
+
+
+def _spec_from_params(params: dict[str, Any]) -> ProjectSpec:
+    known = {f.name for f in fields(ProjectSpec)}
+    unknown = set(params) - known
+    if unknown:
+        raise ValueError(f"Unknown init parameters: {', '.join(sorted(unknown))}")
+    if "root" not in params:
+        raise ValueError("init jobs require a 'root' parameter")
+    hints = typing.get_type_hints(ProjectSpec)
+    return ProjectSpec(**{k: _coerce(k, hints[k], v) for k, v in params.items()})
+
+
+def _step_event(step: StepResult) -> dict[str, Any]:
+    return {
+        "type": "step",
+        "name": step.name,
+        "status": step.status,
+        "duration": round(step.duration, 4),
+        "paths": [str(p) for p in step.paths],
+        "error": step.error,
+    }
+
+
+class JobService:
+    """
+    Persistent job queue executed by a bounded worker pool.
+
+    Args:
+        state_dir (Path): Where job records are stored (one JSON file per job).
+        workers (int): Maximum number of jobs running at once.
+        keep_finished (float): Seconds a finished job stays queryable.
+        max_finished (int): Finished jobs kept at most (newest first).
+    """
+
+    def __init__(
+        self,
+        state_dir: Path,
+        workers: int = 4,
+        keep_finished: float = DEFAULT_KEEP_FINISHED,
+        max_finished: int = DEFAULT_MAX_FINISHED,
+    ) -> None:
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.keep_finished = keep_finished
+        self.max_finished = max(0, max_finished)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="reposmith-job")
+        self._jobs: dict[str, Job] = {}
+        self._cond = threading.Condition()
+
+    # ---- persistence ----
+    def _path(self, job: Job) -> Path:
+        return self.state_dir / f"{job.id}.json"
+
+    def _save(self, job: Job) -> None:
+        with self._cond:
+            data = json.dumps(job.to_dict(), indent=2)
+        atomic_write(self._path(job), data)
+
+    def resume(self) -> list[Job]:
+        """
+        Reload persisted jobs and requeue those that never finished.
+
+        Returns:
+            list[Job]: Jobs that were queued again.
+        """
+        resumed: list[Job] = []
+        for p in sorted(self.state_dir.glob("*.json")):
+            try:
+                job = Job.from_dict(json.loads(p.read_text(encoding="utf-8")))
+            except (OSError, ValueError, KeyError):
+                continue
+            with self._cond:
+                self._jobs[job.id] = job
+            if job.status not in TERMINAL:
+                job.status = "queued"
+                job.events.append({"type": "status", "status": "queued", "resumed": True})
+                self._save(job)
+                self._pool.submit(self._execute, job)
+                resumed.append(job)
+        self.prune()
+        return resumed
+
+    def prune(self, now: Optional[float] = None) -> list[str]:
+        """
+        Forget finished jobs older than `keep_finished` or beyond `max_finished`.
+
+        Returns:
+            list[str]: Ids of the removed jobs.
+        """
+        now = time.time() if now is None else now
+        with self._cond:
+            finished = sorted(
+                (j for j in self._jobs.values() if j.status in TERMINAL),
+                key=lambda j: j.finished or j.created,
+                reverse=True,
+            )
+            expired = [
+                j for i, j in enumerate(finished)
+                if i >= self.max_finished or now - (j.finished or j.created) > self.keep_finished
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            try:
+                self._path(job).unlink()
+            except FileNotFoundError:
+                pass
+        return [j.id for j in expired]
+
+    # ---- queue ----
+    def submit(self, kind: str, params: Optional[dict[str, Any]] = None) -> Job:
+        """
+        Validate, persist and enqueue a job.
+
+        Raises:
+            ValueError: If the job kind is unknown.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}'. Available: {', '.join(JOB_KINDS)}")
+        job = Job(kind=kind, params=dict(params or {}))
+        job.events.append({"type": "status", "status": "queued"})
+        with self._cond:
+            self._jobs[job.id] = job
+        self._save(job)
+        self._pool.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def events(self, job: Job, start: int = 0) -> Iterator[dict[str, Any]]:
+        """Yield the job's events as they are produced, until it finishes."""
+        i = start
+        while True:
+            with self._cond:
+                while i >= len(job.events) and job.status not in TERMINAL:
+                    self._cond.wait(timeout=1.0)
+                pending = job.events[i:]
+                done = job.status in TERMINAL
+            yield from pending
+            i += len(pending)
+            if done and i >= len(job.events):
+                return
+
+    def _emit(self, job: Job, event: dict[str, Any]) -> None:
+        with self._cond:
+            job.events.append(event)
+            self._cond.notify_all()
+
+    def _set_status(self, job: Job, status: str, **extra: Any) -> None:
+        with self._cond:
+            job.status = status
+            if status in TERMINAL:
+                job.finished = time.time()
+            job.events.append({"type": "status", "status": status, **extra})
+            self._cond.notify_all()
+        self._save(job)
+
+    # ---- execution ----
+    def _execute(self, job: Job) -> None:
+        self._set_status(job, "running")
+        logger = logging.getLogger(f"reposmith.job.{job.id}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = _EventLogHandler(lambda ev: self._emit(job, ev))
+        logger.addHandler(handler)
+        try:
+            job.result = self._run(job, logger)
+            failed = not job.result.get("ok", True)
+            self._set_status(job, "failed" if failed else "done")
+        except Exception as e:
+            job.result = {"ok": False, "error": str(e)}
+            self._set_status(job, "failed", error=str(e))
+        finally:
+            logger.removeHandler(handler)
+            logging.Logger.manager.loggerDict.pop(logger.name, None)
+        self.prune()
+
+    def _run(self, job: Job, logger: logging.Logger) -> dict[str, Any]:
+        params = job.params
+        if job.kind == "init":
+            spec = _spec_from_params(params)
+            result = init_project(spec, logger, on_step=lambda s: self._emit(job, _step_event(s)))
+            return {
+                "ok": result.completed,
+                "duration": round(result.duration, 4),
+                "written": [str(p) for p in result.written_paths],
+            }
+        root = Path(params.get("root") or ".")
+        if job.kind == "doctor":
+            rc = run_doctor(logger, root)
+            return {"ok": rc == 0, "returncode": rc}
+        # env-info
+        create_env_info(root / ".venv")
+        snapshot = write_snapshot(root / ".venv")
+        return {"ok": True, "path": str(root / "env-info.txt"), "snapshot": str(snapshot)}
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+# ---------------------------
+# Transports
+# ---------------------------
+def _parse_request(raw: bytes) -> tuple[str, dict[str, Any]]:
+    data = json.loads(raw.decode("utf-8") or "{}")
+    if not isinstance(data, dict):
+        raise ValueError("Job request must be a JSON object")
+    return str(data.get("kind", "")), dict(data.get("params") or {})
+
+
+def _ndjson(event: dict[str, Any]) -> bytes:
+    return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class _HTTPHandler(BaseHTTPRequestHandler):
+    service: JobService  # set on the subclass created by make_http_server
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        pass
+
+    def _send_json(self, code: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, job: Job) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("X-Job-Id", job.id)
+        self.end_headers()
+        for event in self.service.events(job):
+            self.wfile.write(_ndjson({"job": job.id, **event}))
+            self.wfile.flush()
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        if parts == ["health"]:
+            return self._send_json(200, {"ok": True})
+        if len(parts) >= 2 and parts[0] == "jobs":
+            job = self.service.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "unknown job"})
+            if len(parts) == 3 and parts[2] == "events":
+                return self._stream(job)
+            return self._send_json(200, job.to_dict())
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        path, _, query = self.path.partition("?")
+        if path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            kind, params = _parse_request(self.rfile.read(length))
+            job = self.service.submit(kind, params)
+        except ValueError as e:
+            return self._send_json(400, {"error": str(e)})
+        if "stream=0" in query:
+            return self._send_json(202, {"id": job.id, "status": job.status})
+        self._stream(job)
+
+
+def make_http_server(service: JobService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """Create (but do not start) the localhost HTTP front end."""
+    handler = type("BoundHTTPHandler", (_HTTPHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    """One JSON job per connection; the reply is the NDJSON event stream."""
+
+    service: JobService
+
+    def handle(self) -> None:
+        try:
+            kind, params = _parse_request(self.rfile.readline())
+            job = self.service.submit(kind, params)
+        except ValueError as e:
+            self.wfile.write(_ndjson({"type": "error", "error": str(e)}))
+            return
+        for event in self.service.events(job):
+            self.wfile.write(_ndjson({"job": job.id, **event}))
+            self.wfile.flush()
+
+
+def make_unix_server(service: JobService, socket_path: Path) -> socketserver.BaseServer:
+    """
+    Create (but do not start) the Unix-socket front end.
+
+    Raises:
+        OSError: On platforms without AF_UNIX support, or if `socket_path`
+            exists and is not a socket (FileExistsError).
+    """
+    if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+        raise OSError("Unix sockets are not supported on this platform; use --port instead.")
+    socket_path = Path(socket_path)
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        pass
+    else:
+        # Only replace a stale socket, never a file passed by mistake.
+        if not stat.S_ISSOCK(mode):
+            raise FileExistsError(f"{socket_path} exists and is not a socket")
+        os.unlink(socket_path)
+    handler = type("BoundUnixHandler", (_UnixHandler,), {"service": service})
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,170 @@
+# reposmith/snapshot_utils.py
+"""
+Structured environment snapshots and their diffs.
+
+A snapshot records the interpreter (implementation, version, platform) and
+every installed distribution with its version, read straight from the
+`*.dist-info` directories instead of spawning `pip freeze`. Each distribution
+also carries a short hash of its RECORD, which is cheap to compute and tells
+apart two builds of the same version (a local rebuild, another wheel tag).
+
+`diff_snapshots` compares two snapshots with set operations on the package
+names, so even venvs with hundreds of packages diff in well under a
+millisecond. Either side can be a snapshot file, a venv or a project
+directory containing `.venv` (see `load_snapshot`).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .core.dists import DIST_INFO_RE, venv_site_packages
+from .core.fs import atomic_write
+from .core.runner import run_command
+from .core.walk import is_venv
+from .index_server import normalize
+from .venv_utils import _venv_python
+
+SNAPSHOT_FILENAME = "env-snapshot.json"
+SNAPSHOT_FORMAT = 1
+
+_PROBE = (
+    "import json, platform, sys, sysconfig; print(json.dumps({"
+    "'implementation': sys.implementation.name, 'version': platform.python_version(), "
+    "'platform': sysconfig.get_platform(), 'machine': platform.machine()}))"
+)
+
+
+def _dist_entry(dist_info: Path, version: str) -> dict:
+    entry: dict = {"version": version}
+    try:
+        entry["record"] = hashlib.sha256((dist_info / "RECORD").read_bytes()).hexdigest()[:16]
+    except OSError:
+        pass
+    try:
+        direct = json.loads((dist_info / "direct_url.json").read_text(encoding="utf-8"))
+        entry["source"] = direct.get("url")
+        if direct.get("dir_info", {}).get("editable"):
+            entry["editable"] = True
+    except (OSError, ValueError):
+        pass
+    return entry
+
+
+def take_snapshot(venv: Path, *, probe: bool = True) -> dict:
+    """
+    Snapshot a virtual environment.
+
+    Args:
+        venv (Path): The venv directory.
+        probe (bool): Ask the interpreter for its exact version and platform
+            (one short subprocess). Without it, only pyvenv.cfg is read.
+
+    Returns:
+        dict: JSON-serializable snapshot (`python` and `packages` keys).
+    """
+    venv = Path(venv)
+    python: dict = {}
+    if probe:
+        out = run_command([_venv_python(venv), "-c", _PROBE], capture=True, stream=False).output
+        python = json.loads(out.strip().splitlines()[-1])
+    else:
+        for line in (venv / "pyvenv.cfg").read_text(encoding="utf-8").splitlines():
+            key, _, value = line.partition("=")
+            if key.strip() in ("version", "version_info"):
+                python["version"] = value.strip()
+    packages: dict[str, dict] = {}
+    for sp in venv_site_packages(venv):
+        for dist_info in sp.glob("*.dist-info"):
+            m = DIST_INFO_RE.match(dist_info.name)
+            if m:
+                packages[normalize(m.group(1))] = _dist_entry(dist_info, m.group(2))
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "venv": str(venv.resolve()),
+        "python": python,
+        "packages": dict(sorted(packages.items())),
+    }
+
+
+def write_snapshot(venv: Path, path: Optional[Path] = None) -> Path:
+    """Snapshot `venv` into `path` (default: `env-snapshot.json` next to the venv)."""
+    venv = Path(venv)
+    path = Path(path) if path else venv.resolve().parent / SNAPSHOT_FILENAME
+    atomic_write(path, json.dumps(take_snapshot(venv), indent=2) + "\n")
+    return path
+
+
+def load_snapshot(source: Path) -> dict:
+    """
+    A snapshot from a file, a venv (taken live) or a project directory with `.venv`.
+
+    Raises:
+        FileNotFoundError: If `source` is none of these.
+        ValueError: If a file is not a snapshot.
+    """
+    source = Path(source)
+    if source.is_dir():
+        venv = source if is_venv(source) else source / ".venv"
+        if not is_venv(venv):
+            raise FileNotFoundError(f"No virtual environment at {source}")
+        return take_snapshot(venv)
+    data = json.loads(source.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or "packages" not in data:
+        raise ValueError(f"{source} is not an environment snapshot")
+    return data
+
+
+@dataclass
+class SnapshotDiff:
+    """Differences between snapshots `a` and `b`."""
+
+    added: dict[str, str] = field(default_factory=dict)
+    removed: dict[str, str] = field(default_factory=dict)
+    changed: dict[str, tuple[str, str]] = field(default_factory=dict)
+    rebuilt: list[str] = field(default_factory=list)
+    python: dict[str, tuple[Optional[str], Optional[str]]] = field(default_factory=dict)
+
+    @property
+    def identical(self) -> bool:
+        return not (self.added or self.removed or self.changed or self.rebuilt or self.python)
+
+    def to_dict(self) -> dict:
+        return {
+            "python": {k: list(v) for k, v in self.python.items()},
+            "added": self.added,
+            "removed": self.removed,
+            "changed": {k: list(v) for k, v in self.changed.items()},
+            "rebuilt": self.rebuilt,
+        }
+
+
+def diff_snapshots(a: dict, b: dict) -> SnapshotDiff:
+    """
+    Compare two snapshots.
+
+    Packages are matched by normalized name. A package whose version matches
+    but whose RECORD hash differs (both known) is listed as `rebuilt`.
+    """
+    pa, pb = a.get("packages", {}), b.get("packages", {})
+    ka, kb = pa.keys(), pb.keys()
+    diff = SnapshotDiff(
+        added={n: pb[n]["version"] for n in sorted(kb - ka)},
+        removed={n: pa[n]["version"] for n in sorted(ka - kb)},
+    )
+    for name in sorted(ka & kb):
+        va, vb = pa[name], pb[name]
+        if va["version"] != vb["version"]:
+            diff.changed[name] = (va["version"], vb["version"])
+        elif va.get("record") and vb.get("record") and va["record"] != vb["record"]:
+            diff.rebuilt.append(name)
+    ia, ib = a.get("python", {}), b.get("python", {})
+    for key in sorted(ia.keys() & ib.keys()):
+        if ia[key] != ib[key]:
+            diff.python[key] = (ia[key], ib[key])
+    return diff
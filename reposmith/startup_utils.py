@@ -0,0 +1,221 @@
+# reposmith/startup_utils.py
+"""
+Interpreter startup audit for a project venv.
+
+A venv whose Python needs hundreds of milliseconds to start makes every test
+run, hook and CLI call slow. The usual culprits are `.pth` files that execute
+imports, editable installs that add long path lists, and sitecustomize hooks.
+`measure_startup` finds them by:
+
+  - timing `python -c pass` against `python -I -S -c pass` (no site at all),
+  - parsing `python -X importtime -c pass` for the modules site imports,
+  - running a probe under `-S` that processes every `.pth` file itself,
+    timing each one and counting the `sys.path` entries it adds.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import statistics
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .core.runner import run_command
+
+DEFAULT_THRESHOLD = 0.02  # seconds, per .pth file or site module
+DEFAULT_STARTUP_LIMIT = 0.15  # seconds, whole `python -c pass`
+MAX_PATH_ENTRIES = 50  # sys.path entries one .pth may add before every import pays for it
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)\s*$")
+
+# Runs under `python -S`: finds the venv the way site.venv() does, then
+# processes its site-packages like site.main(), one .pth file at a time.
+_PROBE = r"""
+import os, site, sys, time
+out = {"pth": [], "customize": {}}
+known = site._init_pathinfo()
+prefixes = site.PREFIXES
+exe_dir = os.path.dirname(sys.executable)
+for cand in (exe_dir, os.path.dirname(exe_dir)):
+    cfg = os.path.join(cand, "pyvenv.cfg")
+    if os.path.isfile(cfg):
+        with open(cfg, encoding="utf-8") as f:
+            conf = {k.strip().lower(): v.strip().lower() for k, _, v in (l.partition("=") for l in f)}
+        prefixes = [cand] + (prefixes if conf.get("include-system-site-packages") == "true" else [])
+        break
+for sitedir in site.getsitepackages(prefixes):
+    if not os.path.isdir(sitedir):
+        continue
+    sys.path.append(sitedir)
+    known.add(site.makepath(sitedir)[1])
+    for name in sorted(n for n in os.listdir(sitedir) if n.endswith(".pth") and not n.startswith(".")):
+        before = len(sys.path)
+        t = time.perf_counter()
+        site.addpackage(sitedir, name, known)
+        out["pth"].append({"path": os.path.join(sitedir, name), "seconds": time.perf_counter() - t,
+                           "paths": len(sys.path) - before})
+for mod in ("sitecustomize", "usercustomize"):
+    t = time.perf_counter()
+    try:
+        __import__(mod)
+    except ImportError:
+        continue
+    except Exception:
+        pass
+    out["customize"][mod] = time.perf_counter() - t
+import json  # only now, so a .pth importing json is still charged for it
+print(json.dumps(out))
+"""
+
+
+@dataclass
+class ImportTime:
+    """One line of `-X importtime` output (times in seconds)."""
+
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+
+@dataclass
+class PthCost:
+    """Cost of processing one `.pth` file at startup."""
+
+    path: str
+    seconds: float
+    path_entries: int
+    imports: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StartupReport:
+    """Outcome of `measure_startup`."""
+
+    python: str
+    startup: float = 0.0
+    bare_startup: float = 0.0
+    imports: list[ImportTime] = field(default_factory=list)
+    pth: list[PthCost] = field(default_factory=list)
+    customize: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def site_overhead(self) -> float:
+        """Startup time added by site processing."""
+        return max(0.0, self.startup - self.bare_startup)
+
+    def site_modules(self) -> list[ImportTime]:
+        """Modules imported while `site` ran (its direct children), slowest first."""
+        found: list[ImportTime] = []
+        in_site = False
+        # importtime prints children before their parent: collect depth-1 lines
+        # until the top-level `site` line closes the group.
+        for imp in self.imports:
+            if imp.depth == 0:
+                if imp.module == "site":
+                    in_site = True
+                    break
+                found.clear()
+            elif imp.depth == 1:
+                found.append(imp)
+        return sorted(found, key=lambda i: i.cumulative, reverse=True) if in_site else []
+
+    def findings(self, threshold: float = DEFAULT_THRESHOLD, limit: float = DEFAULT_STARTUP_LIMIT) -> list[str]:
+        """Human-readable problems: anything slower than `threshold`, or a startup over `limit`."""
+        out: list[str] = []
+        if self.startup > limit:
+            out.append(
+                f"python -c pass takes {self.startup * 1000:.0f} ms "
+                f"({self.site_overhead * 1000:.0f} ms in site processing)"
+            )
+        for p in self.pth:
+            if p.seconds > threshold:
+                what = f" (imports {', '.join(p.imports)})" if p.imports else ""
+                out.append(f"{p.path} takes {p.seconds * 1000:.0f} ms{what}")
+            if p.path_entries > MAX_PATH_ENTRIES:
+                out.append(f"{p.path} adds {p.path_entries} sys.path entries")
+        for name, seconds in self.customize.items():
+            if seconds > threshold:
+                out.append(f"{name} takes {seconds * 1000:.0f} ms")
+        pth_modules = {m for p in self.pth for m in p.imports} | set(self.customize)
+        for imp in self.site_modules():
+            if imp.cumulative > threshold and imp.module not in pth_modules:
+                out.append(f"site imports {imp.module} ({imp.cumulative * 1000:.0f} ms)")
+        return out
+
+
+def parse_importtime(text: str) -> list[ImportTime]:
+    """Parse `-X importtime` output; the header and unrelated lines are skipped."""
+    found: list[ImportTime] = []
+    for line in text.splitlines():
+        m = _IMPORTTIME_RE.match(line)
+        if m:
+            found.append(ImportTime(m.group(4), int(m.group(1)) / 1e6, int(m.group(2)) / 1e6, (len(m.group(3)) - 1) // 2))
+    return found
+
+
+def pth_imports(text: str) -> list[str]:
+    """Top-level modules a `.pth` file imports (only lines starting with "import" run code)."""
+    names: list[str] = []
+    for line in text.splitlines():
+        if not line.startswith(("import ", "import\t")):
+            continue
+        stmt = line.split(";", 1)[0][len("import"):]
+        for part in stmt.split(","):
+            name = part.strip().split(" as ")[0].split(".")[0].strip()
+            if name and name not in names:
+                names.append(name)
+    return names
+
+
+def _time_runs(cmd: list[str], runs: int) -> float:
+    return statistics.median(run_command(cmd, capture=True, stream=False).duration for _ in range(max(1, runs)))
+
+
+def measure_startup(python: str, *, runs: int = 5) -> StartupReport:
+    """
+    Measure how long `python` takes to start and attribute the cost.
+
+    Args:
+        python (str): The venv interpreter.
+        runs (int): Repetitions per timing; the median is reported.
+
+    Returns:
+        StartupReport: Timings, the importtime tree, per-.pth and sitecustomize costs.
+    """
+    report = StartupReport(python)
+    run_command([python, "-c", "pass"], stream=False)  # warm the page cache first
+    report.startup = _time_runs([python, "-c", "pass"], runs)
+    report.bare_startup = _time_runs([python, "-I", "-S", "-c", "pass"], runs)
+
+    res = run_command([python, "-X", "importtime", "-c", "pass"], capture=True, capture_stderr=True, stream=False)
+    report.imports = parse_importtime(res.output)
+
+    out = run_command([python, "-S", "-c", _PROBE], capture=True, stream=False).output
+    probe = json.loads(out.strip().splitlines()[-1])
+    for rec in probe["pth"]:
+        try:
+            with open(rec["path"], encoding="utf-8", errors="replace") as fh:
+                imports = pth_imports(fh.read())
+        except OSError:
+            imports = []
+        report.pth.append(PthCost(rec["path"], rec["seconds"], rec["paths"], imports))
+    report.pth.sort(key=lambda p: p.seconds, reverse=True)
+    report.customize = probe["customize"]
+    return report
+
+
+def describe(report: StartupReport, count: Optional[int] = 5) -> list[str]:
+    """Summary lines for a report (used by `reposmith doctor --startup`)."""
+    lines = [
+        f"python -c pass: {report.startup * 1000:.1f} ms "
+        f"(without site: {report.bare_startup * 1000:.1f} ms, site: {report.site_overhead * 1000:.1f} ms)"
+    ]
+    for p in report.pth[:count]:
+        lines.append(f".pth {os.path.basename(p.path)}: {p.seconds * 1000:.1f} ms, +{p.path_entries} path(s)")
+    for name, seconds in report.customize.items():
+        lines.append(f"{name}: {seconds * 1000:.1f} ms")
+    for imp in report.site_modules()[:count]:
+        lines.append(f"site module {imp.module}: {imp.cumulative * 1000:.1f} ms")
+    return lines
@@ -0,0 +1,317 @@
+# reposmith/usage_utils.py
+"""
+Dependency usage analysis: compare what the project imports with what
+requirements.txt declares.
+
+Every project `.py` file is parsed with `ast`. Parsing runs on a process pool
+when there are many files, and results are cached in
+`.reposmith/import-cache.json`, keyed by the file's content hash, so repeated
+runs only parse what changed. Besides import statements, modules loaded by
+name (`importlib.import_module("x")`, `__import__("x")`) and database drivers
+named in URLs (`"postgresql+psycopg2://..."`) count as imports. Imported
+top-level names are mapped to distributions through the venv's
+`top_level.txt` files, falling back to RECORD. The report lists:
+
+  - unused: declared requirements whose modules nothing imports
+    (distributions with entry points, such as console scripts or pytest
+    plugins, and type stubs are listed as tools instead, since they are run
+    or loaded by other tools rather than imported),
+  - undeclared: third-party imports no requirement covers.
+
+`prune_requirements` drops the unused entries from requirements.txt,
+keeping a `.bak` copy.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .core.checkpoints import STATE_DIRNAME
+from .core.dists import DIST_INFO_RE, pyproject_dependencies, venv_site_packages
+from .core.fs import atomic_write, write_file
+from .core.walk import DESCEND, MATCH, SKIP, VCS_DIRS, is_venv, scan_tree
+from .index_server import normalize
+
+CACHE_FILENAME = "import-cache.json"
+# Below this many unparsed files a process pool costs more than it saves.
+POOL_MIN_FILES = 32
+
+_SKIP_DIRS = frozenset({"__pycache__", "build", "dist", ".tox", ".nox", STATE_DIRNAME})
+_REQ_NAME_RE = re.compile(r"([A-Za-z0-9][A-Za-z0-9._-]*)")
+_DRIVER_URL_RE = re.compile(r"^[A-Za-z][\w.-]*\+([A-Za-z_]\w*)://")
+_DYNAMIC_IMPORTS = frozenset({"import_module", "__import__"})
+# Bump whenever `imported_names` changes, so results of older parsers are not reused.
+_PARSER_VERSION = b"2"
+
+
+def project_sources(root: Path, *, jobs: Optional[int] = None) -> list[Path]:
+    """Project `.py` files, skipping VCS directories, venvs and build output."""
+
+    def classify(entry: os.DirEntry) -> str:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name in VCS_DIRS or entry.name in _SKIP_DIRS or is_venv(entry.path):
+                return SKIP
+            return DESCEND
+        return MATCH if entry.name.endswith(".py") else SKIP
+
+    return sorted(Path(e.path) for e in scan_tree([root], classify, jobs=jobs))
+
+
+def imported_names(source: bytes | str) -> list[str]:
+    """
+    Top-level module names imported by a source file (absolute imports only),
+    including modules loaded by a constant name and drivers in database URLs.
+
+    Raises:
+        SyntaxError: If the source does not parse.
+    """
+    names: set[str] = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split(".")[0])
+        elif isinstance(node, ast.Call) and node.args and isinstance(node.args[0], ast.Constant):
+            func = node.func.attr if isinstance(node.func, ast.Attribute) else getattr(node.func, "id", None)
+            arg = node.args[0].value
+            if func in _DYNAMIC_IMPORTS and isinstance(arg, str) and arg and not arg.startswith("."):
+                names.add(arg.split(".")[0])
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            m = _DRIVER_URL_RE.match(node.value)
+            if m:
+                names.add(m.group(1))
+    return sorted(names)
+
+
+def _parse_file(path: str) -> tuple[str, Optional[list[str]], Optional[str]]:
+    """Process-pool worker: `(path, names, error)`."""
+    try:
+        with open(path, "rb") as fh:
+            return path, imported_names(fh.read()), None
+    except (OSError, SyntaxError, ValueError) as e:
+        return path, None, str(e)
+
+
+def _digest(path: Path) -> Optional[str]:
+    try:
+        with open(path, "rb") as fh:
+            return hashlib.file_digest(fh, lambda: hashlib.sha256(_PARSER_VERSION)).hexdigest()
+    except OSError:
+        return None
+
+
+def distribution_modules(venv: Path) -> tuple[dict[str, set[str]], set[str], set[str]]:
+    """
+    Map importable top-level names to distributions installed in `venv`.
+
+    Returns:
+        tuple[dict[str, set[str]], set[str], set[str]]: `{module: {normalized
+        dist names}}`, the tool distributions (any entry points, `types-*`
+        and `*-stubs` packages), and every installed distribution.
+    """
+    modules: dict[str, set[str]] = {}
+    tools: set[str] = set()
+    installed: set[str] = set()
+    for sp in venv_site_packages(venv):
+        for dist_info in sp.glob("*.dist-info"):
+            m = DIST_INFO_RE.match(dist_info.name)
+            if not m:
+                continue
+            dist = normalize(m.group(1))
+            installed.add(dist)
+            try:
+                tops = (dist_info / "top_level.txt").read_text(encoding="utf-8").split()
+            except OSError:
+                tops = _record_top_levels(dist_info)
+            for top in tops:
+                modules.setdefault(top.replace("/", ".").split(".")[0], set()).add(dist)
+            if dist.startswith("types-") or any(t.endswith("-stubs") for t in tops):
+                tools.add(dist)
+            try:
+                if "[" in (dist_info / "entry_points.txt").read_text(encoding="utf-8"):
+                    tools.add(dist)
+            except OSError:
+                pass
+    return modules, tools, installed
+
+
+def _record_top_levels(dist_info: Path) -> list[str]:
+    tops: set[str] = set()
+    try:
+        lines = (dist_info / "RECORD").read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return []
+    for line in lines:
+        first = line.split(",", 1)[0].split("/", 1)
+        name = first[0]
+        if not name or name.startswith("..") or name.endswith((".dist-info", ".data", ".pth")) or name == "__pycache__":
+            continue
+        if len(first) == 1:
+            if not name.endswith((".py", ".so", ".pyd")):
+                continue
+            name = name.split(".", 1)[0]
+        tops.add(name)
+    return sorted(tops)
+
+
+def declared_requirements(root: Path) -> dict[str, str]:
+    """`{normalized name: requirement line}` from requirements.txt, else pyproject dependencies."""
+    req = root / "requirements.txt"
+    if req.is_file():
+        lines = req.read_text(encoding="utf-8").splitlines()
+    else:
+        lines = pyproject_dependencies(root / "pyproject.toml")
+    declared: dict[str, str] = {}
+    for raw in lines:
+        line = raw.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        m = _REQ_NAME_RE.match(line)
+        if m:
+            declared[normalize(m.group(1))] = raw
+    return declared
+
+
+def _local_modules(root: Path, files: list[Path]) -> set[str]:
+    """Names the project itself provides: every module file and package directory."""
+    local: set[str] = set()
+    for f in files:
+        parts = f.relative_to(root).parts
+        local.update(parts[:-1])
+        local.add(f.stem)
+    return local
+
+
+@dataclass
+class UsageReport:
+    """Outcome of `analyze_usage`."""
+
+    files: int = 0
+    parsed: int = 0
+    cached: int = 0
+    imports: dict[str, list[str]] = field(default_factory=dict)
+    unused: list[str] = field(default_factory=list)
+    tools: list[str] = field(default_factory=list)
+    undeclared: dict[str, Optional[str]] = field(default_factory=dict)
+    not_installed: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def scan_imports(root: Path, *, jobs: Optional[int] = None) -> tuple[dict[str, list[str]], UsageReport]:
+    """
+    Imported top-level names per project file, using and refreshing the hash cache.
+
+    Returns:
+        tuple[dict[str, list[str]], UsageReport]: `{relative path: names}` and a
+        report with file counts and syntax errors filled in.
+    """
+    root = Path(root)
+    report = UsageReport()
+    files = project_sources(root, jobs=jobs)
+    report.files = len(files)
+    cache_path = root / STATE_DIRNAME / CACHE_FILENAME
+    try:
+        cache: dict[str, list[str]] = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+
+    digests = {str(f): _digest(f) for f in files}
+    per_file: dict[str, list[str]] = {}
+    misses: list[str] = []
+    for path, digest in digests.items():
+        if digest in cache:
+            per_file[path] = cache[digest]
+            report.cached += 1
+        elif digest is not None:
+            misses.append(path)
+
+    if len(misses) >= POOL_MIN_FILES:
+        workers = max(1, min(jobs or os.cpu_count() or 2, len(misses)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_file, misses, chunksize=max(1, len(misses) // (4 * workers))))
+    else:
+        results = [_parse_file(p) for p in misses]
+    for path, names, error in results:
+        if names is None:
+            report.errors[os.path.relpath(path, root)] = error or "unreadable"
+            continue
+        per_file[path] = names
+        report.parsed += 1
+
+    fresh = {digests[p]: names for p, names in per_file.items() if digests[p]}
+    if fresh != cache:
+        atomic_write(cache_path, json.dumps(fresh, sort_keys=True) + "\n")
+    return {os.path.relpath(p, root): names for p, names in sorted(per_file.items())}, report
+
+
+def analyze_usage(root: Path, venv: Optional[Path] = None, *, jobs: Optional[int] = None) -> UsageReport:
+    """
+    Compare the project's imports with its declared requirements.
+
+    Args:
+        root (Path): Project root.
+        venv (Optional[Path]): Venv used to map modules to distributions
+            (default: `root/.venv`).
+        jobs (Optional[int]): Worker processes for parsing.
+
+    Returns:
+        UsageReport: Unused requirements, tools (entry points, stubs), undeclared
+        imports (module -> providing distribution, None if not installed)
+        and requirements missing from the venv.
+    """
+    root = Path(root)
+    per_file, report = scan_imports(root, jobs=jobs)
+    local = _local_modules(root, [root / p for p in per_file])
+    stdlib = set(sys.stdlib_module_names) | {"__future__"}
+    for path, names in per_file.items():
+        for name in names:
+            if name not in stdlib and name not in local:
+                report.imports.setdefault(name, []).append(path)
+
+    modules, tools, installed = distribution_modules(Path(venv) if venv else root / ".venv")
+    declared = declared_requirements(root)
+    used: set[str] = set()
+    for name in report.imports:
+        dists = modules.get(name, set())
+        used |= dists
+        if not dists & declared.keys():
+            report.undeclared[name] = min(dists) if dists else None
+    for dist in sorted(declared):
+        if dist not in installed:
+            report.not_installed.append(dist)
+        elif dist not in used:
+            (report.tools if dist in tools else report.unused).append(dist)
+    return report
+
+
+def prune_requirements(root: Path, unused: list[str]) -> list[str]:
+    """
+    Remove `unused` requirements from `root/requirements.txt` (a `.bak` is kept).
+
+    Returns:
+        list[str]: The removed lines.
+    """
+    req = Path(root) / "requirements.txt"
+    if not req.is_file() or not unused:
+        return []
+    drop = set(unused)
+    kept: list[str] = []
+    removed: list[str] = []
+    for raw in req.read_text(encoding="utf-8").splitlines():
+        line = raw.split("#", 1)[0].strip()
+        m = _REQ_NAME_RE.match(line) if line and not line.startswith("-") else None
+        if m and normalize(m.group(1)) in drop:
+            removed.append(raw)
+        else:
+            kept.append(raw)
+    if removed:
+        write_file(req, "\n".join(kept) + "\n", force=True, backup=True)
+    return removed
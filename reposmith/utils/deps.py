@@ -1,79 +1,93 @@
 from __future__ import annotations
-import subprocess, os, time
 from pathlib import Path
 from .paths import venv_python
+from ..core.deadline import wait_for_path
+from ..core.runner import run_command
+from ..lock_utils import compile_lock, sync_lock
+from ..installer import get_installer, uv_command
 
+# Upper bound for the interpreter to appear right after venv creation (Windows).
+VENV_READY_TIMEOUT = 1.5
 
-def post_init_dependency_setup(root: Path, prefer_uv: bool = True) -> None:
+
+def post_init_dependency_setup(
+    root: Path, prefer_uv: bool = True, offline: bool = False, lock: bool = False
+) -> None:
     """
     Set up dependencies after project initialization.
 
     This function performs the following steps:
-    - If a requirements.txt file is found, installs dependencies using uv or pip.
-    - If no requirements.txt is found, ensures uv is installed and initializes pyproject.toml.
+    - If a requirements.txt file is found, installs dependencies with the installer
+      engine (a system uv when available, otherwise pip inside .venv).
+    - If no requirements.txt is found, initializes pyproject.toml via `uv init`.
 
     Args:
         root (Path): The root directory of the project.
         prefer_uv (bool, optional): Whether to prefer uv over pip. Defaults to True.
+        offline (bool, optional): Kept for callers; uv is never installed here,
+            so `uv init` never reaches the network for it. Defaults to False.
+        lock (bool, optional): Compile requirements.txt/pyproject into a hashed
+            requirements.lock (only when the inputs changed) and sync the venv to
+            it exactly. Defaults to False.
 
     Returns:
         None
 
     Notes:
-        - If no Python interpreter is found in the .venv directory, the function waits briefly and rechecks.
-        - Exceptions during uv operations fall back to using pip.
+        - If .venv exists but its interpreter is not visible yet, the function polls
+          for it with backoff (bounded by VENV_READY_TIMEOUT and the current deadline).
+        - A failed uv install falls back to pip.
     """
     
     py = venv_python(root)
 
-    # ⏳ أضف انتظارًا قصيرًا بعد إنشاء البيئة لتفادي فشل الكشف في ويندوز
-    if not py.exists():
-        time.sleep(1.5)
+    # ⏳ انتظار قصير (مع تراجع تدريجي) بعد إنشاء البيئة لتفادي فشل الكشف في ويندوز
+    if not py.exists() and (root / ".venv").is_dir():
+        wait_for_path(py, VENV_READY_TIMEOUT)
 
     if not py.exists():
         print("[INFO] No Python interpreter in .venv — skipping dependency setup.")
         return
 
+    installer = get_installer() if prefer_uv else get_installer("pip")
+
+    if lock:
+        _, lock_path = compile_lock(root, str(py), installer=installer)
+        if lock_path is not None:
+            print(f"[lock] Syncing .venv to {lock_path.name}...")
+            sync_lock(str(py), lock_path, installer=installer)
+            return
+
     req = root / "requirements.txt"
     pyproject = root / "pyproject.toml"
 
     def run(cmd: list[str]) -> None:
         print(">", " ".join(cmd))
-        subprocess.run(cmd, cwd=root, check=True)
+        run_command(cmd, cwd=root)
 
     # ✅ حالة وجود requirements.txt
     if req.exists() and req.stat().st_size > 0:
-        if prefer_uv:
-            print("[uv] requirements.txt detected → installing via uv...")
-            try:
-                run([str(py), "-m", "pip", "install", "--upgrade", "pip"])
-                run([str(py), "-m", "pip", "install", "--upgrade", "uv"])
-                run([str(py), "-m", "uv", "pip", "install", "-r", str(req)])
-                return
-            except Exception:
-                print("[INFO] uv not available → falling back to pip")
-        print("[pip] Installing from requirements.txt...")
-        run([str(py), "-m", "pip", "install", "-r", str(req)])
+        print(f"[{installer.kind}] requirements.txt detected → installing via {installer.name}...")
+        try:
+            installer.install(str(py), requirements=req, cwd=root)
+            return
+        except Exception:
+            if not installer.is_uv:
+                raise
+            print("[INFO] uv install failed → falling back to pip")
+        get_installer("pip").install(str(py), requirements=req, cwd=root)
         return
 
     # ✅ حالة عدم وجود requirements.txt
     if prefer_uv:
-        print("[check] Ensuring uv is available inside the venv...")
-        rc = subprocess.run(
-            [str(py), "-m", "pip", "show", "uv"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        ).returncode
-        if rc != 0:
-            print("[install] uv not found → installing now...")
-            run([str(py), "-m", "pip", "install", "--upgrade", "uv"])
-        else:
-            print("[check] uv already installed inside .venv ✅")
-
         if not pyproject.exists():
+            uv = uv_command()
+            if uv is None:
+                print("[WARN] uv is not installed — skipping uv init.")
+                return
             print("[uv] No requirements.txt found → initializing pyproject.toml via uv init...")
             try:
-                run([str(py), "-m", "uv", "init"])
+                run([*uv, "init"])
                 print("[DONE] pyproject.toml created successfully ✅")
             except Exception as e:
                 print(f"[WARN] uv init failed: {e}")
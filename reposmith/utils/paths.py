@@ -5,3 +5,18 @@ from pathlib import Path
 def venv_python(root: Path) -> Path:
     venv = root / ".venv"
     return venv / ("Scripts/python.exe" if os.name == "nt" else "bin/python")
+
+def cache_dir() -> Path:
+    """
+    Return RepoSmith's own cache directory (not created).
+
+    Honors REPOSMITH_CACHE_DIR, then LOCALAPPDATA on Windows or
+    XDG_CACHE_HOME elsewhere, falling back to ~/.cache/reposmith.
+    """
+    override = os.environ.get("REPOSMITH_CACHE_DIR")
+    if override:
+        return Path(override)
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "reposmith" / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "reposmith"
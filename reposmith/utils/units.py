@@ -0,0 +1,52 @@
+from __future__ import annotations
+import re
+
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)?\s*$", re.IGNORECASE)
+
+def parse_duration(text: str | float | int) -> float:
+    """
+    Parse a human duration such as "120s", "2m", "1.5h", "30d" or "90" (seconds).
+
+    Args:
+        text (str | float | int): Duration text or a number of seconds.
+
+    Returns:
+        float: Duration in seconds.
+
+    Raises:
+        ValueError: If the text is not a valid duration.
+    """
+    if isinstance(text, (int, float)):
+        return float(text)
+    m = _DURATION_RE.match(text or "")
+    if not m:
+        raise ValueError(f"Invalid duration: {text!r} (examples: 90, 120s, 5m, 1h, 30d)")
+    return float(m.group(1)) * _DURATION_UNITS[(m.group(2) or "s").lower()]
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*$", re.IGNORECASE)
+
+def parse_size(text: str | int) -> int:
+    """
+    Parse a human size such as "500M", "10G", "1.5GiB" or "4096" (bytes).
+
+    Units are binary (1K = 1024 bytes).
+
+    Raises:
+        ValueError: If the text is not a valid size.
+    """
+    if isinstance(text, int):
+        return text
+    m = _SIZE_RE.match(text or "")
+    if not m:
+        raise ValueError(f"Invalid size: {text!r} (examples: 4096, 500M, 10G)")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).lower()])
+
+def format_size(num: int | float) -> str:
+    """Format a byte count for humans, e.g. 1536 -> "1.5 KiB"."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(num) < 1024:
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+    return f"{num:.1f} TiB"
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import importlib.util
+import json
 import os
 import sys
 import shutil
-import subprocess
+import time
 from pathlib import Path
 from typing import Optional
 
+from .core.runner import run_command
+from .installer import get_installer
+from .interpreter_utils import find_interpreter
+
+# Written into every venv reposmith creates; `reposmith venv gc` only touches these.
+VENV_MARKER = ".reposmith-venv.json"
+
 def _venv_python(venv_dir: str | os.PathLike) -> str:
     """
     Return the Python executable path inside a virtual environment.
@@ -24,28 +33,130 @@ def _venv_python(venv_dir: str | os.PathLike) -> str:
         else os.path.join(v, "bin", "python")
     )
 
-def create_virtualenv(venv_dir: str | os.PathLike, python_version: Optional[str] = None) -> str:
+def _version_matches(actual: tuple[int, ...], wanted: str) -> bool:
+    """Return True if `actual` starts with the dotted version prefix `wanted`."""
+    try:
+        parts = tuple(int(x) for x in wanted.strip().split("."))
+    except ValueError:
+        return False
+    return tuple(actual[: len(parts)]) == parts
+
+def resolve_interpreter(python_version: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve a Python executable for `python_version`.
+
+    Args:
+        python_version (Optional[str]): A version prefix such as "3.13", a path
+            to an interpreter, or None for the current interpreter. Versions
+            are looked up in the cached interpreter discovery index.
+
+    Returns:
+        Optional[str]: Path to a matching interpreter, or None if none was found.
+    """
+    if not python_version:
+        return sys.executable
+    if os.path.sep in python_version or python_version.lower().startswith("python"):
+        found = shutil.which(python_version) or (python_version if os.path.exists(python_version) else None)
+        return found
+    if _version_matches(sys.version_info, python_version):
+        return sys.executable
+    match = find_interpreter(python_version)
+    return match.path if match else None
+
+def _create_with_venv(vdir: str, interpreter: str, python_version: Optional[str]) -> None:
+    run_command([interpreter, "-m", "venv", vdir])
+
+def _create_with_uv(vdir: str, interpreter: Optional[str], python_version: Optional[str]) -> None:
+    # --seed keeps pip available for the pip-based install paths.
+    # Without a local match uv resolves (or downloads) the requested version itself.
+    target = interpreter or python_version or sys.executable
+    run_command(["uv", "venv", "--seed", "--python", target, vdir])
+
+def _create_with_virtualenv(vdir: str, interpreter: str, python_version: Optional[str]) -> None:
+    exe = shutil.which("virtualenv")
+    cmd = [exe] if exe else [sys.executable, "-m", "virtualenv"]
+    run_command(cmd + ["--python", interpreter, vdir])
+
+VENV_BACKENDS = {
+    "venv": _create_with_venv,
+    "uv": _create_with_uv,
+    "virtualenv": _create_with_virtualenv,
+}
+
+def available_venv_backends() -> list[str]:
+    """
+    List usable venv backends, fastest first.
+
+    Returns:
+        list[str]: Backend names; "venv" is always available.
+    """
+    found: list[str] = []
+    if shutil.which("uv"):
+        found.append("uv")
+    if shutil.which("virtualenv") or importlib.util.find_spec("virtualenv") is not None:
+        found.append("virtualenv")
+    found.append("venv")
+    return found
+
+def pick_venv_backend(preference: str = "auto") -> str:
+    """
+    Choose the backend to use.
+
+    Args:
+        preference (str): "auto" or one of VENV_BACKENDS.
+
+    Returns:
+        str: The selected backend name.
+
+    Raises:
+        ValueError: If the preference is unknown.
+    """
+    if preference == "auto":
+        return available_venv_backends()[0]
+    if preference not in VENV_BACKENDS:
+        raise ValueError(f"Unknown venv backend '{preference}'. Available: auto, {', '.join(VENV_BACKENDS)}")
+    return preference
+
+def create_virtualenv(
+    venv_dir: str | os.PathLike,
+    python_version: Optional[str] = None,
+    backend: str = "auto",
+) -> str:
     """
     Create a virtual environment if it doesn't already exist.
 
     Args:
         venv_dir (str | os.PathLike): Path to the virtual environment directory.
-        python_version (Optional[str]): Ignored in this implementation.
+        python_version (Optional[str]): Interpreter to use, e.g. "3.13" or a path.
+            Defaults to the current interpreter.
+        backend (str): "auto" (fastest available), "uv", "virtualenv" or "venv".
 
     Returns:
         str: "written" if created, "exists" if already present.
+
+    Raises:
+        RuntimeError: If no interpreter matches `python_version` and the backend
+            cannot provide one.
     """
     print("\n[2] Checking virtual environment")
     vdir = str(venv_dir)
-    if not os.path.exists(vdir):
-        print(f"Creating virtual environment at: {vdir}")
-        subprocess.run([sys.executable, "-m", "venv", vdir], check=True)
-        print("Virtual environment created.")
-        return "written"
-    else:
+    if os.path.exists(vdir):
         print("Virtual environment already exists.")
         return "exists"
 
+    name = pick_venv_backend(backend)
+    interpreter = resolve_interpreter(python_version)
+    if interpreter is None and name != "uv":
+        raise RuntimeError(f"No Python {python_version} interpreter found (try --venv-backend uv).")
+
+    print(f"Creating virtual environment at: {vdir} (backend: {name}, python: {interpreter or python_version})")
+    VENV_BACKENDS[name](vdir, interpreter, python_version)
+    if os.path.isdir(vdir):
+        marker = {"created": time.time(), "backend": name, "python": python_version or interpreter}
+        Path(vdir, VENV_MARKER).write_text(json.dumps(marker) + "\n", encoding="utf-8")
+    print("Virtual environment created.")
+    return "written"
+
 def _resolve_paths_for_install(
     venv_or_root: str | os.PathLike,
     requirements_path: Optional[str | os.PathLike],
@@ -80,7 +191,8 @@ def install_requirements(
     """
     Install packages from a requirements.txt file into the virtual environment.
 
-    Supports different argument signatures for flexibility.
+    Supports different argument signatures for flexibility. Uses the fastest
+    available installer backend (see `reposmith.installer`).
 
     Returns:
         str: Installation method used ("written(pip)", "written(uv)", or "skipped").
@@ -104,15 +216,10 @@ def install_requirements(
         print("requirements.txt is empty or missing, skipping install.")
         return "skipped"
 
-    if shutil.which("uv"):
-        subprocess.run([py, "-m", "pip", "install", "--upgrade", "pip"], check=True)
-        subprocess.run(["uv", "pip", "install", "-r", req_file, "--python", py], check=True)
-        print("Packages installed via uv.")
-        return "written(uv)"
-
-    subprocess.run([py, "-m", "pip", "install", "-r", req_file, "--upgrade-strategy", "only-if-needed"], check=True)
-    print("Packages installed via pip.")
-    return "written(pip)"
+    installer = get_installer()
+    installer.install(py, requirements=req_file)
+    print(f"Packages installed via {installer.kind}.")
+    return f"written({installer.kind})"
 
 def upgrade_pip(venv_dir: str | os.PathLike) -> str:
     """
@@ -126,7 +233,7 @@ def upgrade_pip(venv_dir: str | os.PathLike) -> str:
     """
     print("\n[5] Upgrading pip")
     py = _venv_python(venv_dir)
-    subprocess.run([py, "-m", "pip", "install", "--upgrade", "pip"], check=True)
+    run_command([py, "-m", "pip", "install", "--upgrade", "pip"])
     print("pip upgraded.")
     return "written"
 
@@ -146,9 +253,11 @@ def create_env_info(venv_dir: str | os.PathLike) -> str:
         "env-info.txt",
     )
     py = _venv_python(venv_dir)
+    version_out = run_command([py, "--version"], capture=True, stream=False).output
+    freeze_out = run_command([py, "-m", "pip", "freeze"], capture=True, stream=False).output
     with open(info_path, "w", encoding="utf-8") as f:
-        subprocess.run([py, "--version"], stdout=f, check=True)
+        f.write(version_out + "\n")
         f.write("\nInstalled packages:\n")
-        subprocess.run([py, "-m", "pip", "freeze"], stdout=f, check=True)
+        f.write(freeze_out + ("\n" if freeze_out else ""))
     print(f"Environment info saved to {info_path}")
     return "written"
\ No newline at end of file
@@ -0,0 +1,196 @@
+# reposmith/verify_utils.py
+"""
+Integrity check of an installed venv against its `*.dist-info/RECORD` files.
+
+Every installed file listed in a RECORD is checked for existence, size and
+(unless `fast=True`) its recorded hash. Files are hashed on a thread pool:
+hashlib releases the GIL for large buffers, and files above MMAP_THRESHOLD
+are memory-mapped instead of read into Python, so hashing a multi-GB ML venv
+is bound by disk throughput rather than by one core. Files in site-packages
+that no RECORD lists are reported as unowned, next to the distribution owning
+the same top-level package when there is one. `__pycache__/` and the files
+venv creators drop into site-packages themselves (VENV_CREATOR_FILES) are
+ignored.
+"""
+from __future__ import annotations
+
+import base64
+import csv
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .core.dists import DIST_INFO_RE, venv_site_packages
+from .core.walk import DESCEND, MATCH, SKIP, scan_tree
+
+MMAP_THRESHOLD = 1 << 20
+UNOWNED = "<unowned>"
+# Written into site-packages by virtualenv and uv, never listed in a RECORD.
+VENV_CREATOR_FILES = frozenset({
+    "_virtualenv.pth", "_virtualenv.py", "distutils-precedence.pth", "README.txt",
+})
+
+
+@dataclass
+class RecordEntry:
+    """One hashed file from a RECORD."""
+
+    path: str
+    algorithm: Optional[str]
+    digest: Optional[str]
+    size: Optional[int]
+
+
+@dataclass
+class DistCheck:
+    """Verification result for one distribution."""
+
+    name: str
+    version: str = ""
+    files: int = 0
+    missing: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    unowned: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.modified or self.unowned)
+
+
+@dataclass
+class VerifyReport:
+    """Outcome of `verify_venv`."""
+
+    venv: Path
+    dists: list[DistCheck] = field(default_factory=list)
+    files_checked: int = 0
+    bytes_hashed: int = 0
+
+    @property
+    def problems(self) -> list[DistCheck]:
+        return [d for d in self.dists if not d.ok]
+
+
+def read_record(dist_info: Path) -> list[RecordEntry]:
+    """Entries of a RECORD file, paths made absolute and normalized."""
+    base = dist_info.parent
+    entries: list[RecordEntry] = []
+    with open(dist_info / "RECORD", newline="", encoding="utf-8") as fh:
+        for row in csv.reader(fh):
+            if not row or not row[0]:
+                continue
+            algorithm = digest = None
+            if len(row) > 1 and "=" in row[1]:
+                algorithm, digest = row[1].split("=", 1)
+            size = int(row[2]) if len(row) > 2 and row[2].strip().isdigit() else None
+            entries.append(RecordEntry(os.path.normpath(os.path.join(base, row[0])), algorithm, digest, size))
+    return entries
+
+
+def file_digest(path: str, algorithm: str, size: int) -> str:
+    """RECORD-style digest (urlsafe base64, no padding) of a file."""
+    h = hashlib.new(algorithm)
+    with open(path, "rb") as fh:
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            h.update(fh.read())
+    return base64.urlsafe_b64encode(h.digest()).rstrip(b"=").decode("ascii")
+
+
+def _check(entry: RecordEntry, fast: bool) -> tuple[str, int]:
+    """"missing", "modified" or "ok", plus the number of bytes hashed."""
+    try:
+        size = os.stat(entry.path).st_size
+    except FileNotFoundError:
+        return "missing", 0
+    except OSError:
+        return "modified", 0
+    if entry.size is not None and size != entry.size:
+        return "modified", 0
+    if fast or not entry.digest or entry.algorithm not in hashlib.algorithms_available:
+        return "ok", 0
+    try:
+        return ("ok" if file_digest(entry.path, entry.algorithm, size) == entry.digest else "modified"), size
+    except OSError:
+        return "modified", 0
+
+
+def _top_level(path: str, site: str) -> str:
+    return os.path.relpath(path, site).split(os.sep, 1)[0]
+
+
+def verify_venv(venv: Path, *, fast: bool = False, jobs: Optional[int] = None) -> VerifyReport:
+    """
+    Check every file recorded in the venv's RECORD files.
+
+    Args:
+        venv (Path): The virtual environment.
+        fast (bool): Compare sizes only, never hash.
+        jobs (Optional[int]): Worker threads (default: 2 x CPU count).
+
+    Returns:
+        VerifyReport: Per-distribution missing, modified and unowned files.
+    """
+    venv = Path(venv)
+    report = VerifyReport(venv)
+    work: list[tuple[DistCheck, RecordEntry]] = []
+    owned: set[str] = set()
+    owners: dict[str, DistCheck] = {}  # top-level name in site-packages -> distribution
+    sites = [str(sp) for sp in venv_site_packages(venv)]
+    for site in sites:
+        for dist_info in sorted(Path(site).glob("*.dist-info")):
+            m = DIST_INFO_RE.match(dist_info.name)
+            check = DistCheck(*(m.groups() if m else (dist_info.name,)))
+            report.dists.append(check)
+            try:
+                entries = read_record(dist_info)
+            except OSError:
+                check.missing.append(str(dist_info / "RECORD"))
+                continue
+            for entry in entries:
+                owned.add(entry.path)
+                if entry.path.startswith(site + os.sep):
+                    owners.setdefault(_top_level(entry.path, site), check)
+                if entry.digest or entry.size is not None:
+                    work.append((check, entry))
+            check.files = len(entries)
+
+    if work:
+        workers = max(1, min(jobs or 2 * (os.cpu_count() or 2), len(work)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reposmith-verify") as pool:
+            results = list(pool.map(lambda item: _check(item[1], fast), work))
+        for (check, entry), (status, hashed) in zip(work, results):
+            report.bytes_hashed += hashed
+            if status == "missing":
+                check.missing.append(entry.path)
+            elif status == "modified":
+                check.modified.append(entry.path)
+        report.files_checked = len(work)
+
+    def classify(entry: os.DirEntry) -> str:
+        if entry.is_dir(follow_symlinks=False):
+            return SKIP if entry.name == "__pycache__" else DESCEND
+        if entry.name in VENV_CREATOR_FILES and os.path.dirname(os.path.normpath(entry.path)) in sites:
+            return SKIP
+        return MATCH
+
+    stray: Optional[DistCheck] = None
+    for entry in sorted(scan_tree(sites, classify, jobs=jobs), key=lambda e: e.path):
+        path = os.path.normpath(entry.path)
+        if path in owned:
+            continue
+        site = next(s for s in sites if path.startswith(s + os.sep))
+        owner = owners.get(_top_level(path, site))
+        if owner is None:
+            if stray is None:
+                stray = DistCheck(UNOWNED)
+                report.dists.append(stray)
+            owner = stray
+        owner.unowned.append(path)
+    return report
@@ -3,8 +3,10 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
+from typing import Callable, Optional, Sequence
 
 from .core.fs import write_file
+from .matrix_utils import MATRIX_PREFIX
 
 def _venv_python_path(venv_dir: Path) -> str:
     """
@@ -24,13 +26,57 @@ def _venv_python_path(venv_dir: Path) -> str:
         candidate = venv_dir / "bin" / "python3"
         return str(candidate) if candidate.exists() else "python3"
 
+def _pycache_env(pycache_prefix: Optional[str]) -> dict[str, str]:
+    """PYTHONPYCACHEPREFIX for VS Code, relative prefixes anchored at the workspace."""
+    if not pycache_prefix:
+        return {}
+    value = pycache_prefix if os.path.isabs(pycache_prefix) else f"${{workspaceFolder}}/{pycache_prefix}"
+    return {"PYTHONPYCACHEPREFIX": value}
+
+def _matrix_python(name: str) -> dict[str, object]:
+    """Workspace-relative interpreter of a matrix venv, with the Windows variant."""
+    return {
+        "python": f"${{workspaceFolder}}/{name}/bin/python",
+        "windows": {"python": f"${{workspaceFolder}}/{name}/Scripts/python.exe"},
+    }
+
+def _merge_entries(
+    path: Path,
+    document: dict,
+    key: str,
+    owned: Callable[[dict], bool],
+    force: bool,
+) -> str:
+    """
+    Write `document` to `path`, or merge its `key` list into an existing file.
+
+    Entries of the existing file for which `owned` is true (ones reposmith
+    generated earlier) are replaced; everything else is kept. A file that is
+    not plain JSON (e.g. has comments) is left alone unless `force` is set.
+
+    Returns:
+        str: "written" or "exists" (nothing changed).
+    """
+    if path.exists() and not force:
+        try:
+            current = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return "exists"
+        kept = [e for e in current.get(key, []) if not (isinstance(e, dict) and owned(e))]
+        document = {**current, key: kept + document[key]}
+        if document == current:
+            return "exists"
+    return write_file(path, json.dumps(document, indent=2), force=True, backup=True)
+
 def create_vscode_files(
     root_dir: Path,
     venv_dir: Path,
     *,
     main_file: str = "main.py",
     force: bool = False,
-) -> None:
+    matrix_venvs: Sequence[Path] = (),
+    pycache_prefix: Optional[str] = None,
+) -> dict[str, str]:
     """
     Safely create/update VS Code configuration files for a project.
 
@@ -44,20 +90,35 @@ def create_vscode_files(
         venv_dir (Path): Path to the virtual environment.
         main_file (str, optional): Main script name. Defaults to "main.py".
         force (bool, optional): Overwrite files if True. Defaults to False.
+        matrix_venvs (Sequence[Path], optional): Extra per-interpreter
+            environments (`.venv-X.Y`), each getting a debug configuration
+            that runs the main script with its interpreter. These are merged
+            into an existing launch.json even without `force`.
+        pycache_prefix (Optional[str], optional): Bytecode directory set as
+            PYTHONPYCACHEPREFIX for terminals and debug sessions.
+
+    Returns:
+        dict[str, str]: "written" or "exists" for each of settings.json,
+        launch.json and project.code-workspace.
     """
     root = Path(root_dir)
     vscode = root / ".vscode"
+    states: dict[str, str] = {}
     vscode.mkdir(parents=True, exist_ok=True)
 
     py_path = _venv_python_path(venv_dir)
+    env = _pycache_env(pycache_prefix)
 
     # settings.json
     settings = {
         "python.defaultInterpreterPath": py_path,
         "python.analysis.autoImportCompletions": True,
-        "terminal.integrated.env.windows": {},
+        "terminal.integrated.env.windows": dict(env),
     }
-    write_file(
+    if env:
+        settings["terminal.integrated.env.linux"] = dict(env)
+        settings["terminal.integrated.env.osx"] = dict(env)
+    states["settings.json"] = write_file(
         vscode / "settings.json",
         json.dumps(settings, indent=2),
         force=force,
@@ -65,35 +126,112 @@ def create_vscode_files(
     )
 
     # launch.json
-    launch = {
-        "version": "0.2.0",
-        "configurations": [
-            {
-                "name": f"Python: {main_file}",
-                "type": "python",
-                "request": "launch",
-                "program": main_file,
-                "console": "integratedTerminal",
-            }
-        ],
-    }
-    write_file(
-        vscode / "launch.json",
-        json.dumps(launch, indent=2),
-        force=force,
-        backup=True,
-    )
+    def debug_config(name: str, **extra: object) -> dict:
+        return {
+            "name": name,
+            "type": "python",
+            "request": "launch",
+            "program": main_file,
+            "console": "integratedTerminal",
+            **({"env": env} if env else {}),
+            **extra,
+        }
+
+    main_config = debug_config(f"Python: {main_file}")
+    matrix_configs = [
+        debug_config(f"Python: {main_file} ({Path(v).name})", **_matrix_python(Path(v).name)) for v in matrix_venvs
+    ]
+    launch_path = vscode / "launch.json"
+    states["launch.json"] = "exists"
+    if force or not launch_path.exists():
+        states["launch.json"] = write_file(
+            launch_path,
+            json.dumps({"version": "0.2.0", "configurations": [main_config, *matrix_configs]}, indent=2),
+            force=True,
+            backup=True,
+        )
+    elif matrix_configs:
+        states["launch.json"] = _merge_entries(
+            launch_path,
+            {"configurations": matrix_configs},
+            "configurations",
+            lambda c: f"({MATRIX_PREFIX}" in str(c.get("name", "")),
+            force=False,
+        )
 
     # project.code-workspace
     workspace = {
         "folders": [{"path": "."}],
         "settings": {"python.defaultInterpreterPath": py_path},
     }
-    write_file(
+    states["project.code-workspace"] = write_file(
         root / "project.code-workspace",
         json.dumps(workspace, indent=2),
         force=force,
         backup=True,
     )
 
-    print("VS Code files updated: settings.json, launch.json, project.code-workspace")
+    print("VS Code files: " + ", ".join(f"{name} ({state})" for name, state in states.items()))
+    return states
+
+def create_vscode_tasks(
+    root_dir: Path,
+    matrix_venvs: Sequence[Path],
+    *,
+    force: bool = False,
+    pycache_prefix: Optional[str] = None,
+) -> str:
+    """
+    Write .vscode/tasks.json with one pytest task per matrix environment.
+
+    A "tests: all interpreters" task (the default test task) runs every
+    per-interpreter task in parallel. In an existing tasks.json only these
+    generated tasks are replaced, so new interpreters appear while the
+    user's own tasks stay.
+
+    Args:
+        root_dir (Path): Project root directory.
+        matrix_venvs (Sequence[Path]): Environments such as `.venv-3.12`.
+        force (bool, optional): Overwrite an existing tasks.json entirely.
+            Defaults to False.
+        pycache_prefix (Optional[str], optional): PYTHONPYCACHEPREFIX for the tasks.
+
+    Returns:
+        str: "written" or "exists".
+    """
+    root = Path(root_dir)
+    env = _pycache_env(pycache_prefix)
+    tasks = []
+    for venv in matrix_venvs:
+        name = Path(venv).name
+        tasks.append(
+            {
+                "label": f"tests: {name}",
+                "type": "process",
+                "command": f"${{workspaceFolder}}/{name}/bin/python",
+                "windows": {"command": f"${{workspaceFolder}}/{name}/Scripts/python.exe"},
+                "args": ["-m", "pytest", "-q"],
+                **({"options": {"env": env}} if env else {}),
+                "group": "test",
+                "problemMatcher": [],
+            }
+        )
+    tasks.append(
+        {
+            "label": "tests: all interpreters",
+            "dependsOn": [t["label"] for t in tasks],
+            "dependsOrder": "parallel",
+            "group": {"kind": "test", "isDefault": True},
+            "problemMatcher": [],
+        }
+    )
+    (root / ".vscode").mkdir(parents=True, exist_ok=True)
+    state = _merge_entries(
+        root / ".vscode" / "tasks.json",
+        {"version": "2.0.0", "tasks": tasks},
+        "tasks",
+        lambda t: str(t.get("label", "")).startswith(("tests: all interpreters", f"tests: {MATRIX_PREFIX}")),
+        force,
+    )
+    print(f"VS Code tasks.json: {state} ({len(matrix_venvs)} interpreter(s))")
+    return state
@@ -0,0 +1,284 @@
+# reposmith/wheelhouse_utils.py
+"""
+Local wheelhouses for deterministic, network-free installs.
+
+`build_wheelhouse` resolves a requirements set once (`pip install --dry-run
+--report`), then downloads every pinned distribution and builds wheels for
+any sdists in parallel. `wheelhouse_env` turns a wheelhouse into environment
+variables that point pip and uv at it; in offline mode they also forbid the
+package index, so every installer uses only the local directory.
+
+`start_prefetch` runs the same build in the background, into a cache
+directory keyed by the requirements and target interpreter, so downloads
+overlap with venv creation and the install step can stay local-only.
+"""
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from .core.deadline import Deadline, current_deadline, deadline_scope
+from .core.runner import run_command
+from .utils.paths import cache_dir
+
+SDIST_SUFFIXES = (".tar.gz", ".zip", ".tar.bz2", ".tgz")
+
+
+@dataclass
+class WheelhouseReport:
+    """Outcome of `build_wheelhouse`."""
+
+    dest: Path
+    pins: list[str] = field(default_factory=list)
+    wheels: list[Path] = field(default_factory=list)
+    built: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+
+def wheelhouse_env(wheelhouse: Optional[Path], offline: bool = False) -> dict[str, str]:
+    """
+    Environment variables that make pip and uv install from `wheelhouse`.
+
+    Args:
+        wheelhouse (Optional[Path]): Directory of wheels, or None.
+        offline (bool): Also disable the package index entirely.
+
+    Returns:
+        dict[str, str]: Variables to apply with `command_env`.
+
+    Raises:
+        ValueError: If `offline` is set without a wheelhouse.
+    """
+    if wheelhouse is None:
+        if offline:
+            raise ValueError("Offline mode needs a wheelhouse (--wheelhouse DIR).")
+        return {}
+    links = str(Path(wheelhouse).resolve())
+    env = {
+        "PIP_FIND_LINKS": links,
+        "UV_FIND_LINKS": links,
+        "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+    }
+    if offline:
+        env.update({"PIP_NO_INDEX": "1", "UV_NO_INDEX": "1", "UV_OFFLINE": "1"})
+    return env
+
+
+def pins_from_report(report: dict[str, Any]) -> list[str]:
+    """
+    Turn a `pip install --report` document into installable requirement strings.
+
+    Index packages become `name==version`; direct references keep their URL.
+    """
+    pins: list[str] = []
+    for item in report.get("install", []):
+        meta = item.get("metadata") or {}
+        if item.get("is_direct"):
+            pins.append(item["download_info"]["url"])
+        else:
+            pins.append(f"{meta['name']}=={meta['version']}")
+    return pins
+
+
+def _resolve(python: str, requirements: Optional[Path], extra: Sequence[str]) -> list[str]:
+    with tempfile.TemporaryDirectory(prefix="reposmith-wh-") as tmp:
+        report = Path(tmp) / "report.json"
+        cmd = [python, "-m", "pip", "install", "--dry-run", "--ignore-installed", "--quiet", "--report", str(report)]
+        if requirements is not None:
+            cmd += ["-r", str(requirements)]
+        run_command(cmd + list(extra), stream=False)
+        return pins_from_report(json.loads(report.read_text(encoding="utf-8")))
+
+
+def _download(python: str, pin: str, dest: Path) -> None:
+    run_command([python, "-m", "pip", "download", "--no-deps", "--quiet", "--dest", str(dest), pin], stream=False)
+
+
+def _build(python: str, sdist: Path, dest: Path) -> None:
+    run_command([python, "-m", "pip", "wheel", "--no-deps", "--quiet", "--wheel-dir", str(dest), str(sdist)], stream=False)
+    sdist.unlink()
+
+
+def _parallel(jobs: int, fn, items: Sequence[Any]) -> dict[Any, str]:
+    """Run `fn(item)` on a thread pool; return {item: error} for failures."""
+    if not items:
+        return {}
+    errors: dict[Any, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(items))), thread_name_prefix="reposmith-wh") as pool:
+        # A fresh context per task keeps the caller's deadline in every worker.
+        futures = {pool.submit(contextvars.copy_context().run, fn, item): item for item in items}
+        for fut, item in futures.items():
+            try:
+                fut.result()
+            except Exception as e:
+                errors[item] = str(e)
+    return errors
+
+
+def build_wheelhouse(
+    dest: Path,
+    requirements: Optional[Path] = None,
+    *,
+    extra: Sequence[str] = ("pip",),
+    python: Optional[str] = None,
+    jobs: Optional[int] = None,
+) -> WheelhouseReport:
+    """
+    Download and build wheels for a requirements set into `dest`.
+
+    The set is resolved once, so every pin is consistent; downloads and sdist
+    builds then run in parallel. pip is included by default so `uv venv --seed`
+    and pip self-checks also work offline.
+
+    Args:
+        dest (Path): Wheelhouse directory (created if missing).
+        requirements (Optional[Path]): requirements.txt to resolve.
+        extra (Sequence[str]): Additional requirement strings.
+        python (Optional[str]): Interpreter whose platform and ABI the wheels
+            target (default: the current one).
+        jobs (Optional[int]): Parallel downloads/builds (default: CPU count).
+
+    Returns:
+        WheelhouseReport: Pins, wheels present and per-pin failures.
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    python = python or sys.executable
+    jobs = jobs or os.cpu_count() or 4
+    report = WheelhouseReport(dest=dest)
+
+    print(f"\n[wheelhouse] Resolving {requirements or 'extra requirements'} ...")
+    report.pins = _resolve(python, requirements, extra)
+    print(f"[wheelhouse] Downloading {len(report.pins)} distribution(s) with {jobs} worker(s)")
+    report.failed.update(_parallel(jobs, lambda pin: _download(python, pin, dest), report.pins))
+
+    sdists = sorted(p for p in dest.iterdir() if p.name.endswith(SDIST_SUFFIXES))
+    if sdists:
+        print(f"[wheelhouse] Building {len(sdists)} wheel(s) from source")
+        errors = _parallel(jobs, lambda s: _build(python, s, dest), sdists)
+        report.failed.update({s.name: e for s, e in errors.items()})
+        report.built = [s.name for s in sdists if s not in errors]
+
+    report.wheels = sorted(dest.glob("*.whl"))
+    print(f"[wheelhouse] {len(report.wheels)} wheel(s) in {dest}" + (f", {len(report.failed)} failed" if report.failed else ""))
+    return report
+
+
+def prefetch_dir(requirements: Path, python: str, extra: Sequence[str] = ()) -> Path:
+    """Cache directory for a prefetch of `requirements` targeting `python`."""
+    h = hashlib.sha256(Path(requirements).read_bytes())
+    h.update("\0".join([os.path.realpath(python), *extra]).encode("utf-8"))
+    return cache_dir() / "prefetch" / h.hexdigest()[:16]
+
+
+class Prefetch:
+    """
+    A `build_wheelhouse` running in the background.
+
+    Created by `start_prefetch`; `result()` waits for it to finish and
+    `cancel()` stops it early.
+    """
+
+    def __init__(
+        self,
+        dest: Path,
+        future: "Future[WheelhouseReport]",
+        *,
+        thread: Optional[threading.Thread] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
+        self.dest = dest
+        self._future = future
+        self._thread = thread
+        self._deadline = deadline
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def cancel(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop the prefetch: no further download or build starts, and the
+        worker is joined for up to `timeout` seconds (the command already
+        running finishes on its own).
+
+        Returns:
+            bool: True if the worker has stopped.
+        """
+        if self._deadline is not None:
+            self._deadline.cancel()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return self.done()
+
+    def result(self, timeout: Optional[float] = None) -> Optional[WheelhouseReport]:
+        """
+        Wait for the prefetch.
+
+        Returns:
+            Optional[WheelhouseReport]: The report if every distribution is
+            local, or None if the prefetch failed or did not finish in time.
+        """
+        try:
+            report = self._future.result(timeout=timeout)
+        except Exception:
+            return None
+        return report if report.ok else None
+
+
+def start_prefetch(
+    requirements: Path,
+    *,
+    python: Optional[str] = None,
+    extra: Sequence[str] = ("pip",),
+    jobs: Optional[int] = None,
+) -> Prefetch:
+    """
+    Start downloading wheels for `requirements` in a background thread.
+
+    The caller's context (deadline, command environment) is carried into the
+    worker. A directory left by an earlier prefetch of the same inputs is
+    reused, so warm runs only re-resolve.
+
+    Args:
+        requirements (Path): requirements.txt to prefetch.
+        python (Optional[str]): Interpreter the wheels must suit.
+        extra (Sequence[str]): Additional requirement strings.
+        jobs (Optional[int]): Parallel downloads/builds.
+
+    Returns:
+        Prefetch: Handle to wait on.
+    """
+    python = python or sys.executable
+    dest = prefetch_dir(requirements, python, extra)
+    future: "Future[WheelhouseReport]" = Future()
+    ctx = contextvars.copy_context()
+    # Own deadline within the caller's, so `cancel()` stops only the prefetch.
+    deadline = (current_deadline() or Deadline()).child(None)
+
+    def _build() -> WheelhouseReport:
+        with deadline_scope(deadline):
+            return build_wheelhouse(dest, requirements, extra=extra, python=python, jobs=jobs)
+
+    def _work() -> None:
+        try:
+            future.set_result(ctx.run(_build))
+        except BaseException as e:
+            future.set_exception(e)
+
+    thread = threading.Thread(target=_work, name="reposmith-prefetch", daemon=True)
+    thread.start()
+    return Prefetch(dest, future, thread=thread, deadline=deadline)
@@ -0,0 +1,193 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+from reposmith import api
+from reposmith.api import ProjectSpec, init_project, init_project_async
+from reposmith.core.runner import run_command
+
+
+def test_init_project_reports_steps_and_paths(tmp_path):
+    """init_project returns per-step status and the files it wrote."""
+    spec = ProjectSpec(root=tmp_path / "proj", no_venv=True, with_gitignore=True)
+    result = init_project(spec)
+
+    assert result.ok
+    assert [s.name for s in result.steps][:2] == ["venv", "entry"]
+    assert result.step("venv").status == "skipped"
+    assert result.step("entry").status == "written"
+    assert result.step("license").status == "skipped"
+    assert (tmp_path / "proj" / "run.py") in result.written_paths
+    assert (tmp_path / "proj" / ".gitignore") in result.written_paths
+    assert all(s.duration >= 0 for s in result.steps)
+
+
+def test_vscode_step_reports_existing_files(tmp_path):
+    """A re-run that leaves the VS Code files untouched reports "exists"."""
+    spec = ProjectSpec(root=tmp_path, no_venv=True, with_vscode=True)
+    assert init_project(spec).step("vscode").status == "written"
+    assert init_project(spec).step("vscode").status == "exists"
+
+
+def test_init_project_leaves_process_state_alone(tmp_path, monkeypatch):
+    """The API must not touch os.environ or sys.stdout."""
+    import sys
+
+    monkeypatch.delenv("REPOSMITH_NO_EMOJI", raising=False)
+    before_env = dict(os.environ)
+    before_stdout = sys.stdout
+
+    init_project(ProjectSpec(root=tmp_path, no_venv=True))
+
+    assert dict(os.environ) == before_env
+    assert sys.stdout is before_stdout
+
+
+def test_all_addons_expands_without_mutating_namespace(tmp_path):
+    """--all is expanded on a copy of the spec; the Namespace stays untouched."""
+    ns = argparse.Namespace(root=tmp_path, all=True, use_uv=False, with_vscode=False)
+    spec = ProjectSpec.from_namespace(ns)
+
+    assert spec.resolved().with_vscode and spec.resolved().use_uv
+    assert ns.with_vscode is False and ns.use_uv is False
+
+
+def test_init_project_async_and_progress_callback(tmp_path):
+    """The async flavor yields the same result and streams every step."""
+    seen = []
+    spec = ProjectSpec(root=tmp_path, no_venv=True, entry="main.py")
+    result = asyncio.run(init_project_async(spec, on_step=seen.append))
+
+    assert [s.name for s in seen] == [s.name for s in result.steps]
+    assert (Path(tmp_path) / "main.py").exists()
+
+
+def test_offline_install_env_reaches_every_step(tmp_path, monkeypatch):
+    """--wheelhouse/--offline apply to installer commands without touching os.environ."""
+    seen = {}
+
+    def deps(root, prefer_uv=True, offline=False, **kw):
+        code = "import os; print(os.environ.get('PIP_NO_INDEX'), os.environ.get('PIP_FIND_LINKS'))"
+        seen["env"] = run_command([sys.executable, "-c", code], capture=True, stream=False).output
+        seen["offline"] = offline
+
+    monkeypatch.setattr(api, "post_init_dependency_setup", deps)
+    wh = tmp_path / "wh"
+    wh.mkdir()
+    result = init_project(ProjectSpec(root=tmp_path / "proj", no_venv=True, wheelhouse=wh, offline=True))
+
+    assert result.ok
+    assert seen == {"env": f"1 {wh.resolve()}", "offline": True}
+    assert "PIP_NO_INDEX" not in os.environ
+
+
+def test_prefetch_overlaps_venv_and_installs_locally(tmp_path, monkeypatch):
+    """With prefetch, downloads start before the venv step and deps install without the index."""
+    from concurrent.futures import Future
+
+    from reposmith.wheelhouse_utils import Prefetch, WheelhouseReport
+
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "requirements.txt").write_text("six\n", encoding="utf-8")
+    order = []
+    wheels = tmp_path / "prefetched"
+    wheels.mkdir()
+
+    def fake_start(req, python=None, extra=()):
+        order.append("prefetch")
+        fut = Future()
+        fut.set_result(WheelhouseReport(dest=wheels))
+        return Prefetch(wheels, fut)
+
+    def fake_venv(venv_dir, python_version=None, backend="auto"):
+        order.append("venv")
+        return "written"
+
+    def deps(root, prefer_uv=True, offline=False, **kw):
+        code = "import os; print(os.environ.get('PIP_NO_INDEX'), os.environ.get('PIP_FIND_LINKS'))"
+        order.append(("deps", offline, run_command([sys.executable, "-c", code], capture=True, stream=False).output))
+
+    monkeypatch.setattr(api, "start_prefetch", fake_start)
+    monkeypatch.setattr(api, "create_virtualenv", fake_venv)
+    monkeypatch.setattr(api, "post_init_dependency_setup", deps)
+
+    result = init_project(ProjectSpec(root=root, prefetch=True))
+
+    assert result.ok
+    assert order == ["prefetch", "venv", ("deps", True, f"1 {wheels.resolve()}")]
+
+
+def test_bytecode_step_uses_uv_compile_when_it_can(tmp_path, monkeypatch):
+    """uv precompiles site-packages during the install; the step then only compiles the project."""
+    from reposmith.installer import Installer
+
+    root = tmp_path / "proj"
+    py = Path(api._venv_python(root / ".venv"))
+    py.parent.mkdir(parents=True)
+    py.write_text("")
+    seen = {}
+
+    def deps(root, prefer_uv=True, offline=False, **kw):
+        code = "import os; print(os.environ.get('UV_COMPILE_BYTECODE'))"
+        seen["env"] = run_command([sys.executable, "-c", code], capture=True, stream=False).output
+
+    def precompile(root, python, **kw):
+        seen["compile"] = kw
+        return [str(root)]
+
+    monkeypatch.setattr(api, "post_init_dependency_setup", deps)
+    monkeypatch.setattr(api, "precompile_project", precompile)
+    monkeypatch.setattr(api, "get_installer", lambda name="auto": Installer("uv", ("uv",)))
+
+    result = init_project(ProjectSpec(root=root, use_uv=True, compile_bytecode=True))
+    assert result.step("bytecode").status == "written"
+    assert seen["env"] == "1"
+    assert seen["compile"] == {"invalidation_mode": "timestamp", "pycache_prefix": None, "include_site": False}
+
+    seen.clear()
+    result = init_project(ProjectSpec(root=root, use_uv=True, compile_bytecode=True, invalidation_mode="unchecked-hash"))
+    assert seen["env"] == "None" and seen["compile"]["include_site"] is True
+
+
+def test_failed_hard_step_cancels_prefetch(tmp_path, monkeypatch):
+    """Aborting on a hard step stops a prefetch that deps would have consumed."""
+    from concurrent.futures import Future
+
+    from reposmith.wheelhouse_utils import Prefetch
+
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "requirements.txt").write_text("six\n", encoding="utf-8")
+    cancelled = []
+
+    class FakePrefetch(Prefetch):
+        def cancel(self, timeout=None):
+            cancelled.append(timeout)
+            return True
+
+    def broken_venv(venv_dir, python_version=None, backend="auto"):
+        raise RuntimeError("no interpreter")
+
+    monkeypatch.setattr(api, "start_prefetch", lambda req, python=None, extra=(): FakePrefetch(root, Future()))
+    monkeypatch.setattr(api, "create_virtualenv", broken_venv)
+    result = init_project(ProjectSpec(root=root, prefetch=True))
+
+    assert [s.name for s in result.steps] == ["venv"] and not result.ok
+    assert cancelled == [api.PREFETCH_CANCEL_TIMEOUT]
+
+
+def test_soft_step_warning_names_the_step(tmp_path, monkeypatch, caplog):
+    """A failing soft step is reported under its own name."""
+    def fail(spec, logger):
+        raise RuntimeError("compileall broke")
+
+    monkeypatch.setattr(api, "INIT_STEPS", [("bytecode", fail)])
+    with caplog.at_level(logging.WARNING, logger="t"):
+        result = init_project(ProjectSpec(root=tmp_path / "proj", no_venv=True), logging.getLogger("t"))
+    assert result.completed
+    assert "Step 'bytecode' failed (continuing): compileall broke" in caplog.text
+    assert "dependency" not in caplog.text
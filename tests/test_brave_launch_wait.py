@@ -0,0 +1,98 @@
+import importlib.util
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location("brave_tool", Path(__file__).parents[1] / "tools" / "brave.py")
+brave = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(brave)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _listen_later(port, delay):
+    """Accept connections on `port` after `delay` seconds; returns a stop function."""
+    srv = socket.socket()
+    srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    stop = threading.Event()
+
+    def run():
+        time.sleep(delay)
+        srv.bind(("127.0.0.1", port))
+        srv.listen()
+        srv.settimeout(0.1)
+        while not stop.is_set():
+            try:
+                srv.accept()[0].close()
+            except OSError:
+                pass
+        srv.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return stop.set
+
+
+@pytest.fixture
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(brave, "PROBE_BACKOFF", (0.02, 0.1))
+
+
+def test_wait_for_ports_reports_ready_and_failed(fast_backoff):
+    late, never = _free_port(), _free_port()
+    stop = _listen_later(late, 0.3)
+    seen = []
+    try:
+        ready, failed = brave.wait_for_ports([late, never], timeout=1.5, on_ready=seen.append, host="127.0.0.1")
+    finally:
+        stop()
+    assert ready == [late] and failed == [never] and seen == [late]
+
+
+def test_http_probe_requires_a_response(fast_backoff):
+    class Handler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    silent = _free_port()
+    stop = _listen_later(silent, 0)  # accepts, then closes without answering
+    try:
+        port = server.server_address[1]
+        ready, failed = brave.wait_for_ports([port, silent], timeout=1, http=True, host="127.0.0.1")
+    finally:
+        server.shutdown()
+        stop()
+    assert ready == [port] and failed == [silent]
+
+
+def test_launch_wait_opens_tabs_only_when_ready(tmp_path, monkeypatch, capsys, fast_backoff):
+    up, down = _free_port(), _free_port()
+    (tmp_path / brave.PORTS_FILE).write_text(f"{up}\n{down}\n")
+    (tmp_path / brave.URLS_FILE).write_text("https://docs.example.org\n")
+    calls = []
+    monkeypatch.setattr(brave, "find_chromium_like", lambda: ["browser"])
+    monkeypatch.setattr(brave, "run_popen", calls.append)
+    stop = _listen_later(up, 0.2)
+    try:
+        brave.main(["--root", str(tmp_path), "launch", "--wait", "--wait-timeout", "1.5"])
+    finally:
+        stop()
+    profile = f"--user-data-dir={tmp_path / brave.PROFILE_DIRNAME}"
+    assert calls == [
+        ["browser", profile, "--new-tab", "https://docs.example.org"],
+        ["browser", profile, f"http://localhost:{up}"],
+    ]
+    assert f"Port {down} not ready after 1.5s" in capsys.readouterr().out
@@ -0,0 +1,49 @@
+import struct
+import sys
+
+import pytest
+
+import reposmith.bytecode_utils as bu
+
+
+def _project(tmp_path):
+    (tmp_path / "pkg").mkdir(parents=True)
+    (tmp_path / "pkg" / "mod.py").write_text("X = 1\n")
+    (tmp_path / ".venv" / "lib").mkdir(parents=True)
+    (tmp_path / ".venv" / "lib" / "skip.py").write_text("Y = 2\n")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "skip.py").write_text("Z = 3\n")
+    return tmp_path
+
+
+def _flags(pyc):
+    return struct.unpack("<I", pyc.read_bytes()[4:8])[0]
+
+
+def test_unchecked_hash_still_checks_project_sources(tmp_path):
+    root = _project(tmp_path)
+    compiled = bu.precompile_project(root, sys.executable, invalidation_mode="unchecked-hash", include_site=False)
+    assert compiled == [str(root)]
+    (pyc,) = (root / "pkg" / "__pycache__").glob("mod.*.pyc")
+    assert _flags(pyc) == 0b11  # hash-based and checked: edits are picked up
+    assert not list((root / ".venv").rglob("*.pyc")) and not list((root / "build").rglob("*.pyc"))
+
+
+def test_excludes_only_apply_below_the_project(tmp_path):
+    root = _project(tmp_path / "build" / "proj")
+    bu.precompile_project(root, sys.executable, include_site=False)
+    assert list((root / "pkg" / "__pycache__").glob("mod.*.pyc"))
+    assert not list((root / "build").rglob("*.pyc"))
+
+
+def test_pycache_prefix_keeps_sources_clean(tmp_path):
+    root = _project(tmp_path)
+    bu.precompile_project(root, sys.executable, pycache_prefix=".pyc-cache", include_site=False)
+    assert not (root / "pkg" / "__pycache__").exists()
+    assert list((root / ".pyc-cache").rglob("mod.*.pyc"))
+
+
+def test_site_packages_and_mode_validation():
+    assert any("site-packages" in d or "dist-packages" in d for d in bu.site_packages(sys.executable))
+    with pytest.raises(ValueError):
+        bu.compile_tree(sys.executable, ["."], invalidation_mode="sometimes")
@@ -0,0 +1,103 @@
+import os
+import time
+
+import pytest
+
+import reposmith.cache_utils as cu
+from reposmith.core.runner import command_env
+from reposmith.matrix_utils import wheel_cache_env
+
+
+def _write(path, size, age_days=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    t = time.time() - age_days * 86400
+    os.utime(path, (t, t))
+    return path
+
+
+@pytest.fixture
+def caches(tmp_path, monkeypatch):
+    """A fake uv cache and pip cache with entries of known size and age."""
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path / "own"))
+    monkeypatch.delenv(cu.SHARED_CACHE_ENV, raising=False)
+    uv, pip = tmp_path / "uv", tmp_path / "pip"
+    _write(uv / "CACHEDIR.TAG", 10)
+    _write(uv / "archive-v0" / "abc" / "requests-2.32.0.dist-info" / "METADATA", 100, age_days=40)
+    _write(uv / "archive-v0" / "abc" / "requests" / "__init__.py", 900, age_days=40)
+    _write(uv / "wheels-v5" / "pypi" / "numpy" / "1.0" / "x.http", 5000, age_days=2)
+    _write(pip / "wheels" / "aa" / "bb" / "click-8.1.0-py3-none-any.whl", 300, age_days=100)
+    _write(pip / "http-v2" / "0" / "1" / "blob", 50)
+    locs = [cu.CacheLocation("uv", uv, "uv"), cu.CacheLocation("pip", pip, "pip")]
+    return locs
+
+
+def test_scan_attributes_size_to_packages_and_ages(caches):
+    stats = cu.scan_caches(caches, jobs=3)
+    assert stats.total_bytes == 1000 + 5000 + 300 + 50  # CACHEDIR.TAG is not an entry
+    assert stats.by_location() == {"uv": 6000, "pip": 350}
+    by_pkg = stats.by_package()
+    assert by_pkg["numpy"] == 5000 and by_pkg["requests"] == 1000 and by_pkg["click"] == 300
+    assert by_pkg["(other)"] == 50
+    ages = stats.by_age()
+    assert ages["< 1 day"] == 50 and ages["< 1 week"] == 5000 and ages["< 90 days"] == 1000 and ages["older"] == 300
+
+
+def test_prune_is_lru_and_keeps_lock_pins(caches, tmp_path):
+    project = tmp_path / "proj"
+    project.mkdir()
+    (project / "requirements.lock").write_text("requests==2.32.0 \\\n    --hash=sha256:00\n")
+    stats = cu.scan_caches(caches)
+
+    report = cu.prune_caches(stats, budget=400, project=project, dry_run=True)
+    assert [e.package for e in report.removed] == ["click", "numpy", None]  # oldest first, requests pinned
+    assert report.pinned == 1 and report.remaining_bytes == 1000
+    assert (tmp_path / "uv" / "wheels-v5" / "pypi" / "numpy").exists()
+
+    report = cu.prune_caches(stats, older_than=30 * 86400, project=project)
+    assert [e.package for e in report.removed] == ["click"]
+    assert not list((tmp_path / "pip" / "wheels").rglob("*.whl"))
+    assert (tmp_path / "uv" / "archive-v0" / "abc").exists()
+
+
+def test_pin_project_survives_in_pins_file(caches, tmp_path):
+    project = tmp_path / "proj"
+    project.mkdir()
+    (project / "requirements.txt").write_text("numpy>=1\nclick==8.1.0  # cli\n")
+    assert cu.pin_project(project) == {"numpy": None, "click": "8.1.0"}
+    report = cu.prune_caches(cu.scan_caches(caches), budget=0, dry_run=True)
+    assert {e.package for e in report.removed} == {"requests", None}
+    cu.pin_project(project, remove=True)
+    assert cu.load_pins() == {}
+
+
+def test_shared_cache_reaches_matrix_installs(tmp_path, monkeypatch):
+    monkeypatch.delenv("UV_CACHE_DIR", raising=False)
+    monkeypatch.delenv("PIP_CACHE_DIR", raising=False)
+    monkeypatch.setenv(cu.SHARED_CACHE_ENV, str(tmp_path / "fleet"))
+    env = cu.shared_cache_env()
+    assert env == {"UV_CACHE_DIR": str(tmp_path / "fleet" / "uv"), "PIP_CACHE_DIR": str(tmp_path / "fleet" / "pip")}
+    with command_env(env):
+        assert wheel_cache_env() == env
+    assert "shared:uv" in [loc.name for loc in cu.cache_locations()]
+
+
+def test_uv_entries_are_pruned_through_uv(caches, tmp_path, monkeypatch):
+    """uv cache files are never deleted directly; whole packages go through `uv cache clean`."""
+    _write(tmp_path / "uv" / "interpreter-v4" / "abc.msgpack", 70, age_days=400)
+    calls = []
+    monkeypatch.setattr(cu, "uv_command", lambda: ["uv"])
+    monkeypatch.setattr(cu, "run_command", lambda cmd, **kw: calls.append(cmd))
+    report = cu.prune_caches(cu.scan_caches(caches), older_than=30 * 86400)
+    assert sorted(e.package for e in report.removed) == ["click", "requests"]
+    assert calls == [
+        ["uv", "cache", "clean", "--cache-dir", str(tmp_path / "uv"), "requests"],
+        ["uv", "cache", "prune", "--cache-dir", str(tmp_path / "uv")],
+    ]
+    assert (tmp_path / "uv" / "archive-v0" / "abc").exists()  # left to uv
+    assert (tmp_path / "uv" / "interpreter-v4" / "abc.msgpack").exists()
+    assert not list((tmp_path / "pip" / "wheels").rglob("*.whl"))
+
+    monkeypatch.setattr(cu, "uv_command", lambda: None)
+    report = cu.prune_caches(cu.scan_caches(caches), older_than=30 * 86400)
+    assert str(tmp_path / "uv") in report.errors and report.removed == []
@@ -0,0 +1,62 @@
+import reposmith.api as api
+from reposmith.api import ProjectSpec, init_project
+from reposmith.core.checkpoints import CheckpointStore
+
+
+def _counting(monkeypatch, name):
+    calls = []
+    original = getattr(api, name)
+
+    def wrapper(*a, **k):
+        calls.append(a)
+        return original(*a, **k)
+
+    monkeypatch.setattr(api, name, wrapper)
+    return calls
+
+
+def test_resume_reruns_only_the_failed_step(tmp_path, monkeypatch):
+    """After a dependency failure, --resume skips every checkpointed step."""
+    def broken_deps(root, prefer_uv=True, **kw):
+        raise RuntimeError("flaky mirror")
+
+    monkeypatch.setattr(api, "post_init_dependency_setup", broken_deps)
+    spec = ProjectSpec(root=tmp_path, no_venv=True, with_gitignore=True)
+    first = init_project(spec)
+    assert first.step("deps").status == "failed"
+    assert CheckpointStore(tmp_path).recorded("deps")["status"] == "failed"
+
+    deps_calls = []
+    monkeypatch.setattr(api, "post_init_dependency_setup", lambda root, prefer_uv=True, **kw: deps_calls.append(root))
+    entry_calls = _counting(monkeypatch, "create_app_file")
+
+    second = init_project(ProjectSpec(root=tmp_path, no_venv=True, with_gitignore=True, resume=True))
+    assert second.ok
+    assert second.step("entry").status == "cached"
+    assert second.step("gitignore").status == "cached"
+    assert second.step("deps").status == "written"
+    assert entry_calls == [] and len(deps_calls) == 1
+
+
+def test_resume_restarts_from_invalidated_step(tmp_path, monkeypatch):
+    """A changed output invalidates its step and everything after it."""
+    monkeypatch.setattr(api, "post_init_dependency_setup", lambda root, prefer_uv=True, **kw: None)
+    spec = ProjectSpec(root=tmp_path, no_venv=True, with_gitignore=True)
+    init_project(spec)
+
+    (tmp_path / ".gitignore").unlink()
+    again = init_project(ProjectSpec(root=tmp_path, no_venv=True, with_gitignore=True, resume=True))
+
+    statuses = {s.name: s.status for s in again.steps}
+    assert statuses["entry"] == "cached"
+    assert statuses["gitignore"] == "written"
+    assert statuses["ci"] != "cached"
+    assert (tmp_path / ".gitignore").exists()
+
+
+def test_resume_with_changed_spec_runs_everything(tmp_path, monkeypatch):
+    """Checkpoints from a different spec are not reused."""
+    monkeypatch.setattr(api, "post_init_dependency_setup", lambda root, prefer_uv=True, **kw: None)
+    init_project(ProjectSpec(root=tmp_path, no_venv=True))
+    again = init_project(ProjectSpec(root=tmp_path, no_venv=True, with_license=True, resume=True))
+    assert all(s.status != "cached" for s in again.steps)
@@ -0,0 +1,83 @@
+import os
+import shutil
+import subprocess
+import time
+
+import pytest
+
+import reposmith.clean_utils as cu
+
+
+def _touch(root, rel, size=10, age_days=0):
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(b"x" * size)
+    t = time.time() - age_days * 86400
+    os.utime(p, (t, t))
+    return p
+
+
+def test_patterns_come_from_the_preset_without_risky_entries():
+    pats = cu.clean_patterns()
+    for p in ("__pycache__/", "*.py[cod]", "build/", "dist/", "htmlcov/", "*.egg-info/", ".pytest_cache/"):
+        assert p in pats
+    assert "*.spec" not in pats and "lib/" not in pats and ".env" not in pats
+
+    m = cu.compile_matcher(["build/", "*.py[cod]", "nested/path"])
+    assert m.match("build", True) and not m.match("build", False)
+    assert m.match("mod.pyc", False) and m.match("x.pyo", True)
+    assert not m.match("mod.py", False) and not m.match("path", True)
+
+
+def test_clean_removes_artifacts_and_skips_venv_and_git(tmp_path):
+    _touch(tmp_path, "src/pkg/__pycache__/mod.cpython-312.pyc", 100)
+    _touch(tmp_path, "src/pkg/mod.py", 5)
+    _touch(tmp_path, "build/lib/pkg/mod.py", 200)
+    _touch(tmp_path, "dist/pkg-1.0.tar.gz", 300)
+    _touch(tmp_path, "pkg.egg-info/PKG-INFO", 40)
+    _touch(tmp_path, "stray.pyc", 7)
+    _touch(tmp_path, ".venv/pyvenv.cfg", 1)
+    _touch(tmp_path, ".venv/lib/__pycache__/keep.pyc", 1)
+    _touch(tmp_path, ".git/hooks/__pycache__/keep.pyc", 1)
+
+    dry = cu.clean_project(tmp_path, dry_run=True, jobs=3)
+    names = sorted(str(a.path.relative_to(tmp_path)) for a in dry.artifacts)
+    assert names == ["build", "dist", "pkg.egg-info", os.path.join("src", "pkg", "__pycache__"), "stray.pyc"]
+    assert dry.reclaimed_bytes == 100 + 200 + 300 + 40 + 7
+    assert (tmp_path / "build").exists()
+
+    report = cu.clean_project(tmp_path, jobs=3)
+    assert not report.errors and report.reclaimed_bytes == 647
+    assert not (tmp_path / "build").exists() and not (tmp_path / "stray.pyc").exists()
+    assert (tmp_path / "src/pkg/mod.py").exists()
+    assert (tmp_path / ".venv/lib/__pycache__/keep.pyc").exists()
+    assert (tmp_path / ".git/hooks/__pycache__/keep.pyc").exists()
+
+
+def test_older_than_keeps_recent_artifacts(tmp_path):
+    _touch(tmp_path, "old/__pycache__/a.pyc", age_days=30)
+    _touch(tmp_path, "new/__pycache__/a.pyc", age_days=0)
+    report = cu.clean_project(tmp_path, older_than=7 * 86400)
+    assert [a.path.parent.name for a in report.artifacts] == ["old"] and report.skipped_recent == 1
+    assert (tmp_path / "new/__pycache__").exists() and not (tmp_path / "old/__pycache__").exists()
+
+
+def test_plain_dir_names_only_match_at_project_roots(tmp_path):
+    _touch(tmp_path, "src/pkg/build/template.txt", 5)
+    _touch(tmp_path, "docs/coverage/index.md", 5)
+    _touch(tmp_path, "sub/pyproject.toml", 1)
+    _touch(tmp_path, "sub/dist/sub-1.0.whl", 9)
+    _touch(tmp_path, "venv/lib/__pycache__/keep.pyc", 1)  # no pyvenv.cfg: still a venv by name
+    report = cu.clean_project(tmp_path, dry_run=True)
+    assert [str(a.path.relative_to(tmp_path)) for a in report.artifacts] == [os.path.join("sub", "dist")]
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+def test_git_tracked_artifacts_are_kept(tmp_path):
+    _touch(tmp_path, "dist/vendored.tar.gz", 5)
+    _touch(tmp_path, "build/out.o", 5)
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "dist"], check=True)
+    report = cu.clean_project(tmp_path)
+    assert [a.path.name for a in report.artifacts] == ["build"]
+    assert (tmp_path / "dist/vendored.tar.gz").exists() and not (tmp_path / "build").exists()
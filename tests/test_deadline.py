@@ -0,0 +1,58 @@
+import sys
+import threading
+import time
+
+import pytest
+
+import reposmith.api as api
+from reposmith.api import ProjectSpec, init_project
+from reposmith.core.checkpoints import CheckpointStore
+from reposmith.core.deadline import Deadline, DeadlineExceeded, deadline_scope, wait_for_path
+from reposmith.core.runner import CommandTimeout, run_command
+from reposmith.utils.units import parse_duration
+
+
+def test_parse_duration():
+    """Durations accept common unit suffixes and plain seconds."""
+    assert parse_duration("120s") == 120
+    assert parse_duration("2m") == 120
+    assert parse_duration("1.5h") == 5400
+    assert parse_duration("30d") == 30 * 86400
+    assert parse_duration("90") == 90
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+
+def test_wait_for_path_returns_as_soon_as_ready(tmp_path):
+    """Polling stops right after the path appears instead of sleeping a fixed delay."""
+    target = tmp_path / "python"
+    threading.Timer(0.1, target.write_text, args=("",)).start()
+    t0 = time.perf_counter()
+    assert wait_for_path(target, 5.0)
+    assert time.perf_counter() - t0 < 1.0
+    assert not wait_for_path(tmp_path / "never", 0.05)
+
+
+def test_runner_honours_current_deadline():
+    """Commands inherit the deadline installed for the current context."""
+    with deadline_scope(Deadline(0.5)):
+        with pytest.raises(CommandTimeout):
+            run_command([sys.executable, "-c", "import time; time.sleep(30)"], stream=False)
+    with deadline_scope(Deadline(0)):
+        with pytest.raises(DeadlineExceeded):
+            run_command([sys.executable, "-c", "pass"], stream=False)
+
+
+def test_step_budget_overrun_is_recorded(tmp_path, monkeypatch):
+    """A stalled step is killed at its budget and checkpointed as timed out."""
+    def stalled(root, prefer_uv=True, **kw):
+        run_command([sys.executable, "-c", "import time; time.sleep(30)"], stream=False)
+
+    monkeypatch.setattr(api, "post_init_dependency_setup", stalled)
+    t0 = time.perf_counter()
+    result = init_project(ProjectSpec(root=tmp_path, no_venv=True, step_budgets={"deps": 0.5}))
+
+    assert time.perf_counter() - t0 < 10
+    assert result.step("deps").status == "timeout"
+    assert not result.completed
+    assert CheckpointStore(tmp_path).recorded("deps")["status"] == "timeout"
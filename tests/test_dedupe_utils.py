@@ -0,0 +1,105 @@
+import contextlib
+import os
+import stat
+
+import pytest
+
+import reposmith.dedupe_utils as du
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX link counts and modes")
+
+SHARED = b"def f():\n    return 1\n" * 200
+
+
+def _venv(root, name, extra=b""):
+    venv = root / name / ".venv"
+    site = venv / "lib" / "python3.12" / "site-packages"
+    (site / "pkg").mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    (site / "pkg" / "__init__.py").write_bytes(SHARED)
+    (site / "pkg" / "own.py").write_bytes(SHARED[:-1] + extra)  # same size, different bytes
+    return site
+
+
+def test_dedupe_links_identical_files_and_undo_restores(tmp_path):
+    sites = [_venv(tmp_path, name, bytes([65 + i])) for i, name in enumerate(("a", "b", "c"))]
+
+    dry = du.dedupe_venvs(tmp_path, min_size=1, dry_run=True)
+    assert len(dry.venvs) == 3 and dry.linked == 2 and dry.bytes_saved == 2 * len(SHARED)
+    assert not (tmp_path / du.STORE_DIRNAME).exists()
+
+    report = du.dedupe_venvs(tmp_path, min_size=1)
+    assert report.linked == 2 and not report.errors
+    inits = [s / "pkg" / "__init__.py" for s in sites]
+    assert len({p.stat().st_ino for p in inits}) == 1 and inits[0].stat().st_nlink == 4  # 3 venvs + store
+    assert not inits[0].stat().st_mode & stat.S_IWUSR
+    assert len({(s / "pkg" / "own.py").stat().st_ino for s in sites}) == 3
+    assert inits[1].read_bytes() == SHARED
+
+    # A new project links straight to the existing object.
+    new = _venv(tmp_path, "d", b"Z")
+    again = du.dedupe_venvs(tmp_path, min_size=1)
+    assert again.already_linked == 3 and again.linked == 1
+    assert (new / "pkg" / "__init__.py").samefile(inits[0])
+
+    undone = du.undo_dedupe(tmp_path)
+    assert undone.linked == 4
+    assert len({(s / "pkg" / "__init__.py").stat().st_ino for s in [*sites, new]}) == 4
+    assert (new / "pkg" / "__init__.py").stat().st_mode & stat.S_IWUSR
+    assert not list((tmp_path / du.STORE_DIRNAME / "objects").rglob("*-*")) and not any(
+        p.is_file() for p in (tmp_path / du.STORE_DIRNAME / "objects").rglob("*")
+    )
+
+
+def test_file_changed_after_hashing_is_left_alone(tmp_path, monkeypatch):
+    sites = [_venv(tmp_path, name, bytes([65 + i])) for i, name in enumerate(("a", "b"))]
+    target = sites[1] / "pkg" / "__init__.py"
+    real_lock = du._store_lock
+
+    @contextlib.contextmanager
+    def racing_install(store):
+        # A reinstall lands after hashing, just before files are linked.
+        target.write_bytes(SHARED.replace(b"1", b"22"))
+        with real_lock(store):
+            yield
+
+    monkeypatch.setattr(du, "_store_lock", racing_install)
+    report = du.dedupe_venvs(tmp_path, min_size=1)
+    assert report.skipped_changed == 1 and report.linked == 0
+    assert b"return 22" in target.read_bytes()
+    assert not list(target.parent.glob("*.rsdedupe-*"))
+
+
+def test_store_lock_rejects_concurrent_runs_but_not_stale_files(tmp_path):
+    _venv(tmp_path, "a")
+    _venv(tmp_path, "b")
+    store = tmp_path / du.STORE_DIRNAME
+    store.mkdir()
+    with du._store_lock(store):
+        with pytest.raises(RuntimeError):
+            du.dedupe_venvs(tmp_path, min_size=1)
+    (store / ".lock").write_text("123")  # left behind by a crashed run
+    assert du.dedupe_venvs(tmp_path, min_size=1).linked == 2
+
+
+def test_interrupted_run_is_still_undoable(tmp_path, monkeypatch):
+    sites = [_venv(tmp_path, name, bytes([65 + i])) for i, name in enumerate(("a", "b", "c"))]
+    real_replace = os.replace
+    calls = []
+
+    def crash_on_second(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        real_replace(src, dst)
+
+    monkeypatch.setattr(du.os, "replace", crash_on_second)
+    with pytest.raises(KeyboardInterrupt):
+        du.dedupe_venvs(tmp_path, min_size=1)
+    monkeypatch.setattr(du.os, "replace", real_replace)
+
+    undone = du.undo_dedupe(tmp_path)
+    assert undone.linked == 2 and not undone.errors  # the object's source and the one replaced file
+    inits = [s / "pkg" / "__init__.py" for s in sites]
+    assert len({p.stat().st_ino for p in inits}) == 3
+    assert all(p.stat().st_mode & stat.S_IWUSR for p in inits)
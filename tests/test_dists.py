@@ -0,0 +1,23 @@
+import os
+
+from reposmith.core.dists import DIST_INFO_RE, pyproject_dependencies, venv_site_packages
+
+
+def test_dist_info_and_site_packages(tmp_path):
+    """dist-info names split into name and version; site-packages is found on disk."""
+    assert DIST_INFO_RE.match("typing_extensions-4.12.2.dist-info").groups() == ("typing_extensions", "4.12.2")
+    assert DIST_INFO_RE.match("demo.egg-info") is None
+    assert os.name == "nt" or venv_site_packages(tmp_path) == []
+    sp = tmp_path / ("Lib" if os.name == "nt" else "lib/python3.12") / "site-packages"
+    sp.mkdir(parents=True)
+    assert venv_site_packages(tmp_path) == [sp]
+
+
+def test_pyproject_dependencies(tmp_path):
+    """Only [project].dependencies is read; broken or missing files give nothing."""
+    pyproject = tmp_path / "pyproject.toml"
+    assert pyproject_dependencies(pyproject) == []
+    pyproject.write_text('[project]\nname = "x"\ndependencies = ["requests>=2", "six"]\n', encoding="utf-8")
+    assert pyproject_dependencies(pyproject) == ["requests>=2", "six"]
+    pyproject.write_text("[project\n", encoding="utf-8")
+    assert pyproject_dependencies(pyproject) == []
@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+import venv
+
+import pytest
+
+import reposmith.fleet_utils as fu
+from reposmith.cli import main
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX venv layout")
+
+
+def _fleet(tmp_path):
+    venv.EnvBuilder(with_pip=False).create(tmp_path / "good" / ".venv")
+    (tmp_path / "good" / "pyproject.toml").write_text('[project]\nname = "good"\nversion = "1.2.0"\n')
+    (tmp_path / "novenv" / "sub").mkdir(parents=True)
+    (tmp_path / "novenv" / "sub" / "requirements.txt").write_text("requests\n")
+    (tmp_path / "broken" / ".venv" / "bin").mkdir(parents=True)
+    (tmp_path / "broken" / ".venv" / "pyvenv.cfg").write_text("home = /nowhere\n")
+    (tmp_path / ".git" / "x").mkdir(parents=True)
+    (tmp_path / ".git" / "x" / "pyproject.toml").write_text("")
+    (tmp_path / "good" / "build").mkdir()
+    (tmp_path / "good" / "build" / "requirements.txt").write_text("")
+    return tmp_path
+
+
+def test_find_projects_skips_vcs_venvs_and_build_dirs(tmp_path):
+    root = _fleet(tmp_path)
+    assert fu.find_projects(root) == [root / "broken", root / "good", root / "novenv" / "sub"]
+
+
+def test_doctor_fleet_probes_tools_once(tmp_path, monkeypatch):
+    root = _fleet(tmp_path)
+    calls = []
+    monkeypatch.setattr(fu, "probe_tools", lambda: calls.append(1) or {"uv": "uv 0.4", "git": None, "pip": "pip"})
+    findings, summary = fu.doctor_fleet(root, jobs=2)
+    assert calls == [1]
+    by_name = {os.path.relpath(f["path"], root): f for f in findings}
+    assert by_name["good"]["ok"] and by_name["good"]["version"] == "1.2.0" and by_name["good"]["python"]
+    assert by_name["broken"]["problems"] == [".venv exists but python interpreter missing"]
+    assert by_name[os.path.join("novenv", "sub")]["requirements"] == "present"
+    assert summary["projects"] == 3 and summary["ok"] == 1 and summary["without_venv"] == 1
+    assert summary["tools"]["git"] is None
+
+
+def test_cli_recursive_json(tmp_path, monkeypatch, capsys):
+    root = _fleet(tmp_path)
+    monkeypatch.setattr(fu, "probe_tools", lambda: {"uv": "uv", "git": "git", "pip": "pip"})
+    monkeypatch.setattr(sys, "argv", ["reposmith", "doctor", "--recursive", str(root), "--json"])
+    rc = main()
+    data = json.loads(capsys.readouterr().out)
+    assert rc == 2  # broken and novenv
+    assert [p["ok"] for p in data["projects"]] == [False, True, False]
+    assert data["summary"]["with_problems"] == 2
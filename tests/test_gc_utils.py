@@ -0,0 +1,76 @@
+import json
+import os
+import time
+
+import reposmith.gc_utils as gc
+from reposmith.venv_utils import VENV_MARKER
+
+
+def _venv(project, age_days, *, marked=True, pkgs=("requests-2.32.0",), editable=()):
+    venv = project / ".venv"
+    site = venv / "lib" / "python3.12" / "site-packages"
+    site.mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text("home = /usr/bin\nversion_info = 3.12.4\n")
+    for p in pkgs:
+        (site / f"{p}.dist-info").mkdir()
+    for p in editable:
+        (site / f"{p}.dist-info").mkdir()
+        (site / f"{p}.dist-info" / "direct_url.json").write_text("{}")
+    (site / "blob.bin").write_bytes(b"x" * 1000)
+    if marked:
+        (venv / VENV_MARKER).write_text("{}")
+    t = time.time() - age_days * 86400
+    for p in (venv / "pyvenv.cfg", venv / VENV_MARKER, site):
+        if p.exists():
+            os.utime(p, (t, t))
+    return venv
+
+
+def test_scan_ranks_marked_venvs_by_last_use(tmp_path):
+    _venv(tmp_path / "new", 1)
+    _venv(tmp_path / "old", 60)
+    _venv(tmp_path / "foreign", 90, marked=False)
+    found = gc.scan_workspace(tmp_path)
+    assert [v.project.name for v in found] == ["old", "new"]
+    assert all(v.size >= 1000 for v in found)
+
+    stale = gc.plan_collection(found, older_than=30 * 86400)
+    assert [v.project.name for v in stale] == ["old"]
+    over = gc.plan_collection(found, budget=found[0].size + found[1].size - 1)
+    assert [v.project.name for v in over] == ["old"]
+
+
+def test_collect_records_manifest_and_removes(tmp_path):
+    old = _venv(tmp_path / "old", 60, pkgs=("requests-2.32.0", "Click-8.1.7"), editable=("mine-0.1",))
+    _venv(tmp_path / "new", 1)
+
+    dry = gc.collect_venvs(tmp_path, older_than=30 * 86400, dry_run=True)
+    assert [v.project.name for v in dry.removed] == ["old"] and old.exists()
+
+    report = gc.collect_venvs(tmp_path, older_than=30 * 86400)
+    assert not report.errors and not old.exists()
+    assert not list((tmp_path / "old").glob(".venv*"))
+    manifest = gc.read_collected(tmp_path / "old")[".venv"]
+    assert manifest["python"] == "3.12"
+    assert manifest["packages"] == ["Click==8.1.7", "requests==2.32.0"]  # editable install left out
+    assert (tmp_path / "new" / ".venv").exists()
+
+
+def test_restore_collected_installs_recorded_pins(tmp_path, monkeypatch):
+    project = tmp_path / "p"
+    (project / ".reposmith").mkdir(parents=True)
+    (project / ".reposmith" / gc.COLLECTED_FILENAME).write_text(
+        json.dumps({".venv": {"python": "3.12", "packages": ["a==1", "b==2"]}})
+    )
+    installed = []
+
+    class FakeInstaller:
+        def install(self, python, *, requirements=None, **kw):
+            installed.append(requirements.read_text())
+
+    monkeypatch.setattr(gc, "get_installer", lambda: FakeInstaller())
+    assert gc.collected_python(project / ".venv") == "3.12"
+    assert gc.restore_collected(project / ".venv") is True
+    assert installed == ["a==1\nb==2\n"]
+    assert not (project / ".reposmith" / gc.COLLECTED_FILENAME).exists()
+    assert gc.restore_collected(project / ".venv") is False
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from reposmith.index_server import (
+    SIMPLE_JSON,
+    IndexProxy,
+    WheelStore,
+    discover_index_url,
+    make_index_server,
+    write_server_info,
+)
+
+WHEEL = "demo_pkg-1.0-py3-none-any.whl"
+PAYLOAD = b"wheel-bytes" * 1000
+
+
+class _Upstream(BaseHTTPRequestHandler):
+    """Stand-in for PyPI: one HTML project page and one slow file."""
+
+    file_hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/simple/demo-pkg/":
+            digest = hashlib.sha256(PAYLOAD).hexdigest()
+            body = f'<a href="../../packages/{WHEEL}#sha256={digest}" data-requires-python="&gt;=3.8">{WHEEL}</a>'
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+        elif self.path == f"/packages/{WHEEL}":
+            type(self).file_hits += 1
+            time.sleep(0.2)  # long enough for concurrent requests to pile up
+            data = PAYLOAD
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+        else:
+            data = b"missing"
+            self.send_response(404)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _start(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+@pytest.fixture
+def index(tmp_path):
+    _Upstream.file_hits = 0
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), _Upstream)
+    upstream_url = _start(upstream)
+    proxy = IndexProxy(WheelStore(tmp_path / "store"), f"{upstream_url}/simple")
+    server = make_index_server(proxy, "127.0.0.1", 0)
+    url = _start(server)
+    yield url, proxy
+    server.shutdown()
+    upstream.shutdown()
+
+
+def _get(url, accept=None):
+    req = urllib.request.Request(url, headers={"Accept": accept} if accept else {})
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return resp.headers.get("Content-Type"), resp.read()
+
+
+def test_project_page_html_and_json(index):
+    """Project pages are served as PEP 503 HTML or PEP 691 JSON with local file URLs."""
+    url, _ = index
+    ctype, body = _get(f"{url}/simple/demo-pkg/")
+    assert ctype.startswith("text/html")
+    assert f"/files/demo-pkg/{WHEEL}#sha256=" in body.decode()
+
+    ctype, body = _get(f"{url}/simple/demo-pkg/", accept=SIMPLE_JSON)
+    data = json.loads(body)
+    assert ctype == SIMPLE_JSON
+    assert data["files"][0]["filename"] == WHEEL
+    assert data["files"][0]["requires-python"] == ">=3.8"
+    assert data["files"][0]["hashes"]["sha256"] == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def test_concurrent_file_requests_are_coalesced(index):
+    """Many clients asking for an uncached file trigger one upstream download."""
+    url, proxy = index
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        bodies = list(pool.map(lambda _: _get(f"{url}/files/demo-pkg/{WHEEL}")[1], range(6)))
+    assert all(b == PAYLOAD for b in bodies)
+    assert _Upstream.file_hits == 1
+    assert proxy.upstream_downloads == 1
+
+
+def test_store_evicts_least_recently_used(tmp_path):
+    """Going over the size cap removes the least recently used file first."""
+    store = WheelStore(tmp_path, max_bytes=250)
+    paths = []
+    for name in ("a", "b", "c"):
+        p = store.path("demo", f"{name}.whl")
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(b"x" * 100)
+        store.add(p)
+        paths.append(p)
+        if name == "b":
+            store.touch(paths[0])  # "a" is now more recent than "b"
+    assert [p.exists() for p in paths] == [True, False, True]
+    assert store.total_bytes == 200
+
+
+def test_store_never_evicts_pinned_files(tmp_path):
+    """A file being served survives eviction until it is unpinned."""
+    store = WheelStore(tmp_path, max_bytes=150)
+    a, b = store.path("demo", "a.whl"), store.path("demo", "b.whl")
+    a.parent.mkdir(parents=True)
+    for p in (a, b):
+        p.write_bytes(b"x" * 100)
+    with store.pinned(a):
+        store.add(a)
+        store.add(b)
+        assert a.exists() and b.exists()
+    c = store.path("demo", "c.whl")
+    c.write_bytes(b"x" * 100)
+    store.add(c)
+    assert [p.exists() for p in (a, b, c)] == [False, False, True]
+
+
+def test_finished_fetches_leave_no_inflight_entries(index):
+    """Per-file download locks are dropped once their requests are done."""
+    url, proxy = index
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: _get(f"{url}/files/demo-pkg/{WHEEL}"), range(4)))
+    assert proxy._inflight == {}
+
+
+def test_discover_index_url(tmp_path, monkeypatch, index):
+    """A running, advertised server is found; a stale record is ignored."""
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path / "cache"))
+    url, _ = index
+    assert discover_index_url() is None
+    write_server_info(url)
+    assert discover_index_url() == f"{url}/simple/"
+    write_server_info("http://127.0.0.1:9")
+    assert discover_index_url() is None
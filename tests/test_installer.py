@@ -0,0 +1,94 @@
+import zipfile
+
+import pytest
+
+import reposmith.installer as inst
+
+
+@pytest.fixture(autouse=True)
+def _fresh_detection():
+    inst.reset_detection()
+    yield
+    inst.reset_detection()
+
+
+def test_detection_prefers_uv_binary(monkeypatch):
+    monkeypatch.setattr(inst.shutil, "which", lambda name: "/opt/bin/uv")
+    monkeypatch.setattr(inst.importlib.util, "find_spec", lambda name: None)
+    assert inst.available_installers() == ["uv", "pip"]
+    assert inst.get_installer().name == "uv"
+    assert inst.uv_command() == ["/opt/bin/uv"]
+
+
+def test_detection_without_uv_falls_back_to_pip(monkeypatch):
+    monkeypatch.setattr(inst.shutil, "which", lambda name: None)
+    monkeypatch.setattr(inst.importlib.util, "find_spec", lambda name: None)
+    assert inst.get_installer().name == "pip"
+    assert inst.uv_command() is None
+    with pytest.raises(RuntimeError):
+        inst.get_installer("uv")
+    with pytest.raises(ValueError):
+        inst.get_installer("conda")
+
+
+def test_commands_target_the_given_interpreter():
+    uv = inst.Installer("uv", ("/opt/bin/uv",))
+    pip = inst.Installer("pip")
+    assert uv.pip_cmd("/v/bin/python", "install", "x") == ["/opt/bin/uv", "pip", "install", "x", "--python", "/v/bin/python"]
+    assert pip.pip_cmd("/v/bin/python", "install", "x") == ["/v/bin/python", "-m", "pip", "install", "x"]
+    assert (uv.kind, pip.kind) == ("uv", "pip")
+
+
+def test_install_builds_one_command(monkeypatch):
+    calls = []
+    monkeypatch.setattr(inst, "run_command", lambda cmd, **kw: calls.append(cmd))
+    inst.Installer("pip").install("py", requirements="req.txt")
+    inst.Installer("uv", ("uv",)).install("py", packages=["a"])
+    assert calls == [
+        ["py", "-m", "pip", "install", "-r", "req.txt", "--upgrade-strategy", "only-if-needed"],
+        ["uv", "pip", "install", "a", "--python", "py"],
+    ]
+
+
+def test_callers_never_install_uv_when_it_is_missing(monkeypatch, tmp_path):
+    import reposmith.env_manager as em
+    import reposmith.utils.deps as deps
+    from reposmith.utils.paths import venv_python
+
+    monkeypatch.setattr(inst.shutil, "which", lambda name: None)
+    monkeypatch.setattr(inst.importlib.util, "find_spec", lambda name: None)
+    calls = []
+    for mod in (inst, em, deps):
+        monkeypatch.setattr(mod, "run_command", lambda cmd, **kw: calls.append(cmd))
+    py = venv_python(tmp_path)
+    py.parent.mkdir(parents=True)
+    py.write_text("")
+    deps.post_init_dependency_setup(tmp_path)  # no requirements → uv init is skipped
+    (tmp_path / "requirements.txt").write_text("six\n")
+    em.install_deps_with_uv(tmp_path)
+    assert calls == [
+        [str(py), "-m", "pip", "install", "-r", str(tmp_path / "requirements.txt"),
+         "--upgrade-strategy", "only-if-needed"],
+    ]
+
+
+def test_fixture_wheels_form_a_dependency_chain(tmp_path):
+    top = inst.make_fixture_wheels(tmp_path, count=4, prefix="fx")
+    wheels = sorted(p.name for p in tmp_path.glob("*.whl"))
+    assert wheels == [f"fx_{i:03d}-1.0-py3-none-any.whl" for i in range(4)]
+    assert top == ["fx_000", "fx_003"]
+    with zipfile.ZipFile(tmp_path / wheels[0]) as zf:
+        assert "Requires-Dist: fx_001>=1.0" in zf.read("fx_000-1.0.dist-info/METADATA").decode()
+
+
+def test_benchmark_pip_offline():
+    (res,) = inst.benchmark_installers(["pip"], rounds=1, count=3)
+    assert res.error is None, res.error
+    assert len(res.timings) == 1 and res.median > 0
+
+
+def test_benchmark_records_unavailable_backend(monkeypatch):
+    monkeypatch.setattr(inst.shutil, "which", lambda name: None)
+    monkeypatch.setattr(inst.importlib.util, "find_spec", lambda name: None)
+    (res,) = inst.benchmark_installers(["uv"], rounds=1, count=1)
+    assert res.median is None and "not available" in res.error
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+import reposmith.interpreter_utils as iu
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX install layout")
+
+
+def _exe(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("#!/bin/sh\nexit 1\n", encoding="utf-8")
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture()
+def fake_machine(tmp_path, monkeypatch):
+    """A PATH dir, a pyenv root and a uv python dir with fake interpreters."""
+    bin_dir = tmp_path / "bin"
+    _exe(bin_dir / "python3.11")
+    pyenv = tmp_path / "pyenv"
+    _exe(pyenv / "versions" / "3.12.4" / "bin" / "python3")
+    uv = tmp_path / "uv"
+    _exe(uv / "cpython-3.13.1+freethreaded-linux-x86_64-gnu" / "bin" / "python3.13t")
+
+    monkeypatch.setenv("PATH", str(bin_dir))
+    monkeypatch.setenv("PYENV_ROOT", str(pyenv))
+    monkeypatch.setenv("UV_PYTHON_INSTALL_DIR", str(uv))
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(iu, "_common_prefix_dirs", lambda: [])
+    return tmp_path
+
+
+def test_discovery_reads_versions_without_spawning(fake_machine, monkeypatch):
+    """Versions come from names and install dirs; no interpreter is executed."""
+    monkeypatch.setattr(iu, "run_command", lambda *a, **k: pytest.fail("spawned an interpreter"))
+    found = {i.version: i for i in iu.discover_interpreters(refresh=True)}
+
+    assert set(found) == {"3.11", "3.12.4", "3.13.1"}
+    assert found["3.12.4"].source == "pyenv" and found["3.12.4"].abi == "cp312"
+    assert found["3.13.1"].freethreaded and found["3.13.1"].abi == "cp313t"
+    assert iu.find_interpreter("3.12").version == "3.12.4"
+    assert iu.find_interpreter("3.13t").source == "uv"
+    assert iu.find_interpreter("3.13") is None
+
+
+def test_cache_is_reused_until_a_directory_changes(fake_machine, monkeypatch):
+    """A second lookup hits the cache; installing a new Python invalidates it."""
+    iu.discover_interpreters()
+    real_scan = iu._scan
+    monkeypatch.setattr(iu, "_scan", lambda *a, **k: pytest.fail("cache ignored"))
+    assert len(iu.discover_interpreters()) == 3
+
+    monkeypatch.setattr(iu, "_scan", real_scan)
+    _exe(fake_machine / "pyenv" / "versions" / "3.10.2" / "bin" / "python3")
+    versions = {i.version for i in iu.discover_interpreters()}
+    assert "3.10.2" in versions
+
+
+def test_pyvenv_cfg_version(tmp_path):
+    """Interpreters inside a venv are identified from pyvenv.cfg."""
+    exe = _exe(tmp_path / "venv" / "bin" / "python")
+    (tmp_path / "venv" / "pyvenv.cfg").write_text("home = /x\nversion_info = 3.12.7.final.0\n", encoding="utf-8")
+    assert iu._static_version(exe, "path") == "3.12.7"
+
+
+def test_shared_prefix_headers_do_not_override_the_executable_name(tmp_path):
+    """patchlevel.h of another Python in the same prefix is ignored."""
+    exe = _exe(tmp_path / "usr" / "bin" / "python3.12")
+    header = tmp_path / "usr" / "include" / "python3.11" / "patchlevel.h"
+    header.parent.mkdir(parents=True)
+    header.write_text('#define PY_VERSION "3.11.2"\n', encoding="utf-8")
+    assert iu._static_version(exe, "path") == "3.12"
+
+    own = tmp_path / "usr" / "include" / "python3.12" / "patchlevel.h"
+    own.parent.mkdir(parents=True)
+    own.write_text('#define PY_VERSION "3.12.3"\n', encoding="utf-8")
+    assert iu._static_version(exe, "path") == "3.12.3"
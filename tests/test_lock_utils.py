@@ -0,0 +1,102 @@
+import base64
+import hashlib
+import json
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import reposmith.lock_utils as lu
+from reposmith.core.runner import command_env
+from reposmith.installer import get_installer
+
+PIP = get_installer("pip")
+
+
+def _make_wheel(dest, name, version="1.0"):
+    """Write a minimal pure-Python wheel (one module) into `dest`."""
+    dist = f"{name}-{version}.dist-info"
+    files = {
+        f"{name}.py": b"VALUE = 1\n",
+        f"{dist}/METADATA": f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n".encode(),
+        f"{dist}/WHEEL": b"Wheel-Version: 1.0\nGenerator: test\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+    }
+    record = []
+    for path, data in files.items():
+        digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+        record.append(f"{path},sha256={digest},{len(data)}")
+    record.append(f"{dist}/RECORD,,")
+    files[f"{dist}/RECORD"] = ("\n".join(record) + "\n").encode()
+    with zipfile.ZipFile(dest / f"{name}-{version}-py3-none-any.whl", "w") as zf:
+        for path, data in files.items():
+            zf.writestr(path, data)
+
+
+@pytest.fixture
+def local_index(tmp_path, monkeypatch):
+    wheels = tmp_path / "wheels"
+    wheels.mkdir()
+    for name in ("alpha", "beta"):
+        _make_wheel(wheels, name)
+    monkeypatch.setattr(lu, "get_installer", lambda preference="auto": PIP)  # exercise the pip path
+    with command_env({"PIP_NO_INDEX": "1", "PIP_FIND_LINKS": str(wheels)}):
+        yield wheels
+
+
+def test_lock_is_reused_until_inputs_change(tmp_path, local_index):
+    """The lock pins hashes and is only recompiled when requirements change."""
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "requirements.txt").write_text("alpha\n", encoding="utf-8")
+
+    status, lock = lu.compile_lock(root, sys.executable)
+    text = lock.read_text(encoding="utf-8")
+    assert status == "written"
+    assert "alpha==1.0" in text and "--hash=sha256:" in text
+
+    assert lu.compile_lock(root, sys.executable)[0] == "exists"
+    (root / "requirements.txt").write_text("alpha\nbeta\n", encoding="utf-8")
+    status, lock = lu.compile_lock(root, sys.executable)
+    assert status == "written" and "beta==1.0" in lock.read_text(encoding="utf-8")
+
+
+def test_sync_installs_exactly_the_lock(tmp_path, local_index):
+    """Syncing installs locked packages and removes ones the lock does not list."""
+    venv = tmp_path / "venv"
+    subprocess.run([sys.executable, "-m", "venv", str(venv)], check=True)
+    py = str(venv / ("Scripts/python.exe" if sys.platform == "win32" else "bin/python"))
+    subprocess.run([py, "-m", "pip", "install", "-q", "--no-index", "--find-links", str(local_index), "beta"], check=True)
+
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "requirements.txt").write_text("alpha\n", encoding="utf-8")
+    _, lock = lu.compile_lock(root, py)
+    assert lu.sync_lock(py, lock) == "written(pip)"
+
+    listed = subprocess.run([py, "-m", "pip", "list"], capture_output=True, text=True, check=True).stdout
+    assert "alpha" in listed and "beta" not in listed
+
+
+def test_pip_lock_lists_hashes_of_every_release_file(tmp_path, local_index, monkeypatch):
+    """Other platforms' files of the pinned version are hashed too; a pin without any hash fails."""
+    other = local_index / "alpha-1.0-cp312-cp312-win_amd64.whl"
+    other.write_bytes(b"not really a wheel")
+    (local_index / "alpha-2.0.tar.gz").write_bytes(b"another version")
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "requirements.txt").write_text("alpha==1.0\n", encoding="utf-8")
+    text = lu.compile_lock(root, sys.executable)[1].read_text(encoding="utf-8")
+    wheel = local_index / "alpha-1.0-py3-none-any.whl"
+    expected = sorted(hashlib.sha256(p.read_bytes()).hexdigest() for p in (wheel, other))
+    assert text.count("--hash=sha256:") == 2
+    assert all(f"--hash=sha256:{h}" in text for h in expected)
+
+    def no_hash_report(cmd, **kwargs):
+        report = {"install": [{"metadata": {"name": "gamma", "version": "1.0"}, "download_info": {"url": "x"}}]}
+        Path(cmd[cmd.index("--report") + 1]).write_text(json.dumps(report), encoding="utf-8")
+
+    monkeypatch.setattr(lu, "run_command", no_hash_report)
+    with pytest.raises(ValueError, match="gamma==1.0"):
+        lu._compile_with_pip(sys.executable, root / "requirements.txt", [], tmp_path)
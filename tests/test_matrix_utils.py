@@ -0,0 +1,56 @@
+import sys
+import threading
+
+import pytest
+
+import reposmith.matrix_utils as mu
+from reposmith.core.runner import run_command
+
+
+def test_parse_pythons():
+    """Comma lists are split, de-duplicated and validated."""
+    assert mu.parse_pythons("3.12, 3.13,,3.12,3.13t") == ("3.12", "3.13", "3.13t")
+    with pytest.raises(ValueError):
+        mu.parse_pythons("3.12,latest")
+
+
+def test_matrix_builds_concurrently_with_shared_cache(tmp_path, monkeypatch):
+    """Every environment is built at the same time and sees the shared wheel cache."""
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("PIP_CACHE_DIR", raising=False)
+    monkeypatch.delenv("UV_CACHE_DIR", raising=False)
+    barrier = threading.Barrier(2, timeout=10)
+    seen: dict[str, str] = {}
+
+    def fake_create(venv_dir, version, backend="auto"):
+        barrier.wait()  # deadlocks (and times out) unless both run at once
+        code = "import os; print(os.environ['PIP_CACHE_DIR'])"
+        seen[version] = run_command([sys.executable, "-c", code], capture=True, stream=False).output
+        venv_dir.mkdir()
+        return "written"
+
+    monkeypatch.setattr(mu, "create_virtualenv", fake_create)
+    monkeypatch.setattr(mu, "install_requirements", lambda root, req, python=None: "skipped")
+
+    envs = mu.create_matrix_venvs(tmp_path, ["3.12", "3.13"])
+    assert [e.venv_dir.name for e in envs] == [".venv-3.12", ".venv-3.13"]
+    assert all(e.ok for e in envs)
+    expected = str(tmp_path / "cache" / "wheels" / "pip")
+    assert seen == {"3.12": expected, "3.13": expected}
+
+
+def test_matrix_reports_failures_per_env(tmp_path, monkeypatch):
+    """One failing interpreter does not stop the others."""
+
+    def fake_create(venv_dir, version, backend="auto"):
+        if version == "3.99":
+            raise RuntimeError("No Python 3.99 interpreter found")
+        venv_dir.mkdir()
+        return "written"
+
+    monkeypatch.setattr(mu, "create_virtualenv", fake_create)
+    monkeypatch.setattr(mu, "install_requirements", lambda root, req, python=None: "skipped")
+
+    ok, bad = mu.create_matrix_venvs(tmp_path, ["3.12", "3.99"])
+    assert ok.ok and ok.venv_dir.is_dir()
+    assert not bad.ok and "3.99" in bad.error
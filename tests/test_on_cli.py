@@ -0,0 +1,35 @@
+import subprocess
+
+from on.__main__ import main as on_main
+
+
+def _no_spawn(*a, **k):
+    raise AssertionError("on must not spawn child processes")
+
+
+def test_on_init_scaffolds_multiple_roots_in_process(tmp_path, monkeypatch):
+    """Several --root values are initialized within the same interpreter."""
+    monkeypatch.setattr(subprocess, "call", _no_spawn)
+    a, b = tmp_path / "a", tmp_path / "b"
+    rc = on_main(["init", "--root", str(a), "--root", str(b), "--no-venv", "--author", "CI"])
+
+    assert rc == 0
+    for root in (a, b):
+        assert (root / "run.py").exists()
+        assert "CI" in (root / "LICENSE").read_text(encoding="utf-8")
+        assert not (root / ".github" / "workflows" / "ci.yml").exists()
+
+
+def test_on_init_writes_ci_only_with_flag(tmp_path):
+    """--with-ci adds the workflow, using --ci-python."""
+    rc = on_main(["init", "--root", str(tmp_path), "--no-venv", "--with-ci", "--ci-python", "3.11"])
+
+    assert rc == 0
+    assert "3.11" in (tmp_path / ".github" / "workflows" / "ci.yml").read_text(encoding="utf-8")
+
+
+def test_on_info_uses_find_spec(monkeypatch, capsys):
+    """info reports module presence without running `python -m reposmith -h`."""
+    monkeypatch.setattr(subprocess, "call", _no_spawn)
+    assert on_main(["info"]) == 0
+    assert "reposmith module: OK" in capsys.readouterr().out
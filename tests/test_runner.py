@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+
+import pytest
+
+import reposmith.core.runner as rn
+from reposmith.core.runner import CommandError, CommandRunner, CommandTimeout, command_env, run_command
+
+PY = sys.executable
+
+
+def test_run_command_captures_output():
+    """stdout is captured and the exit code reported."""
+    res = run_command([PY, "-c", "print('hello'); print('world')"], capture=True, stream=False)
+    assert res.returncode == 0
+    assert res.output.splitlines() == ["hello", "world"]
+
+
+def test_nonzero_exit_raises_with_tail():
+    """A failing command raises CommandError carrying its last output lines."""
+    code = "import sys; print('out-line'); print('err-line', file=sys.stderr); sys.exit(3)"
+    with pytest.raises(CommandError) as exc:
+        run_command([PY, "-c", code], stream=False)
+    assert exc.value.returncode == 3
+    assert "out-line" in exc.value.tail and "err-line" in exc.value.tail
+
+
+def test_timeout_kills_child():
+    """Commands exceeding their timeout are killed promptly."""
+    t0 = time.perf_counter()
+    with pytest.raises(CommandTimeout):
+        run_command([PY, "-c", "import time; time.sleep(30)"], timeout=0.5, stream=False)
+    assert time.perf_counter() - t0 < 10
+
+
+def test_timeout_covers_child_that_closed_its_pipes():
+    """A child that closes stdout/stderr but keeps running still times out."""
+    code = "import os, time; os.close(1); os.close(2); time.sleep(30)"
+    t0 = time.perf_counter()
+    with pytest.raises(CommandTimeout):
+        run_command([PY, "-c", code], timeout=0.5, stream=False)
+    assert time.perf_counter() - t0 < 10
+
+
+def test_lines_are_streamed_to_logger(caplog):
+    """Each output line is logged as it arrives."""
+    logger = logging.getLogger("reposmith.test.runner")
+    runner = CommandRunner(logger=logger)
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        asyncio.run(runner.run([PY, "-c", "print('a'); print('b')"]))
+    assert [r.getMessage() for r in caplog.records] == ["  │ a", "  │ b"]
+
+
+def test_concurrency_limit_and_cancellation():
+    """At most max_concurrency commands overlap; cancelled commands are killed."""
+    runner = CommandRunner(max_concurrency=2)
+    sleeper = [PY, "-c", "import time; time.sleep(0.4)"]
+
+    async def main():
+        t0 = time.perf_counter()
+        await asyncio.gather(*(runner.run(sleeper, stream=False) for _ in range(4)))
+        elapsed = time.perf_counter() - t0
+
+        task = asyncio.ensure_future(runner.run([PY, "-c", "import time; time.sleep(30)"], stream=False))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return elapsed
+
+    assert asyncio.run(main()) >= 0.8
+
+
+def test_command_env_scopes_nest():
+    """command_env adds variables to children without touching os.environ."""
+    code = "import os; print(os.environ.get('RS_A'), os.environ.get('RS_B'))"
+    with command_env({"RS_A": "1", "RS_B": "outer"}):
+        with command_env({"RS_B": "inner"}):
+            inner = run_command([PY, "-c", code], capture=True, stream=False).output
+        outer = run_command([PY, "-c", code], capture=True, stream=False).output
+    after = run_command([PY, "-c", code], capture=True, stream=False).output
+    assert (inner, outer, after) == ("1 inner", "1 outer", "None None")
+
+
+def test_run_command_limit_applies_across_threads(monkeypatch):
+    """Threads calling run_command share the default runner's limit."""
+    monkeypatch.setattr(rn, "_default_runner", CommandRunner(max_concurrency=2))
+    sleeper = [PY, "-c", "import time; time.sleep(0.4)"]
+    threads = [threading.Thread(target=run_command, args=(sleeper,), kwargs={"stream": False}) for _ in range(4)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.perf_counter() - t0 >= 0.8
@@ -0,0 +1,135 @@
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from reposmith.api import ProjectSpec
+from reposmith.service import Job, JobService, _spec_from_params, make_http_server, make_unix_server
+
+
+def _serve(service):
+    server = make_http_server(service, "127.0.0.1", 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def test_http_init_job_streams_events(tmp_path):
+    """POST /jobs runs an init job and streams NDJSON progress until done."""
+    service = JobService(tmp_path / "state", workers=2)
+    server, base = _serve(service)
+    try:
+        body = json.dumps({"kind": "init", "params": {"root": str(tmp_path / "proj"), "no_venv": True}})
+        req = urllib.request.Request(f"{base}/jobs", data=body.encode("utf-8"), method="POST")
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            events = [json.loads(line) for line in resp.read().decode("utf-8").splitlines()]
+    finally:
+        server.shutdown()
+        service.shutdown()
+
+    steps = [e["name"] for e in events if e["type"] == "step"]
+    assert "entry" in steps
+    assert events[-1] == {**events[-1], "type": "status", "status": "done"}
+    assert (tmp_path / "proj" / "run.py").exists()
+
+    job_id = events[0]["job"]
+    saved = json.loads((tmp_path / "state" / f"{job_id}.json").read_text(encoding="utf-8"))
+    assert saved["status"] == "done"
+
+
+def test_http_rejects_unknown_kind(tmp_path):
+    """Unknown job kinds are rejected with HTTP 400."""
+    service = JobService(tmp_path / "state", workers=1)
+    server, base = _serve(service)
+    try:
+        req = urllib.request.Request(f"{base}/jobs", data=b'{"kind": "nope"}', method="POST")
+        try:
+            urllib.request.urlopen(req, timeout=10)
+            raised = False
+        except urllib.error.HTTPError as e:
+            raised = e.code == 400
+    finally:
+        server.shutdown()
+        service.shutdown()
+    assert raised
+
+
+def test_resume_requeues_unfinished_jobs(tmp_path):
+    """Jobs persisted as queued/running are executed again after a restart."""
+    state = tmp_path / "state"
+    state.mkdir()
+    job = Job(kind="init", params={"root": str(tmp_path / "proj"), "no_venv": True}, status="running")
+    (state / f"{job.id}.json").write_text(json.dumps(job.to_dict()), encoding="utf-8")
+
+    service = JobService(state, workers=1)
+    resumed = service.resume()
+    assert [j.id for j in resumed] == [job.id]
+    list(service.events(resumed[0]))
+    service.shutdown()
+
+    assert resumed[0].status == "done"
+    assert (tmp_path / "proj" / "run.py").exists()
+
+
+def test_finished_jobs_expire_by_age_and_count(tmp_path):
+    """Old and surplus finished jobs are deleted; unfinished ones never are."""
+    state = tmp_path / "state"
+    state.mkdir()
+    now = time.time()
+    jobs = [
+        Job(kind="doctor", params={}, status="done", finished=now - 7200),  # too old
+        Job(kind="doctor", params={}, status="failed", finished=now - 30),  # beyond the count
+        Job(kind="doctor", params={}, status="done", finished=now - 20),
+        Job(kind="doctor", params={}, status="done", finished=now - 10),
+    ]
+    for job in jobs:
+        (state / f"{job.id}.json").write_text(json.dumps(job.to_dict()), encoding="utf-8")
+
+    service = JobService(state, workers=1, keep_finished=3600, max_finished=2)
+    assert service.resume() == []  # pruned while loading
+    assert sorted(p.stem for p in state.glob("*.json")) == sorted(j.id for j in jobs[2:])
+    assert service.get(jobs[0].id) is None and service.get(jobs[3].id) is not None
+    service.shutdown()
+
+
+def test_init_params_from_json_match_the_cli_spec(tmp_path):
+    """JSON lists and strings become the tuple/Path fields the CLI produces, so fingerprints agree."""
+    params = json.loads(json.dumps({
+        "root": str(tmp_path), "pythons": ["3.12", "3.13"], "wheelhouse": str(tmp_path / "wh"),
+        "step_budgets": {"deps": 60}, "deadline": 120,
+    }))
+    spec = _spec_from_params(params)
+    cli = ProjectSpec(root=tmp_path, pythons=("3.12", "3.13"), wheelhouse=tmp_path / "wh",
+                      step_budgets={"deps": 60.0}, deadline=120.0)
+    assert spec == cli and spec.fingerprint() == cli.fingerprint()
+    assert isinstance(spec.wheelhouse, Path) and spec.pythons == ("3.12", "3.13")
+    with pytest.raises(ValueError, match="pythons"):
+        _spec_from_params({"root": str(tmp_path), "pythons": "3.12"})
+    with pytest.raises(ValueError, match="force"):
+        _spec_from_params({"root": str(tmp_path), "force": "yes"})
+
+
+def test_unix_server_only_replaces_stale_sockets(tmp_path):
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("no AF_UNIX")
+    service = JobService(tmp_path / "state", workers=1)
+    precious = tmp_path / "notes.txt"
+    precious.write_text("keep me")
+    with pytest.raises(FileExistsError):
+        make_unix_server(service, precious)
+    assert precious.read_text() == "keep me"
+
+    sock_path = tmp_path / "s.sock"
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(str(sock_path))
+    stale.close()
+    server = make_unix_server(service, sock_path)
+    server.server_close()
+    os.unlink(sock_path)
+    service.shutdown()
@@ -0,0 +1,82 @@
+import json
+import os
+import sys
+import venv
+
+import pytest
+
+import reposmith.snapshot_utils as su
+from reposmith.cli import main
+
+
+def _snap(packages, **python):
+    return {"python": {"version": "3.12.1", **python}, "packages": packages}
+
+
+def test_diff_uses_names_versions_and_record_hashes():
+    a = _snap({
+        "numpy": {"version": "2.0.0", "record": "aa"},
+        "requests": {"version": "2.31.0"},
+        "six": {"version": "1.16.0", "record": "x"},
+        "torch": {"version": "2.3.0", "record": "t1"},
+    })
+    b = _snap({
+        "numpy": {"version": "2.1.0", "record": "bb"},
+        "requests": {"version": "2.31.0", "record": "r"},
+        "rich": {"version": "13.7.0"},
+        "torch": {"version": "2.3.0", "record": "t2"},
+    }, version="3.12.4")
+    diff = su.diff_snapshots(a, b)
+    assert diff.added == {"rich": "13.7.0"}
+    assert diff.removed == {"six": "1.16.0"}
+    assert diff.changed == {"numpy": ("2.0.0", "2.1.0")}
+    assert diff.rebuilt == ["torch"]  # requests: one side has no hash, not a rebuild
+    assert diff.python == {"version": ("3.12.1", "3.12.4")}
+    assert not diff.identical and su.diff_snapshots(a, a).identical
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX venv layout")
+def test_snapshot_of_live_venv_and_cli_diff(tmp_path, monkeypatch, capsys):
+    project = tmp_path / "proj"
+    venv.EnvBuilder(with_pip=False).create(project / ".venv")
+    (sp,) = (project / ".venv" / "lib").glob("python*/site-packages")
+    info = sp / "Demo_Pkg-1.0.dist-info"
+    info.mkdir()
+    (info / "RECORD").write_text("demo_pkg/__init__.py,,\n")
+    (info / "direct_url.json").write_text('{"url": "file:///src/demo", "dir_info": {"editable": true}}')
+
+    path = su.write_snapshot(project / ".venv")
+    assert path == project / su.SNAPSHOT_FILENAME
+    snap = json.loads(path.read_text())
+    assert snap["python"]["version"] == ".".join(map(str, sys.version_info[:3]))
+    demo = snap["packages"]["demo-pkg"]
+    assert demo["version"] == "1.0" and demo["editable"] and demo["source"] == "file:///src/demo"
+
+    (info.parent / "Demo_Pkg-2.0.dist-info").mkdir()
+    info.rename(tmp_path / "old-dist-info")
+    monkeypatch.setattr(sys, "argv", ["reposmith", "env", "diff", str(path), str(project), "--json"])
+    assert main() == 0
+    assert json.loads(capsys.readouterr().out)["changed"] == {"demo-pkg": ["1.0", "2.0"]}
+
+
+def test_load_snapshot_rejects_other_files(tmp_path):
+    (tmp_path / "x.json").write_text("[]")
+    with pytest.raises(ValueError):
+        su.load_snapshot(tmp_path / "x.json")
+    with pytest.raises(FileNotFoundError):
+        su.load_snapshot(tmp_path)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX venv layout")
+def test_cli_diff_reports_a_broken_interpreter(tmp_path, monkeypatch, capsys):
+    broken = tmp_path / ".venv"
+    (broken / "bin").mkdir(parents=True)
+    (broken / "pyvenv.cfg").write_text("version = 3.12.1\n")
+    python = broken / "bin" / "python"
+    python.write_text("#!/bin/sh\nexit 3\n")
+    python.chmod(0o755)
+    snap = tmp_path / "a.json"
+    snap.write_text(json.dumps(_snap({})))
+    monkeypatch.setattr(sys, "argv", ["reposmith", "env", "diff", str(snap), str(broken)])
+    assert main() == 1
+    assert "Could not query a venv interpreter" in capsys.readouterr().err
@@ -0,0 +1,80 @@
+import logging
+import os
+import venv
+
+import pytest
+
+import reposmith.startup_utils as su
+from reposmith.commands.doctor_cmd import run_doctor
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       200 |        300 | encodings
+import time:       400 |        400 |     json.decoder
+import time:     1_000 |      1_000 |   junk
+import time:       600 |       1000 |   json
+import time:       900 |        900 |   _sitebuiltins
+import time:       500 |       2400 | site
+"""
+
+
+def test_parse_importtime_and_site_modules():
+    imports = su.parse_importtime(IMPORTTIME)
+    assert [(i.module, i.depth) for i in imports] == [
+        ("_io", 1), ("encodings", 0), ("json.decoder", 2), ("json", 1), ("_sitebuiltins", 1), ("site", 0),
+    ]
+    report = su.StartupReport("py", imports=imports)
+    assert [i.module for i in report.site_modules()] == ["json", "_sitebuiltins"]
+    assert report.site_modules()[0].cumulative == 0.001
+
+
+def test_pth_imports():
+    text = "/some/path\nimport _virtualenv\nimport os, sys; exec('x')\n# import ignored\nimport a.b as c\n"
+    assert su.pth_imports(text) == ["_virtualenv", "os", "sys", "a"]
+
+
+def test_findings_attribute_site_imports_to_pth_files():
+    report = su.StartupReport(
+        "py",
+        startup=0.3,
+        bare_startup=0.02,
+        imports=su.parse_importtime(IMPORTTIME.replace("       1000 |   json", "      50000 |   json")),
+        pth=[su.PthCost("/sp/heavy.pth", 0.05, 0, ["json"]), su.PthCost("/sp/paths.pth", 0.001, 500)],
+        customize={"sitecustomize": 0.03},
+    )
+    found = report.findings(threshold=0.02)
+    assert found[0].startswith("python -c pass takes 300 ms (280 ms in site")
+    assert "/sp/heavy.pth takes 50 ms (imports json)" in found
+    assert "/sp/paths.pth adds 500 sys.path entries" in found
+    assert "sitecustomize takes 30 ms" in found
+    assert not any("site imports json" in f for f in found)  # already charged to heavy.pth
+
+
+def _venv_with_pth(tmp_path):
+    root = tmp_path / "proj"
+    venv.EnvBuilder(with_pip=False).create(root / ".venv")
+    (sp,) = (root / ".venv" / "lib").glob("python*/site-packages")
+    (sp / "slow.pth").write_text("import time; time.sleep(0.05)\n")
+    (sp / "extra.pth").write_text(f"{tmp_path}\n")
+    return root
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX venv layout")
+def test_measure_startup_charges_each_pth(tmp_path):
+    root = _venv_with_pth(tmp_path)
+    report = su.measure_startup(str(root / ".venv" / "bin" / "python"), runs=1)
+    by_name = {p.path.rsplit("/", 1)[-1]: p for p in report.pth}
+    assert by_name["slow.pth"].seconds >= 0.05 and by_name["slow.pth"].imports == ["time"]
+    assert by_name["extra.pth"].path_entries == 1
+    assert report.startup > report.bare_startup
+    assert any(i.module == "site" for i in report.imports)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX venv layout")
+def test_doctor_startup_flags_slow_pth(tmp_path, caplog):
+    root = _venv_with_pth(tmp_path)
+    with caplog.at_level(logging.INFO):
+        rc = run_doctor(logging.getLogger("t"), root, startup=True, startup_threshold=0.02)
+    assert rc == 2
+    assert "slow.pth takes" in caplog.text
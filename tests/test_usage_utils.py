@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+import reposmith.usage_utils as uu
+
+
+def _dist(site, name, version, top_level=None, record=None, scripts=False):
+    info = site / f"{name}-{version}.dist-info"
+    info.mkdir(parents=True)
+    if top_level is not None:
+        (info / "top_level.txt").write_text("\n".join(top_level) + "\n")
+    (info / "RECORD").write_text(record or "")
+    if scripts:
+        (info / "entry_points.txt").write_text("[console_scripts]\nblack = black:main\n")
+
+
+def _project(tmp_path):
+    root = tmp_path / "proj"
+    site = root / ".venv" / "lib" / "python3.12" / "site-packages"
+    site.mkdir(parents=True)
+    (root / ".venv" / "pyvenv.cfg").write_text("version = 3.12.1\n")
+    _dist(site, "requests", "2.31.0", ["requests"])
+    _dist(site, "PyYAML", "6.0", ["_yaml", "yaml"])
+    _dist(site, "rich", "13.0", record="rich/__init__.py,,\nrich-13.0.dist-info/RECORD,,\n")
+    _dist(site, "urllib3", "2.0", ["urllib3"])
+    _dist(site, "black", "24.1", ["black"], scripts=True)
+    (root / "requirements.txt").write_text("requests>=2\nPyYAML==6.0  # config\nrich\nblack\nmissing-pkg\n")
+    (root / "app").mkdir()
+    (root / "app" / "__init__.py").write_text("")
+    (root / "app" / "main.py").write_text(
+        "import os, json\nimport requests\nfrom urllib3.util import Retry\nfrom app import helpers\nfrom . import x\n"
+    )
+    (root / "app" / "helpers.py").write_text("import yaml\n")
+    (root / "build").mkdir()
+    (root / "build" / "gen.py").write_text("import rich\n")
+    (root / "broken.py").write_text("def (:\n")
+    return root
+
+
+def test_imported_names_absolute_only():
+    assert uu.imported_names("import a.b, c as d\nfrom e.f import g\nfrom .h import i\n") == ["a", "c", "e"]
+
+
+def test_analyze_reports_unused_tools_and_undeclared(tmp_path):
+    root = _project(tmp_path)
+    report = uu.analyze_usage(root)
+    assert report.files == 4 and "broken.py" in report.errors
+    assert sorted(report.imports) == ["requests", "urllib3", "yaml"]  # stdlib, local and relative skipped
+    assert report.unused == ["rich"]  # only imported from build/, which is skipped; found via RECORD
+    assert report.tools == ["black"]
+    assert report.undeclared == {"urllib3": "urllib3"}
+    assert report.not_installed == ["missing-pkg"]
+
+
+def test_results_are_cached_by_content_hash(tmp_path, monkeypatch):
+    root = _project(tmp_path)
+    uu.scan_imports(root)
+    (root / "app" / "helpers.py").write_text("import yaml\nimport rich\n")
+    _, report = uu.scan_imports(root)
+    assert (report.parsed, report.cached) == (1, 2)
+    cache = json.loads((root / ".reposmith" / uu.CACHE_FILENAME).read_text())
+    assert ["rich", "yaml"] in cache.values()
+
+
+def test_process_pool_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(uu, "POOL_MIN_FILES", 1)
+    root = _project(tmp_path)
+    per_file, report = uu.scan_imports(root, jobs=2)
+    assert report.parsed == 3 and per_file["app/helpers.py"] == ["yaml"]
+
+
+def test_prune_requirements_keeps_backup(tmp_path):
+    root = _project(tmp_path)
+    before = (root / "requirements.txt").read_text()
+    assert uu.prune_requirements(root, ["rich", "pyyaml"]) == ["PyYAML==6.0  # config", "rich"]
+    assert (root / "requirements.txt").read_text() == "requests>=2\nblack\nmissing-pkg\n"
+    assert (root / "requirements.txt.bak").read_text() == before
+
+
+@pytest.mark.parametrize("text", ["", "# only comments\n"])
+def test_prune_without_matches_leaves_file(tmp_path, text):
+    (tmp_path / "requirements.txt").write_text(text)
+    assert uu.prune_requirements(tmp_path, ["rich"]) == []
+    assert not (tmp_path / "requirements.txt.bak").exists()
+
+
+def test_plugins_stubs_and_string_loaded_drivers_are_not_unused(tmp_path):
+    root = _project(tmp_path)
+    site = root / ".venv" / "lib" / "python3.12" / "site-packages"
+    _dist(site, "pytest_cov", "5.0", ["pytest_cov"])
+    (site / "pytest_cov-5.0.dist-info" / "entry_points.txt").write_text("[pytest11]\npytest_cov = pytest_cov.plugin\n")
+    _dist(site, "types_requests", "2.31", record="requests-stubs/__init__.pyi,,\n")
+    _dist(site, "pandas_stubs", "2.2", record="pandas-stubs/__init__.pyi,,\n")
+    _dist(site, "psycopg2", "2.9", ["psycopg2"])
+    _dist(site, "ujson", "5.0", ["ujson"])
+    (root / "requirements.txt").write_text("pytest-cov\ntypes-requests\npandas-stubs\npsycopg2\nujson\n")
+    (root / "app" / "db.py").write_text(
+        'import importlib\nURL = "postgresql+psycopg2://localhost/db"\njson = importlib.import_module("ujson")\n'
+    )
+    report = uu.analyze_usage(root)
+    assert report.unused == []
+    assert report.tools == ["pandas-stubs", "pytest-cov", "types-requests"]
+
+
+def test_imported_names_include_dynamic_imports_and_driver_urls():
+    src = 'import importlib\nimportlib.import_module("a.b")\n__import__("c")\nimport_module(".rel")\nU = "mysql+pymysql://h"\n'
+    assert uu.imported_names(src) == ["a", "c", "importlib", "pymysql"]
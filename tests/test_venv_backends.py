@@ -0,0 +1,50 @@
+import sys
+
+import pytest
+
+import reposmith.venv_utils as vu
+
+
+def _capture(monkeypatch):
+    calls = []
+    monkeypatch.setattr(vu, "run_command", lambda cmd, **k: calls.append(list(cmd)))
+    return calls
+
+
+def test_resolve_interpreter_current_version(monkeypatch, tmp_path):
+    """The running interpreter satisfies its own major.minor version."""
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path))
+    ver = f"{sys.version_info[0]}.{sys.version_info[1]}"
+    assert vu.resolve_interpreter(None) == sys.executable
+    assert vu.resolve_interpreter(ver) == sys.executable
+    assert vu.resolve_interpreter("2.1") is None
+
+
+def test_auto_prefers_uv_when_available(monkeypatch):
+    """auto picks uv first, then virtualenv, then the stdlib venv."""
+    monkeypatch.setattr(vu.shutil, "which", lambda name: "/usr/bin/uv" if name == "uv" else None)
+    assert vu.pick_venv_backend("auto") == "uv"
+
+    monkeypatch.setattr(vu.shutil, "which", lambda name: None)
+    monkeypatch.setattr(vu.importlib.util, "find_spec", lambda name: None)
+    assert vu.pick_venv_backend("auto") == "venv"
+    with pytest.raises(ValueError):
+        vu.pick_venv_backend("conda")
+
+
+def test_uv_backend_honours_python_version(monkeypatch, tmp_path):
+    """The requested version reaches `uv venv --python` even without a local match."""
+    calls = _capture(monkeypatch)
+    assert vu.create_virtualenv(tmp_path / ".venv", "2.1", backend="uv") == "written"
+    assert calls == [["uv", "venv", "--seed", "--python", "2.1", str(tmp_path / ".venv")]]
+
+
+def test_venv_backend_uses_resolved_interpreter(monkeypatch, tmp_path):
+    """The stdlib backend runs the resolved interpreter and fails without one."""
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path / "cache"))
+    calls = _capture(monkeypatch)
+    vu.create_virtualenv(tmp_path / ".venv", None, backend="venv")
+    assert calls == [[sys.executable, "-m", "venv", str(tmp_path / ".venv")]]
+
+    with pytest.raises(RuntimeError):
+        vu.create_virtualenv(tmp_path / "other", "2.1", backend="venv")
@@ -22,7 +22,7 @@ def test_create_venv_invokes_subprocess(monkeypatch):
 
         return R()
 
-    monkeypatch.setattr("subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("reposmith.venv_utils.run_command", fake_run, raising=True)
 
     with tempfile.TemporaryDirectory() as td:
         root = Path(td)
@@ -56,7 +56,7 @@ def test_install_requirements_paths(monkeypatch, capsys):
 
         return R()
 
-    monkeypatch.setattr("subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("reposmith.venv_utils.run_command", fake_run, raising=True)
 
     with tempfile.TemporaryDirectory() as td:
         root = Path(td)
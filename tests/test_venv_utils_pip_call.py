@@ -32,7 +32,7 @@ def test_install_requirements_nonempty_triggers_installer(monkeypatch, capsys):
 
         return R()
 
-    monkeypatch.setattr("subprocess.run", fake_run, raising=True)
+    monkeypatch.setattr("reposmith.installer.run_command", fake_run, raising=True)
 
     with tempfile.TemporaryDirectory() as td:
         root = Path(td)
@@ -0,0 +1,86 @@
+import base64
+import hashlib
+import logging
+import os
+
+import pytest
+
+import reposmith.verify_utils as vu
+from reposmith.commands.doctor_cmd import run_doctor
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="POSIX venv layout")
+
+
+def _record_line(site, rel):
+    data = (site / rel).read_bytes()
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode()
+    return f"{rel},sha256={digest},{len(data)}"
+
+
+def _venv(tmp_path):
+    venv = tmp_path / ".venv"
+    site = venv / "lib" / "python3.12" / "site-packages"
+    (site / "demo" / "__pycache__").mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text("version = 3.12.1\n")
+    (site / "demo" / "__init__.py").write_text("X = 1\n")
+    (site / "demo" / "big.bin").write_bytes(os.urandom(4096))
+    (site / "demo" / "__pycache__" / "__init__.cpython-312.pyc").write_bytes(b"pyc")
+    info = site / "demo-1.0.dist-info"
+    info.mkdir()
+    (info / "METADATA").write_text("Name: demo\n")
+    lines = [_record_line(site, rel) for rel in ("demo/__init__.py", "demo/big.bin", "demo-1.0.dist-info/METADATA")]
+    (info / "RECORD").write_text("\n".join(lines + ["demo-1.0.dist-info/RECORD,,"]) + "\n")
+    return venv, site
+
+
+def test_clean_venv_verifies(tmp_path, monkeypatch):
+    monkeypatch.setattr(vu, "MMAP_THRESHOLD", 1024)  # big.bin goes through mmap
+    venv, _ = _venv(tmp_path)
+    report = vu.verify_venv(venv)
+    assert report.problems == []
+    assert report.files_checked == 3 and report.bytes_hashed > 4096
+    assert [(d.name, d.version, d.files) for d in report.dists] == [("demo", "1.0", 4)]
+
+
+def test_missing_modified_and_unowned(tmp_path):
+    venv, site = _venv(tmp_path)
+    (site / "demo" / "__init__.py").write_text("X = 2\n")  # same size, different hash
+    (site / "demo" / "big.bin").unlink()
+    (site / "demo" / "extra.py").write_text("")
+    (site / "orphan.py").write_text("")
+    report = vu.verify_venv(venv)
+    demo, stray = report.dists
+    assert demo.missing == [str(site / "demo" / "big.bin")]
+    assert demo.modified == [str(site / "demo" / "__init__.py")]
+    assert demo.unowned == [str(site / "demo" / "extra.py")]
+    assert stray.name == vu.UNOWNED and stray.unowned == [str(site / "orphan.py")]
+
+
+def test_fast_mode_only_compares_sizes(tmp_path):
+    venv, site = _venv(tmp_path)
+    (site / "demo" / "__init__.py").write_text("X = 2\n")
+    (site / "demo-1.0.dist-info" / "METADATA").write_text("Name: demo-changed\n")
+    report = vu.verify_venv(venv, fast=True)
+    assert report.bytes_hashed == 0
+    assert report.dists[0].modified == [str(site / "demo-1.0.dist-info" / "METADATA")]
+
+
+def test_doctor_verify_venv(tmp_path, caplog):
+    _, site = _venv(tmp_path)
+    with caplog.at_level(logging.INFO):
+        run_doctor(logging.getLogger("t"), tmp_path, verify_venv=True)
+    assert "1 distribution(s), 3 file(s) checked" in caplog.text and "! demo" not in caplog.text
+    (site / "demo" / "big.bin").unlink()
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        run_doctor(logging.getLogger("t"), tmp_path, verify_venv=True)
+    assert "demo 1.0: 1 missing file(s)" in caplog.text
+
+
+def test_files_written_by_venv_creators_are_not_unowned(tmp_path):
+    venv, site = _venv(tmp_path)
+    for name in ("_virtualenv.pth", "_virtualenv.py", "distutils-precedence.pth", "README.txt"):
+        (site / name).write_text("")
+    (site / "demo" / "_virtualenv.py").write_text("")  # only top-level files are allowed
+    report = vu.verify_venv(venv)
+    assert [d.unowned for d in report.problems] == [[str(site / "demo" / "_virtualenv.py")]]
@@ -4,7 +4,7 @@ import os
 import json
 from pathlib import Path
 
-from reposmith.vscode_utils import create_vscode_files
+from reposmith.vscode_utils import create_vscode_files, create_vscode_tasks
 
 
 class TestVSCodeUtils(unittest.TestCase):
@@ -56,6 +56,14 @@ class TestVSCodeUtils(unittest.TestCase):
         expected = "python.exe" if os.name == "nt" else "python3"
         self.assertEqual(settings.get("python.defaultInterpreterPath"), expected)
 
+    def test_reports_state_per_file(self):
+        """Each file reports "written" on creation and "exists" when left alone."""
+        files = {"settings.json", "launch.json", "project.code-workspace"}
+        first = create_vscode_files(self.root, self.venv, main_file="run.py")
+        self.assertEqual(first, dict.fromkeys(files, "written"))
+        again = create_vscode_files(self.root, self.venv, main_file="run.py")
+        self.assertEqual(again, dict.fromkeys(files, "exists"))
+
     def test_force_overwrites_and_backup(self):
         """Test that force overwrite creates a backup and updates the settings file."""
         vs = self.root / ".vscode"
@@ -72,6 +80,57 @@ class TestVSCodeUtils(unittest.TestCase):
         new_settings = self._read_json(settings)
         self.assertIn("python.defaultInterpreterPath", new_settings)
 
+    def test_matrix_interpreters_and_tasks(self):
+        """Matrix venvs get a debug configuration and one parallel pytest task each."""
+        matrix = [self.root / ".venv-3.12", self.root / ".venv-3.13"]
+        create_vscode_files(self.root, self.venv, main_file="run.py", matrix_venvs=matrix)
+        configs = self._read_json(self.root / ".vscode" / "launch.json")["configurations"]
+        self.assertEqual([c["name"] for c in configs],
+                         ["Python: run.py", "Python: run.py (.venv-3.12)", "Python: run.py (.venv-3.13)"])
+        self.assertEqual(configs[2]["python"], "${workspaceFolder}/.venv-3.13/bin/python")
+        self.assertNotIn("python.venvFolders", self._read_json(self.root / ".vscode" / "settings.json"))
+
+        self.assertEqual(create_vscode_tasks(self.root, matrix), "written")
+        tasks = self._read_json(self.root / ".vscode" / "tasks.json")["tasks"]
+        labels = [t["label"] for t in tasks]
+        self.assertEqual(labels, ["tests: .venv-3.12", "tests: .venv-3.13", "tests: all interpreters"])
+        self.assertEqual(tasks[-1]["dependsOn"], labels[:2])
+        self.assertEqual(tasks[-1]["dependsOrder"], "parallel")
+        self.assertIn(".venv-3.13/bin/python", tasks[1]["command"])
+
+    def test_new_matrix_entries_are_merged_into_existing_files(self):
+        """Adding an interpreter updates tasks.json and launch.json but keeps the user's entries."""
+        create_vscode_files(self.root, self.venv, main_file="run.py", matrix_venvs=[self.root / ".venv-3.12"])
+        create_vscode_tasks(self.root, [self.root / ".venv-3.12"])
+        tasks_path = self.root / ".vscode" / "tasks.json"
+        doc = self._read_json(tasks_path)
+        doc["tasks"].insert(0, {"label": "lint", "type": "shell", "command": "ruff check"})
+        tasks_path.write_text(json.dumps(doc), encoding="utf-8")
+
+        matrix = [self.root / ".venv-3.12", self.root / ".venv-3.13"]
+        self.assertEqual(create_vscode_tasks(self.root, matrix), "written")
+        self.assertEqual(create_vscode_tasks(self.root, matrix), "exists")
+        labels = [t["label"] for t in self._read_json(tasks_path)["tasks"]]
+        self.assertEqual(labels, ["lint", "tests: .venv-3.12", "tests: .venv-3.13", "tests: all interpreters"])
+
+        create_vscode_files(self.root, self.venv, main_file="run.py", matrix_venvs=matrix)
+        configs = self._read_json(self.root / ".vscode" / "launch.json")["configurations"]
+        self.assertEqual(configs[-1]["name"], "Python: run.py (.venv-3.13)")
+        self.assertEqual(len(configs), 3)
+
+    def test_pycache_prefix_reaches_terminals_debugger_and_tasks(self):
+        """A bytecode prefix is exported wherever VS Code starts Python."""
+        create_vscode_files(self.root, self.venv, main_file="run.py", pycache_prefix=".cache/pyc")
+        create_vscode_tasks(self.root, [self.root / ".venv-3.12"], pycache_prefix=".cache/pyc")
+        expected = {"PYTHONPYCACHEPREFIX": "${workspaceFolder}/.cache/pyc"}
+        settings = self._read_json(self.root / ".vscode" / "settings.json")
+        for osname in ("linux", "osx", "windows"):
+            self.assertEqual(settings[f"terminal.integrated.env.{osname}"], expected)
+        launch = self._read_json(self.root / ".vscode" / "launch.json")
+        self.assertEqual(launch["configurations"][0]["env"], expected)
+        tasks = self._read_json(self.root / ".vscode" / "tasks.json")["tasks"]
+        self.assertEqual(tasks[0]["options"]["env"], expected)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
\ No newline at end of file
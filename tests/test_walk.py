@@ -0,0 +1,46 @@
+from reposmith.core.walk import DESCEND, MATCH, SKIP, find_venvs, remove_trees, scan_tree
+
+
+def test_scan_tree_matches_without_entering_matches(tmp_path):
+    for rel in ("a/b/c/x.pyc", "a/__pycache__/y.pyc", "d/x.pyc", ".git/objects/z.pyc"):
+        p = tmp_path / rel
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text("")
+
+    def classify(entry):
+        if entry.name == ".git":
+            return SKIP
+        if entry.name == "__pycache__":
+            return MATCH
+        if entry.is_dir():
+            return DESCEND
+        return MATCH if entry.name.endswith(".pyc") else SKIP
+
+    found = sorted(e.path[len(str(tmp_path)) + 1:] for e in scan_tree([tmp_path], classify, jobs=3))
+    assert found == ["a/__pycache__", "a/b/c/x.pyc", "d/x.pyc"]
+
+
+def test_find_venvs(tmp_path):
+    for rel in ("p1/.venv", "p2/.venv-3.13", "p2/.venv-3.13/lib/nested", "p3/.git/fake"):
+        (tmp_path / rel).mkdir(parents=True)
+    for rel in ("p1/.venv", "p2/.venv-3.13", "p2/.venv-3.13/lib/nested", "p3/.git/fake"):
+        (tmp_path / rel / "pyvenv.cfg").write_text("")
+    assert find_venvs(tmp_path) == [tmp_path / "p1/.venv", tmp_path / "p2/.venv-3.13"]
+
+
+def test_remove_trees_handles_read_only_files_and_dir_symlinks(tmp_path):
+    keep = tmp_path / "keep"
+    keep.mkdir()
+    (keep / "f").write_text("precious")
+    doomed = tmp_path / "doomed"
+    (doomed / "a" / "b").mkdir(parents=True)
+    ro = doomed / "a" / "b" / "ro.txt"
+    ro.write_text("x")
+    ro.chmod(0o444)
+    (doomed / "link").symlink_to(keep, target_is_directory=True)
+    single = tmp_path / "single.txt"
+    single.write_text("y")
+
+    remove_trees([doomed, single], jobs=4)
+    assert not doomed.exists() and not single.exists()
+    assert (keep / "f").read_text() == "precious"
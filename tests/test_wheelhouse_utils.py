@@ -0,0 +1,116 @@
+import json
+import sys
+import threading
+
+import pytest
+
+import reposmith.wheelhouse_utils as wu
+from reposmith.core.deadline import DeadlineExceeded
+from reposmith.core.runner import CommandResult
+
+
+def test_wheelhouse_env_offline_forbids_index(tmp_path):
+    """Offline mode points pip and uv at the wheelhouse and disables the index."""
+    env = wu.wheelhouse_env(tmp_path, offline=True)
+    assert env["PIP_FIND_LINKS"] == env["UV_FIND_LINKS"] == str(tmp_path.resolve())
+    assert env["PIP_NO_INDEX"] == env["UV_NO_INDEX"] == "1"
+    assert "PIP_NO_INDEX" not in wu.wheelhouse_env(tmp_path)
+    assert wu.wheelhouse_env(None) == {}
+    with pytest.raises(ValueError):
+        wu.wheelhouse_env(None, offline=True)
+
+
+def test_pins_from_report():
+    """Index packages are pinned by version; direct references keep their URL."""
+    report = {
+        "install": [
+            {"metadata": {"name": "six", "version": "1.16.0"}, "is_direct": False},
+            {"metadata": {"name": "local", "version": "0.1"}, "is_direct": True,
+             "download_info": {"url": "file:///src/local"}},
+        ]
+    }
+    assert wu.pins_from_report(report) == ["six==1.16.0", "file:///src/local"]
+
+
+def test_build_resolves_once_then_downloads_and_builds_in_parallel(tmp_path, monkeypatch):
+    """Pins are downloaded concurrently and sdists are turned into wheels."""
+    calls: list[list[str]] = []
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_run(cmd, **kw):
+        calls.append(cmd)
+        if "--report" in cmd:
+            report = {"install": [
+                {"metadata": {"name": n, "version": "1.0"}, "is_direct": False} for n in ("a", "b", "c")
+            ]}
+            with open(cmd[cmd.index("--report") + 1], "w", encoding="utf-8") as f:
+                json.dump(report, f)
+        elif "download" in cmd:
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.05)
+            name = cmd[-1].split("==")[0]
+            dest = tmp_path / "wh"
+            (dest / (f"{name}-1.0.tar.gz" if name == "c" else f"{name}-1.0-py3-none-any.whl")).write_text("x")
+            with lock:
+                active[0] -= 1
+        elif "wheel" in cmd:
+            (tmp_path / "wh" / "c-1.0-py3-none-any.whl").write_text("x")
+        return CommandResult(cmd, 0)
+
+    monkeypatch.setattr(wu, "run_command", fake_run)
+    req = tmp_path / "requirements.txt"
+    req.write_text("a\nb\nc\n", encoding="utf-8")
+
+    report = wu.build_wheelhouse(tmp_path / "wh", req, jobs=3)
+
+    assert report.ok
+    assert report.pins == ["a==1.0", "b==1.0", "c==1.0"]
+    assert [w.name.split("-")[0] for w in report.wheels] == ["a", "b", "c"]
+    assert report.built == ["c-1.0.tar.gz"]
+    assert not list((tmp_path / "wh").glob("*.tar.gz"))
+    assert sum("--report" in c for c in calls) == 1
+    assert peak[0] > 1
+
+
+def test_start_prefetch_runs_in_background(tmp_path, monkeypatch):
+    """Prefetch results are keyed by inputs; failures surface as None."""
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path / "cache"))
+    req = tmp_path / "requirements.txt"
+    req.write_text("six\n", encoding="utf-8")
+    gate = threading.Event()
+
+    def fake_build(dest, requirements, **kw):
+        gate.wait(5)
+        return wu.WheelhouseReport(dest=dest)
+
+    monkeypatch.setattr(wu, "build_wheelhouse", fake_build)
+    pf = wu.start_prefetch(req)
+    assert not pf.done()
+    gate.set()
+    assert pf.result(timeout=5).dest == pf.dest
+    assert pf.dest.parent == tmp_path / "cache" / "prefetch"
+
+    monkeypatch.setattr(wu, "build_wheelhouse", lambda *a, **kw: (_ for _ in ()).throw(OSError("offline")))
+    assert wu.start_prefetch(req).result(timeout=5) is None
+
+
+def test_cancelled_prefetch_starts_no_more_commands(tmp_path, monkeypatch):
+    """cancel() expires the prefetch's own deadline and joins its worker."""
+    monkeypatch.setenv("REPOSMITH_CACHE_DIR", str(tmp_path / "cache"))
+    req = tmp_path / "requirements.txt"
+    req.write_text("six\n", encoding="utf-8")
+    gate = threading.Event()
+
+    def fake_build(dest, requirements, **kw):
+        gate.wait(5)
+        return wu.run_command([sys.executable, "-c", "pass"], stream=False)
+
+    monkeypatch.setattr(wu, "build_wheelhouse", fake_build)
+    pf = wu.start_prefetch(req)
+    threading.Timer(0.1, gate.set).start()
+    assert pf.cancel(timeout=5)
+    assert pf.result() is None
+    assert isinstance(pf._future.exception(), DeadlineExceeded)
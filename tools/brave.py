@@ -1,6 +1,7 @@
 # tools/brave.py
 from __future__ import annotations
 import argparse
+import asyncio
 import os
 import sys
 import json
@@ -15,6 +16,8 @@ DEFAULT_PORTS = (8000, 5173)
 PORTS_FILE = ".brave-ports.conf"
 URLS_FILE = ".brave-profile.conf"
 PROFILE_DIRNAME = ".brave-profile"
+WAIT_TIMEOUT = 60.0      # launch --wait: overall seconds before giving up on a port
+PROBE_BACKOFF = (0.1, 2.0)  # first and maximum delay between probes
 
 README_TXT = (
     "Per-project Brave/Chromium profile.\n"
@@ -123,6 +126,66 @@ def run_popen(args: list[str]) -> None:
     # لا نستخدم shell=True لضمان أمان الـ quoting عبر الأنظمة
     subprocess.Popen(args)  # noqa: S603,S607
 
+# ---------------------------
+# Readiness probes (launch --wait)
+# ---------------------------
+async def probe_port(host: str, port: int, http: bool = False, timeout: float = 1.0) -> bool:
+    """One non-blocking TCP connect (plus a HEAD request if `http`); True if the server answers."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        if not http:
+            return True
+        writer.write(f"HEAD / HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode("ascii"))
+        await writer.drain()
+        status = await asyncio.wait_for(reader.readline(), timeout)
+        return status.startswith(b"HTTP/")
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+async def wait_for_port(host: str, port: int, deadline: float, http: bool = False) -> bool:
+    """Probe `port` with exponential backoff until it is ready or the loop time passes `deadline`."""
+    loop = asyncio.get_running_loop()
+    delay, max_delay = PROBE_BACKOFF
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        if await probe_port(host, port, http, timeout=min(1.0, remaining)):
+            return True
+        await asyncio.sleep(max(0.0, min(delay, deadline - loop.time())))
+        delay = min(delay * 2, max_delay)
+
+def wait_for_ports(ports: list[int], timeout: float = WAIT_TIMEOUT, http: bool = False,
+                   on_ready=None, host: str = "localhost") -> tuple[list[int], list[int]]:
+    """
+    Probe all ports concurrently and call `on_ready(port)` as soon as each one answers.
+
+    Returns (ready, failed), each in the order the ports were given.
+    """
+    async def one(port: int, deadline: float) -> bool:
+        ok = await wait_for_port(host, port, deadline, http)
+        if ok and on_ready is not None:
+            on_ready(port)
+        return ok
+
+    async def run() -> list[bool]:
+        deadline = asyncio.get_running_loop().time() + timeout
+        return await asyncio.gather(*(one(p, deadline) for p in ports))
+
+    results = asyncio.run(run()) if ports else []
+    ready = [p for p, ok in zip(ports, results) if ok]
+    failed = [p for p, ok in zip(ports, results) if not ok]
+    return ready, failed
+
 # ---------------------------
 # Commands
 # ---------------------------
@@ -154,7 +217,50 @@ def cmd_init(root: Path) -> None:
 
     print(f"[ok] Initialized at: {root}")
 
-def cmd_launch(root: Path, auto: bool, no_tabs: bool, select: bool) -> None:
+def _open_tabs(browser: list[str] | None, profile_dir: Path, urls: list[str], first: bool) -> None:
+    """Open `urls`: the first call starts the browser, later ones add tabs to the running profile."""
+    if not browser:
+        import webbrowser
+        for u in urls:
+            webbrowser.open_new_tab(u)
+        return
+    args = browser + [f"--user-data-dir={str(profile_dir)}"]
+    for u in urls:
+        args += (["--new-tab", u] if first else [u])
+    run_popen(args)
+
+def _launch_when_ready(root: Path, chosen: list[str], ports: list[int], timeout: float, http: bool) -> None:
+    browser = find_chromium_like()
+    profile_dir = root / PROFILE_DIRNAME
+    if browser:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+    by_url = {f"http://localhost:{port}": port for port in ports}
+    waiting = [by_url[u] for u in chosen if u in by_url]
+    immediate = [u for u in chosen if u not in by_url]
+    opened: list[str] = []
+
+    def open_now(urls: list[str]) -> None:
+        _open_tabs(browser, profile_dir, urls, first=not opened)
+        opened.extend(urls)
+        for u in urls:
+            print(f"[ok] Opened {u}")
+
+    if immediate:
+        open_now(immediate)
+    if waiting:
+        print(f"[info] Waiting up to {timeout:g}s for port(s): {', '.join(map(str, waiting))}")
+    _, failed = wait_for_ports(waiting, timeout, http, on_ready=lambda p: open_now([f"http://localhost:{p}"]))
+    if not opened and browser:
+        _open_tabs(browser, profile_dir, [], first=True)  # profile only, like --no-tabs
+    for port in failed:
+        print(f"[warn] Port {port} not ready after {timeout:g}s; tab not opened: http://localhost:{port}")
+    if browser:
+        print(f"[ok] Launched {' '.join(browser)} with profile: {profile_dir}")
+    elif opened:
+        print("[warn] No Brave/Chromium found. Opened with default browser (no isolated profile).")
+
+def cmd_launch(root: Path, auto: bool, no_tabs: bool, select: bool,
+               wait: bool = False, wait_timeout: float = WAIT_TIMEOUT, wait_http: bool = False) -> None:
     ports = read_ports(root)
     extra = read_extra_urls(root)
     urls = build_urls(ports, extra)
@@ -168,6 +274,10 @@ def cmd_launch(root: Path, auto: bool, no_tabs: bool, select: bool) -> None:
     else:
         chosen = urls  # السلوك الافتراضي
 
+    if wait and chosen:
+        _launch_when_ready(root, chosen, ports, wait_timeout, wait_http)
+        return
+
     browser = find_chromium_like()
     profile_dir = root / PROFILE_DIRNAME
 
@@ -271,7 +381,10 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     s2.add_argument("--auto", action="store_true", help="open all urls (ports + .conf)")
     s2.add_argument("--no-tabs", action="store_true", help="launch profile only (no tabs)")
     s2.add_argument("--select", action="store_true", help="interactive selection of urls")
-    s2.set_defaults(func=lambda a: cmd_launch(a.root, a.auto, a.no_tabs, a.select))
+    s2.add_argument("--wait", action="store_true", help="open each port's tab only once its server accepts connections")
+    s2.add_argument("--wait-timeout", type=float, default=WAIT_TIMEOUT, help="seconds to wait for ports (default: 60)")
+    s2.add_argument("--wait-http", action="store_true", help="with --wait: also require an HTTP response to HEAD /")
+    s2.set_defaults(func=lambda a: cmd_launch(a.root, a.auto, a.no_tabs, a.select, a.wait, a.wait_timeout, a.wait_http))
 
     s3 = sub.add_parser("cleanup", help="remove the profile directory")
     s3.set_defaults(func=lambda a: cmd_cleanup(a.root))